@@ -1,6 +1,7 @@
+import numpy as np
+
 from util.decorators import aoc_output_formatter
 from util.input import get_input
-from util.iter import nested_iterable
 
 DAY = 6
 YEAR = 2015
@@ -12,28 +13,36 @@ PART_TWO_DESCRIPTION = "total light brightness"
 PART_TWO_ANSWER = 15343601
 
 
-def _v1_toggle(x: int) -> int:
-    return 0 if x == 1 else 1
+GRID_SIZE = 1000
+
+# Lights are either on or off for the v1 logic, but have a brightness for the v2 logic
+V1_DTYPE = np.uint8
+V2_DTYPE = np.int32
+
+
+def _v1_toggle(lights: np.ndarray) -> None:
+    lights ^= 1
 
 
-def _v1_turn_on(_: int) -> int:
-    return 1
+def _v1_turn_on(lights: np.ndarray) -> None:
+    lights[...] = 1
 
 
-def _v1_turn_off(_: int) -> int:
-    return 0
+def _v1_turn_off(lights: np.ndarray) -> None:
+    lights[...] = 0
 
 
-def _v2_toggle(x: int) -> int:
-    return x + 2
+def _v2_toggle(lights: np.ndarray) -> None:
+    lights += 2
 
 
-def _v2_turn_on(x: int) -> int:
-    return x + 1
+def _v2_turn_on(lights: np.ndarray) -> None:
+    lights += 1
 
 
-def _v2_turn_off(x: int) -> int:
-    return max([0, x - 1])
+def _v2_turn_off(lights: np.ndarray) -> None:
+    lights -= 1
+    np.maximum(lights, 0, out=lights)
 
 
 class LightsCommand:
@@ -78,23 +87,21 @@ class LightsCommand:
             },
         }[logic_version][command]
 
-    def execute(self, lights: dict[tuple[int, int], int]) -> None:
+    def execute(self, lights: np.ndarray) -> None:
         """Execute this command.
 
         Perform the action (turn on, turn off, toggle) this action describes against the range
-        of lights that the command specifies.
+        of lights that the command specifies, as a single operation on that slice of the grid.
         """
 
-        for coord in nested_iterable(
-            range(self.start_x, self.end_x + 1),
-            range(self.start_y, self.end_y + 1),
-        ):
-            lights[coord] = self.command_function(lights[coord])
+        self.command_function(
+            lights[self.start_x : self.end_x + 1, self.start_y : self.end_y + 1]
+        )
 
 
 @aoc_output_formatter(YEAR, DAY, 1, PART_ONE_DESCRIPTION, assert_answer=PART_ONE_ANSWER)
 def part_one(raw_input: list[str]) -> int | str | None:
-    lights = dict.fromkeys(nested_iterable(range(1000), range(1000)), 0)
+    lights = np.zeros((GRID_SIZE, GRID_SIZE), dtype=V1_DTYPE)
 
     for command in (
         LightsCommand(tokens, LightsCommand.COMMAND_V1)
@@ -102,12 +109,12 @@ def part_one(raw_input: list[str]) -> int | str | None:
     ):
         command.execute(lights)
 
-    return sum(lights.values())
+    return int(lights.sum())
 
 
 @aoc_output_formatter(YEAR, DAY, 2, PART_TWO_DESCRIPTION, assert_answer=PART_TWO_ANSWER)
 def part_two(raw_input: list[str]) -> int | str | None:
-    lights = dict.fromkeys(nested_iterable(range(1000), range(1000)), 0)
+    lights = np.zeros((GRID_SIZE, GRID_SIZE), dtype=V2_DTYPE)
 
     for command in (
         LightsCommand(tokens, LightsCommand.COMMAND_V2)
@@ -115,7 +122,7 @@ def part_two(raw_input: list[str]) -> int | str | None:
     ):
         command.execute(lights)
 
-    return sum(lights.values())
+    return int(lights.sum())
 
 
 def run(input_file: str) -> None:
@@ -1,6 +1,23 @@
 from dataclasses import dataclass
 from typing import List
 
+REGISTERS = "abcd"
+
+# Integer opcodes for compiled instructions
+CPY = 0  # (CPY, src, src_is_register, dst)
+INC = 1  # (INC, register)
+DEC = 2  # (DEC, register)
+JNZ = 3  # (JNZ, val, val_is_register, offset, offset_is_register)
+TGL = 4  # (TGL, offset, offset_is_register)
+OUT = 5  # (OUT, val, val_is_register)
+NOP = 6  # (NOP,) -- an invalid instruction produced by `tgl`, which is skipped
+ADD = 7  # (ADD, target, source, length)
+MUL = 8  # (MUL, target, multiplicand, multiplicand_is_register, counter, holding, length)
+DIV = 9  # (DIV, quotient, dividend, divisor, countdown, length)
+
+# The most instructions replaced by a single superinstruction
+LONGEST_SUPERINSTRUCTION = 8
+
 
 @dataclass
 class AssembunnyInstruction:
@@ -13,9 +30,28 @@ class AssembunnyInstruction:
         return AssembunnyInstruction(code=pieces[0], params=pieces[1:])
 
 
-def _optimize(instructions):
-    """Optimize the Assembunny instructions by identifying addition loops which effectively
-    perform multiplication and replacing with multiplication instructions.
+def _operand(param):
+    """Returns a tuple of (register index, True) if the parameter is a register reference, or
+    (integer value, False) if it's an integer literal.
+    """
+    if param in REGISTERS:
+        return REGISTERS.index(param), True
+    return int(param), False
+
+
+class CompiledAssembunny:
+    """A set of assembunny instructions compiled for fast evaluation.
+
+    Each instruction is compiled to a tuple with an integer opcode and its operands already
+    resolved to either register indices or integer literals, and registers are held in a list.
+
+    Loops which only add one register into another, which do that repeatedly to effectively
+    multiply, or which count down repeatedly to effectively divide, are recognized and the first
+    instruction of the loop is replaced with a single add, multiply, or divide superinstruction
+    that then jumps past the loop. The rest of the loop's
+    instructions are left intact, so jumping into the middle of the loop still behaves the
+    same. When `tgl` modifies an instruction, only the superinstructions whose loops could
+    include that instruction are recompiled.
 
     Ex:
     cpy b c
@@ -25,206 +61,316 @@ def _optimize(instructions):
     dec d
     jnz d -5
 
-    effectively do this:
+    effectively does this:
     a = a + (b * d)
     c = 0
     d = 0
     """
 
-    for i, instruction in enumerate(instructions):
-        if instruction.code != "cpy" or i + 5 >= len(instructions):
-            continue
-
-        ordered_next_instrs = ["inc", "dec", "jnz", "dec", "jnz"]
-        upcoming_instructions_correct_type = True
-
-        # Peek ahead to the upcoming 5 instructions and make sure they're all the correct type
-        # to potentially be a multiplication operation.
-        for j in range(5):
-            if instructions[i + j + 1].code != ordered_next_instrs[j]:
-                upcoming_instructions_correct_type = False
-                break
-
-        if not upcoming_instructions_correct_type:
-            continue
-
-        # In the initial `cpy` command, the first argument is the first multiplicand and the
-        # second argument is the register that's the "holding cell" which is depleted and added
-        # into the target register.
-        multiplicand_1 = instruction.params[0]  # b
-        holding_cell = instruction.params[1]  # c
-
-        # In the next instruction, the argument is the register that holds the product
-        next_instr = instructions[i + 1]
-        resulting_cell = next_instr.params[0]  # a
-
-        # If the following `dec` instruction's argument is not the holding cell register, this
-        # set of instructions doesn't match the multiplication pattern.
-        next_instr = instructions[i + 2]
-        if next_instr.params[0] != holding_cell:
-            continue
-
-        # If the following `jnz` instruction's argument is not the holding cell register, this
-        # set of instructions doesn't match the multiplication pattern.
-        next_instr = instructions[i + 3]
-        if next_instr.params[0] != holding_cell:
-            continue
-
-        # In the next instruction, the argument is the second multiplcand.
-        next_instr = instructions[i + 4]
-        multiplicand_2 = next_instr.params[0]  # d
-
-        # If the following `jnz` instruction's argument is not the second multiplcand, this set
-        # of instructions doesn't match the multiplication pattern.
-        next_instr = instructions[i + 5]
-        if next_instr.params[0] != multiplicand_2:
-            continue
-
-        # Extract the portions of the Assembunny instructions which precede and follow the
-        # portion to be optimized.
-        before_mul = instructions[:i]
-        after_mul = instructions[i + 6 :]
-
-        # Build the multiplication instruction, and also write 0 to the holding cell and
-        # multiplicand 2 register since that's what the loop does. The total number of
-        # instructions should be the same (so we don't mess up `jnz` instructions which index by
-        # count).
-        mul_instructions = list(
-            map(
-                AssembunnyInstruction.from_line,
-                [
-                    f"mul {resulting_cell} {multiplicand_1} {multiplicand_2}",
-                    f"cpy 0 {holding_cell}",
-                    f"cpy 0 {multiplicand_2}",
-                    "nop",
-                    "nop",
-                    "nop",
-                ],
+    def __init__(self, instructions):
+        # Keep our own copy of the source instructions, since `tgl` modifies them
+        self.codes = [instruction.code for instruction in instructions]
+        self.params = [list(instruction.params) for instruction in instructions]
+
+        self.program = [self._compile(i) for i in range(len(self.codes))]
+        for i in range(len(self.program)):
+            self._optimize_at(i)
+
+    def _compile(self, i):
+        """Returns the compiled form of the single source instruction at index `i`."""
+        code, params = self.codes[i], self.params[i]
+
+        if code == "cpy":
+            src, src_is_register = _operand(params[0])
+            dst, dst_is_register = _operand(params[1])
+            if not dst_is_register:
+                return (NOP,)
+            return (CPY, src, src_is_register, dst)
+
+        if code in ("inc", "dec"):
+            register, is_register = _operand(params[0])
+            if not is_register:
+                return (NOP,)
+            return (INC if code == "inc" else DEC, register)
+
+        if code == "jnz":
+            return (JNZ, *_operand(params[0]), *_operand(params[1]))
+
+        if code == "tgl":
+            return (TGL, *_operand(params[0]))
+
+        if code == "out":
+            return (OUT, *_operand(params[0]))
+
+        raise ValueError(f"WTF is {code}")
+
+    def _is(self, i, code, *params):
+        """Returns whether the source instruction at index `i` has the specified code, and
+        optionally the specified params.
+        """
+        if i >= len(self.codes) or self.codes[i] != code:
+            return False
+        return not params or self.params[i] == list(params)
+
+    def _match_add_loop(self, i):
+        """Returns a tuple of (target, source) registers if the instructions starting at `i`
+        are a loop which adds the source register into the target register, leaving the source
+        register at 0. Otherwise returns None.
+
+        inc a        dec b
+        dec b   or   inc a   -->   a = a + b, b = 0
+        jnz b -2     jnz b -2
+        """
+        if self._is(i, "inc") and self._is(i + 1, "dec"):
+            target, source = self.params[i][0], self.params[i + 1][0]
+        elif self._is(i, "dec") and self._is(i + 1, "inc"):
+            source, target = self.params[i][0], self.params[i + 1][0]
+        else:
+            return None
+
+        if not self._is(i + 2, "jnz", source, "-2"):
+            return None
+        if target == source or target not in REGISTERS or source not in REGISTERS:
+            return None
+
+        return target, source
+
+    def _match_mul_loop(self, i):
+        """Returns a tuple of (target, multiplicand, counter, holding) if the instructions
+        starting at `i` are a loop which repeatedly copies the multiplicand into the holding
+        register and adds that into the target register, as many times as the counter
+        register's value. Otherwise returns None.
+
+        cpy b c
+        <c added into a>
+        dec d
+        jnz d -5     -->   a = a + (b * d), c = 0, d = 0
+        """
+        if not self._is(i, "cpy"):
+            return None
+        multiplicand, holding = self.params[i]
+
+        add_loop = self._match_add_loop(i + 1)
+        if add_loop is None or add_loop[1] != holding:
+            return None
+        target = add_loop[0]
+
+        if not self._is(i + 4, "dec"):
+            return None
+        counter = self.params[i + 4][0]
+        if not self._is(i + 5, "jnz", counter, "-5"):
+            return None
+
+        if len({target, holding, counter}) != 3 or counter not in REGISTERS:
+            return None
+        if multiplicand in (target, holding, counter):
+            return None
+
+        return target, multiplicand, counter, holding
+
+    def _match_div_loop(self, i):
+        """Returns a tuple of (quotient, dividend, divisor, countdown) if the instructions
+        starting at `i` are a loop which counts the dividend register down to 0, adding 1 to the
+        quotient register every time the countdown register (reset to the divisor each time)
+        reaches 0. Otherwise returns None. The divisor must be a positive integer literal.
+
+        cpy 2 c
+        jnz b 2
+        jnz 1 6
+        dec b
+        dec c
+        jnz c -4
+        inc a
+        jnz 1 -7     -->   a = a + (b // 2), c = 2 - (b % 2), b = 0
+        """
+        if not self._is(i, "cpy"):
+            return None
+        divisor, countdown = self.params[i]
+
+        if not (self._is(i + 1, "jnz") and self._is(i + 3, "dec") and self._is(i + 6, "inc")):
+            return None
+        dividend = self.params[i + 1][0]
+        quotient = self.params[i + 6][0]
+
+        if not (
+            self._is(i + 1, "jnz", dividend, "2")
+            and self._is(i + 2, "jnz", "1", "6")
+            and self._is(i + 3, "dec", dividend)
+            and self._is(i + 4, "dec", countdown)
+            and self._is(i + 5, "jnz", countdown, "-4")
+            and self._is(i + 7, "jnz", "1", "-7")
+        ):
+            return None
+
+        if len({quotient, dividend, countdown}) != 3:
+            return None
+        if any(r not in REGISTERS for r in (quotient, dividend, countdown)):
+            return None
+        if not divisor.isdigit() or int(divisor) == 0:
+            return None
+
+        return quotient, dividend, int(divisor), countdown
+
+    def _optimize_at(self, i):
+        """Replaces the compiled instruction at index `i` with a superinstruction, if the
+        source instructions starting there form a loop which can be replaced by one.
+        """
+        div_loop = self._match_div_loop(i)
+        if div_loop is not None:
+            quotient, dividend, divisor, countdown = div_loop
+            self.program[i] = (
+                DIV,
+                REGISTERS.index(quotient),
+                REGISTERS.index(dividend),
+                divisor,
+                REGISTERS.index(countdown),
+                8,
             )
-        )
+            return
+
+        mul_loop = self._match_mul_loop(i)
+        if mul_loop is not None:
+            target, multiplicand, counter, holding = mul_loop
+            self.program[i] = (
+                MUL,
+                REGISTERS.index(target),
+                *_operand(multiplicand),
+                REGISTERS.index(counter),
+                REGISTERS.index(holding),
+                6,
+            )
+            return
+
+        add_loop = self._match_add_loop(i)
+        if add_loop is not None:
+            target, source = add_loop
+            self.program[i] = (ADD, REGISTERS.index(target), REGISTERS.index(source), 3)
+
+    def _toggle(self, i):
+        """Toggles the source instruction at index `i` as described by a `tgl` instruction,
+        then recompiles it and every superinstruction whose loop could include it.
+        """
+        if len(self.params[i]) == 1:
+            self.codes[i] = "dec" if self.codes[i] == "inc" else "inc"
+        else:
+            self.codes[i] = "cpy" if self.codes[i] == "jnz" else "jnz"
+
+        for j in range(max(0, i - LONGEST_SUPERINSTRUCTION + 1), i + 1):
+            self.program[j] = self._compile(j)
+            self._optimize_at(j)
+
+    def run(self, registers, output_buffer=None, max_outputs=None):
+        """Runs the program to completion against the provided register values, which are
+        updated in place. Values sent by `out` are appended to the output buffer, and if
+        `max_outputs` is provided, the program stops once the buffer holds that many values.
+        """
+        self._run(0, registers, output_buffer, max_outputs)
+
+    def step(self, pc, registers, output_buffer=None):
+        """Evaluates the single instruction at the specified program counter against the
+        provided register values, which are updated in place, and returns the program counter
+        of the next instruction. A superinstruction is evaluated whole, as one step.
+        """
+        return self._run(pc, registers, output_buffer, max_steps=1)
+
+    def _run(self, pc, registers, output_buffer=None, max_outputs=None, max_steps=-1):
+        """Runs the program starting at the specified program counter, until the program
+        terminates, the output buffer holds `max_outputs` values, or `max_steps` instructions
+        have been evaluated. Returns the program counter where evaluation stopped.
+        """
+        output_buffer = list() if output_buffer is None else output_buffer
+
+        regs = [registers[r] for r in REGISTERS]
+        program = self.program
+        size = len(program)
+
+        steps = 0
+        while 0 <= pc < size and steps != max_steps:
+            steps += 1
+            instruction = program[pc]
+            op = instruction[0]
+
+            if op == JNZ:
+                _, val, val_is_register, offset, offset_is_register = instruction
+                if val_is_register:
+                    val = regs[val]
+                if val != 0:
+                    pc += regs[offset] if offset_is_register else offset
+                    continue
+
+            elif op == INC:
+                regs[instruction[1]] += 1
+
+            elif op == DEC:
+                regs[instruction[1]] -= 1
+
+            elif op == CPY:
+                _, src, src_is_register, dst = instruction
+                regs[dst] = regs[src] if src_is_register else src
+
+            elif op == ADD:
+                _, target, source, length = instruction
+                regs[target] += regs[source]
+                regs[source] = 0
+                pc += length
+                continue
+
+            elif op == MUL:
+                _, target, m1, m1_is_register, counter, holding, length = instruction
+                regs[target] += (regs[m1] if m1_is_register else m1) * regs[counter]
+                regs[holding] = 0
+                regs[counter] = 0
+                pc += length
+                continue
+
+            elif op == DIV:
+                _, quotient, dividend, divisor, countdown, length = instruction
+                q, r = divmod(regs[dividend], divisor)
+                regs[quotient] += q
+                regs[countdown] = divisor - r
+                regs[dividend] = 0
+                pc += length
+                continue
+
+            elif op == OUT:
+                _, val, val_is_register = instruction
+                output_buffer.append(regs[val] if val_is_register else val)
+                if max_outputs is not None and len(output_buffer) >= max_outputs:
+                    pc += 1
+                    break
+
+            elif op == TGL:
+                _, offset, offset_is_register = instruction
+                target_pc = pc + (regs[offset] if offset_is_register else offset)
+                if 0 <= target_pc < size:
+                    self._toggle(target_pc)
 
-        # Update the instructions, replacing the addition loop with optimized multiplication
-        instructions = before_mul + mul_instructions + after_mul
+            pc += 1
+
+        for r, value in zip(REGISTERS, regs, strict=True):
+            registers[r] = value
+
+        return pc
 
-    return instructions
+
+def run_assembunny(registers, instructions, output_buffer=None, max_outputs=None):
+    """Evaluates a set of assembunny instructions against a set of register values, which are
+    updated in place, running until the instructions terminate (or until the output buffer
+    holds `max_outputs` values, if provided).
+    """
+    CompiledAssembunny(instructions).run(registers, output_buffer, max_outputs)
 
 
 def evaluate_assembunny(registers, instructions, output_buffer=None):
     """Evaluates a set of assembunny instructions against a set of register values, and returns
-    the register values when the instructions terminate."""
+    the register values when the instructions terminate. Yields after every instruction is
+    evaluated, so prefer `run_assembunny` when that isn't needed."""
 
     output_buffer = list() if output_buffer is None else output_buffer
 
-    instructions = _optimize(instructions)
-
-    # Init the program counter (pointer to instruction) to 0
+    program = CompiledAssembunny(instructions)
     pc = 0
 
-    registers_list = set("abcd")
-
-    # While the PC is still pointing to a valid instruction...
-    while pc < len(instructions):
-        instruction = instructions[pc]
-        params = instruction.params
-
-        # Remember if we've already modded the program counter with the jnz instruction
-        already_modded_pc = False
-
-        # Evaluate a "toggle" instruction
-        if instruction.code == "tgl":
-            try:
-                target_instruction = instructions[pc + registers[params[0]]]
-                if len(target_instruction.params) == 1:
-                    target_instruction.code = (
-                        "dec" if target_instruction.code == "inc" else "inc"
-                    )
-                else:
-                    target_instruction.code = (
-                        "cpy" if target_instruction.code == "jnz" else "jnz"
-                    )
-                instructions = _optimize(instructions)
-            except IndexError:
-                pass
-
-        # Evaluate a "jump if not zero" instruction
-        elif instruction.code == "jnz":
-            # Determine the value to check if zero. It's either an int, or a register reference
-            val = params[0]
-            if val in registers_list:
-                val = registers[val]
-            else:
-                val = int(val)
-
-            # If the value is not zero, modify the PC by the value of the second parameter
-            if val != 0:
-                val2 = params[1]
-                if val2 in registers_list:
-                    val2 = registers[val2]
-                else:
-                    val2 = int(val2)
-
-                pc += val2
-                already_modded_pc = True
-
-        # Evaluate a "increment" instruction
-        elif instruction.code == "inc":
-            registers[params[0]] += 1
-
-        # Evaluate a "decrement" instruction
-        elif instruction.code == "dec":
-            registers[params[0]] -= 1
-
-        # Evaluate a "copy" instruction
-        elif instruction.code == "cpy":
-            src = params[0]
-            dst = params[1]
-
-            # If the source value is a register reference, grab the value from that register,
-            # otherwise use the source value as an integer directly.
-            if src in registers_list:
-                src = registers[src]
-            else:
-                src = int(src)
-
-            # Update the destination register with the source value.
-            registers[dst] = src
-
-        # Evaluate a "multiply" instruction
-        elif instruction.code == "mul":
-            target_cell = instruction.params[0]
-            m1, m2 = instruction.params[1], instruction.params[2]
-
-            if m1 in registers_list:
-                m1 = registers[m1]
-            else:
-                m1 = int(m1)
-
-            if m2 in registers_list:
-                m2 = registers[m2]
-            else:
-                m2 = int(m2)
-
-            registers[target_cell] += m1 * m2
-
-        # Evaluate a "no-op" instruction
-        elif instruction.code == "nop":
-            pass
-
-        # Evaluate an "out" instruction
-        elif instruction.code == "out":
-            val = params[0]
-            if val in registers_list:
-                val = registers[val]
-            else:
-                val = int(val)
-
-            output_buffer.append(val)
-
-        else:
-            raise ValueError(f"WTF is {instruction.code}")
-
-        # If we haven't already modified the PC with a jnz instruction, increment the PC.
-        if not already_modded_pc:
-            pc += 1
-
+    while 0 <= pc < len(program.program):
+        pc = program.step(pc, registers, output_buffer)
         yield
@@ -1,7 +1,7 @@
 from util.decorators import aoc_output_formatter
 from util.input import get_input
 
-from .assembunny import AssembunnyInstruction, evaluate_assembunny
+from .assembunny import AssembunnyInstruction, run_assembunny
 
 DAY = 12
 YEAR = 2016
@@ -19,8 +19,7 @@ def part_one(instructions):
     # Init a register bank a-d to 0 values
     registers = {x: 0 for x in "abcd"}
 
-    for step in iter(evaluate_assembunny(registers, instructions)):
-        pass
+    run_assembunny(registers, instructions)
 
     return registers["a"]
 
@@ -32,8 +31,7 @@ def part_two(instructions):
     registers = {x: 0 for x in "abcd"}
     registers["c"] = 1
 
-    for step in iter(evaluate_assembunny(registers, instructions)):
-        pass
+    run_assembunny(registers, instructions)
 
     return registers["a"]
 
@@ -1,6 +1,7 @@
 from functools import lru_cache
 
 from util.decorators import aoc_output_formatter
+from util.search import bfs
 
 DAY = 13
 YEAR = 2016
@@ -45,51 +46,17 @@ def _get_adjacent_open_spaces(coords):
 
 @aoc_output_formatter(YEAR, DAY, 1, PART_ONE_DESCRIPTION, assert_answer=PART_ONE_ANSWER)
 def part_one():
-    # Breadth-first search of the grid
-    visited = set()
-    coord_queue = list()
-
-    coord_queue.append(((1, 1), 0))
-
-    while coord_queue:
-        current, depth = coord_queue.pop(0)
-        visited.add(current)
-
-        # Target location is (31,39). If we're there, return the depth of the BFS search, which
-        # is the minimum number of steps required to get there.
-        if current == (31, 39):
-            return depth
-
-        for next_coord in _get_adjacent_open_spaces(current):
-            if next_coord in visited:
-                continue
-            coord_queue.append((next_coord, depth + 1))
+    # Breadth-first search of the grid until we reach the target location (31,39). The depth
+    # of the BFS search there is the minimum number of steps required to get there.
+    result = bfs([(1, 1)], _get_adjacent_open_spaces, is_target=lambda c: c == (31, 39))
+    return result.target_distance
 
 
 @aoc_output_formatter(YEAR, DAY, 2, PART_TWO_DESCRIPTION, assert_answer=PART_TWO_ANSWER)
 def part_two():
-    # Breadth-first search of the grid
-    visited = set()
-    coord_queue = list()
-
-    coord_queue.append(((1, 1), 0))
-
-    while coord_queue:
-        current, depth = coord_queue.pop(0)
-
-        # We only want to search to a depth of 50.
-        if depth == 51:
-            break
-
-        # Store every cell visited so we can count them.
-        visited.add(current)
-
-        for next_coord in _get_adjacent_open_spaces(current):
-            if next_coord in visited:
-                continue
-            coord_queue.append((next_coord, depth + 1))
-
-    return len(visited)
+    # Breadth-first search of the grid, but only to a depth of 50, and count every cell found.
+    result = bfs([(1, 1)], _get_adjacent_open_spaces, max_depth=50)
+    return len(result.distances)
 
 
 # ----------------------------------------------------------------------------------------------
@@ -4,6 +4,7 @@ from typing import Tuple
 
 from util.decorators import aoc_output_formatter
 from util.input import get_input
+from util.search import bfs
 
 DAY = 17
 YEAR = 2016
@@ -17,7 +18,7 @@ PART_TWO_ANSWER = 706
 _md5 = lambda x: md5(x.encode()).hexdigest()
 
 
-@dataclass
+@dataclass(frozen=True)
 class StateGraphNode:
     coord: Tuple[int, int]
     path: str
@@ -56,23 +57,22 @@ def _get_options(coord, passcode, path):
             yield next_coord, direction
 
 
-@aoc_output_formatter(YEAR, DAY, 1, PART_ONE_DESCRIPTION, assert_answer=PART_ONE_ANSWER)
-def part_one(passcode):
-    state_queue = list()
-    state_queue.append(StateGraphNode(coord=(0, 0), path=""))
+def _get_next_nodes(node, passcode):
+    """A generator which yields the state graph nodes reachable from the provided node, through
+    the doors which are unlocked."""
 
-    while state_queue:
-        curr_state = state_queue.pop(0)
+    for neighbor, direction in _get_options(node.coord, passcode, node.path):
+        yield StateGraphNode(coord=neighbor, path=node.path + direction)
 
-        if curr_state.coord == (3, 3):
-            return curr_state.path
 
-        for neighbor, direction in _get_options(
-            curr_state.coord, passcode, curr_state.path
-        ):
-            state_queue.append(
-                StateGraphNode(coord=neighbor, path=curr_state.path + direction)
-            )
+@aoc_output_formatter(YEAR, DAY, 1, PART_ONE_DESCRIPTION, assert_answer=PART_ONE_ANSWER)
+def part_one(passcode):
+    result = bfs(
+        [StateGraphNode(coord=(0, 0), path="")],
+        lambda node: _get_next_nodes(node, passcode),
+        is_target=lambda node: node.coord == (3, 3),
+    )
+    return result.target.path
 
 
 @aoc_output_formatter(YEAR, DAY, 2, PART_TWO_DESCRIPTION, assert_answer=PART_TWO_ANSWER)
@@ -84,8 +84,8 @@ def part_two(passcode):
             path_lengths.append(len(node.path))
             return
 
-        for neighbor, direction in _get_options(node.coord, passcode, node.path):
-            _dfs(StateGraphNode(coord=neighbor, path=node.path + direction))
+        for next_node in _get_next_nodes(node, passcode):
+            _dfs(next_node)
 
     start = StateGraphNode(coord=(0, 0), path="")
     _dfs(start)
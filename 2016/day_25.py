@@ -2,7 +2,7 @@ from util.decorators import aoc_output_formatter
 from util.input import get_input
 from util.iter import int_stream
 
-from .assembunny import AssembunnyInstruction, evaluate_assembunny
+from .assembunny import AssembunnyInstruction, CompiledAssembunny
 
 DAY = 25
 YEAR = 2016
@@ -11,8 +11,6 @@ PART_ONE_DESCRIPTION = "lowest starting value of register a to produce clock sig
 PART_ONE_ANSWER = 158
 
 
-CLOCK_SIGNAL_VALUES = {0, 1}
-
 CLOCK_SIGNAL_CHECK_LENGTH = 10
 LIKELY_CLOCK_SIGNALS = [
     [0, 1] * int(CLOCK_SIGNAL_CHECK_LENGTH / 2),
@@ -22,6 +20,9 @@ LIKELY_CLOCK_SIGNALS = [
 
 @aoc_output_formatter(YEAR, DAY, 1, PART_ONE_DESCRIPTION, assert_answer=PART_ONE_ANSWER)
 def part_one(instructions):
+    # The program never toggles its own instructions, so it only needs compiling once
+    program = CompiledAssembunny(instructions)
+
     for a_start_value in int_stream():
         # Init an output buffer
         buffer = []
@@ -30,16 +31,10 @@ def part_one(instructions):
         registers = {x: 0 for x in "abcd"}
         registers["a"] = a_start_value
 
-        for _ in iter(
-            evaluate_assembunny(registers, instructions, output_buffer=buffer)
-        ):
-            if buffer and buffer[-1] not in CLOCK_SIGNAL_VALUES:
-                break
-            if len(buffer) == CLOCK_SIGNAL_CHECK_LENGTH:
-                if any(buffer == signal for signal in LIKELY_CLOCK_SIGNALS):
-                    return a_start_value
-                else:
-                    break
+        program.run(registers, output_buffer=buffer, max_outputs=CLOCK_SIGNAL_CHECK_LENGTH)
+
+        if any(buffer == signal for signal in LIKELY_CLOCK_SIGNALS):
+            return a_start_value
 
 
 # ----------------------------------------------------------------------------------------------
@@ -1,6 +1,5 @@
 from util.decorators import aoc_output_formatter
 from util.input import get_input
-from util.iter import int_stream
 from .common_2017 import _rotate
 
 from dataclasses import dataclass
@@ -8,12 +7,83 @@ from string import ascii_lowercase
 
 #---------------------------------------------------------------------------------------------------
 
+class Dance:
+    """ A whole choreography compiled down to two permutations of the dancers, which can be
+    performed in one pass no matter how many steps the choreography has.
+
+    Spins and exchanges only move dancers around by position, while partner steps only swap the
+    names of whichever dancers hold them, wherever they're standing. The two kinds of step
+    therefore commute, so a dance is a permutation of positions followed by a permutation of
+    names. Dancers are named by the integers 0 to N-1, so there can be any number of them. Two
+    dances compose by composing each permutation separately, which means repeating a
+    dance N times only takes O(log N) compositions by repeated squaring. """
+
+    def __init__(self, num_dancers):
+        # `positions[i]` is the position that the dancer who ends up at position i started at
+        self.positions = list(range(num_dancers))
+
+        # `names[x]` is the name that name x ends up as, and
+        # `_name_holders` is its inverse, so partner steps don't need to search for names.
+        self.names = list(range(num_dancers))
+        self._name_holders = list(range(num_dancers))
+
+    def spin(self, steps):
+        self.positions = _rotate(self.positions, steps)
+
+    def exchange(self, index_a, index_b):
+        positions = self.positions
+        positions[index_a], positions[index_b] = positions[index_b], positions[index_a]
+
+    def partner(self, name_a, name_b):
+        holder_of_a = self._name_holders[name_a]
+        holder_of_b = self._name_holders[name_b]
+
+        self.names[holder_of_a] = name_b
+        self.names[holder_of_b] = name_a
+
+        self._name_holders[name_a] = holder_of_b
+        self._name_holders[name_b] = holder_of_a
+
+    def then(self, other):
+        """ Returns a dance which is this dance followed by the other one. """
+
+        dance = Dance(len(self.positions))
+        dance.positions = [self.positions[i] for i in other.positions]
+        dance.names = [other.names[name] for name in self.names]
+        for name, new_name in enumerate(dance.names):
+            dance._name_holders[new_name] = name
+
+        return dance
+
+    def __pow__(self, times):
+        """ Returns a dance which is this dance repeated the specified number of times. """
+
+        repeated = Dance(len(self.positions))
+        squared = self
+
+        # Every power of a dance commutes with every other one, so the order these are
+        # composed in doesn't matter.
+        while times:
+            if times & 1:
+                repeated = repeated.then(squared)
+            squared = squared.then(squared)
+            times >>= 1
+
+        return repeated
+
+    def perform(self, dancers):
+        """ Returns the arrangement of the provided dancers, a list of their names in order,
+        after they perform this dance. """
+
+        return [self.names[dancers[position]] for position in self.positions]
+
+
 @dataclass
 class Spin:
     steps: int
 
-    def enact(self, dancers):
-        return _rotate(dancers, self.steps)
+    def enact(self, dance):
+        dance.spin(self.steps)
 
 
 @dataclass
@@ -23,14 +93,8 @@ class Exchange:
     index_a: int
     index_b: int
 
-    def enact(self, dancers):
-        dancer_at_a = dancers[self.index_a]
-        dancer_at_b = dancers[self.index_b]
-
-        dancers[self.index_a] = dancer_at_b
-        dancers[self.index_b] = dancer_at_a
-
-        return dancers
+    def enact(self, dance):
+        dance.exchange(self.index_a, self.index_b)
 
 
 @dataclass
@@ -40,14 +104,8 @@ class Partner:
     partner_a: int
     partner_b: int
 
-    def enact(self, dancers):
-        index_of_a = dancers.index(self.partner_a)
-        index_of_b = dancers.index(self.partner_b)
-
-        dancers[index_of_a] = self.partner_b
-        dancers[index_of_b] = self.partner_a
-
-        return dancers
+    def enact(self, dance):
+        dance.partner(self.partner_a, self.partner_b)
 
 
 def _parse_choreography(raw_choreography):
@@ -66,61 +124,42 @@ def _parse_choreography(raw_choreography):
             choreography_steps.append(Exchange(index_a, index_b))
 
         elif command == 'p':
-            partner_a, partner_b = rest.split('/')
+            partner_a, partner_b = [ascii_lowercase.index(name) for name in rest.split('/')]
             choreography_steps.append(Partner(partner_a, partner_b))
 
     return choreography_steps
 
 
-@aoc_output_formatter(2017, 16, 1, 'final dancer arrangement')
-def part_one(raw_choreography):
+def _compile_choreography(raw_choreography, num_dancers):
+    """ Compiles every step of the choreography into a single Dance for that many dancers. """
+
+    dance = Dance(num_dancers)
+    for dance_step in _parse_choreography(raw_choreography):
+        dance_step.enact(dance)
+
+    return dance
+
 
-    dancers = list(ascii_lowercase[:16])
-    choreography = _parse_choreography(raw_choreography)
+def _perform_lettered(dance, num_dancers):
+    """ Returns the arrangement, as a string of letters, of dancers named by the first letters
+    of the alphabet in order after they perform the dance. """
 
-    for dance_step in choreography:
-        dancers = dance_step.enact(dancers)
+    dancers = dance.perform(list(range(num_dancers)))
+    return ''.join(ascii_lowercase[dancer] for dancer in dancers)
+
+
+@aoc_output_formatter(2017, 16, 1, 'final dancer arrangement')
+def part_one(raw_choreography):
 
-    return ''.join(dancers)
+    dance = _compile_choreography(raw_choreography, 16)
+    return _perform_lettered(dance, 16)
 
 
 @aoc_output_formatter(2017, 16, 2, 'final dancer arrangement after 1 billion dances')
 def part_two(raw_choreography):
 
-    dancers = list(ascii_lowercase[:16])
-    choreography = _parse_choreography(raw_choreography)
-
-    # The set to hold quick lookup if we've seen this state of dancers before, after a full dance
-    # has finished. The list (history) is to hold an ordered record of the states of the dancers
-    # after each dance.
-    dancer_state_set = {tuple(dancers)}
-    dancer_state_history = list([''.join(dancers)])
-
-    class FoundCycleException(BaseException):
-        pass
-
-    # Keep running dance after dance until we find a state we've seen before.
-    try:
-        for _ in int_stream():
-            for dance_step in choreography:
-                dancers = dance_step.enact(dancers)
-
-            # After the dance finishes, see if we've seen this state of dancers before.
-            dancer_state = tuple(dancers)
-            if dancer_state in dancer_state_set:
-                # If so, break out of the infinite loop
-                raise FoundCycleException()
-            else:
-                # If not, store the dancer state in the set and append this state to the ordered
-                # history of states we've seen.
-                dancer_state_set.add(dancer_state)
-                dancer_state_history.append(''.join(dancer_state))
-    except FoundCycleException:
-        pass
-
-    # The 1 billionth state of the daners will be the modulus of 1 billion % cycle length, because
-    # every cycle_length times we'll circle back and start the cycle of dancer states all over
-    return dancer_state_history[1_000_000_000 % len(dancer_state_history)]
+    dance = _compile_choreography(raw_choreography, 16)
+    return _perform_lettered(dance ** 1_000_000_000, 16)
 
 #---------------------------------------------------------------------------------------------------
 
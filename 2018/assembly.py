@@ -1,7 +1,13 @@
-from dataclasses import dataclass
-from typing import Callable, Dict, List
+import re
+import sys
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from math import isqrt
+from typing import Callable, Dict, List, Optional
 
-from util.input import safe_eval
+import numpy as np
+
+from util.input import get_input, safe_eval
 
 # ----------------------------------------------------------------------------------------------
 
@@ -67,15 +73,15 @@ class CompleteAssemblyInstruction:
 
 
 class AssemblyComputer:
-    def __init__(self, raw_program):
+    def __init__(self, raw_program, compiled=False):
         self.ip = 0
         self.ip_register = None
 
         # If the first line in a program is a declaration binding the IP
         # to a register, remember which register. Ex: #ip 4
         if raw_program[0].startswith("#"):
-            ip_bind_line = raw_program.pop(0)
-            self.ip_register = int(ip_bind_line.split(" ")[-1])
+            self.ip_register = int(raw_program[0].split(" ")[-1])
+            raw_program = raw_program[1:]
 
         self.program = [
             CompleteAssemblyInstruction.from_line(line) for line in raw_program
@@ -84,7 +90,15 @@ class AssemblyComputer:
 
         self.registers = {n: 0 for n in range(6)}
 
+        # When compiled, the program is translated to Python once, and run as that instead.
+        self.compiled = compiled
+        self._compiled_program = None
+
     def run(self):
+        if self.compiled:
+            self._run_compiled()
+            return
+
         while True:
             if self.ip >= self.program_size:
                 return
@@ -101,6 +115,41 @@ class AssemblyComputer:
             if self.ip_register is not None:
                 self.ip = self.registers[self.ip_register] + 1
 
+    def _run_compiled(self):
+        """Runs the program as Python compiled from it, until it halts."""
+
+        if self._compiled_program is None:
+            self._compiled_program = compile_program(self.program, self.ip_register)
+
+        registers = [self.registers[n] for n in range(NUM_REGISTERS)]
+        self.ip, registers = self._compiled_program(*registers, self.ip)
+        self.registers = dict(enumerate(registers))
+
+    def watch(self, *watchpoints):
+        """Runs the program as Python compiled from it, checking the watchpoints each time an
+        instruction they watch is about to run, until the program halts or a watchpoint stops
+        it. If stopped, the IP and registers are left as they were before that instruction."""
+
+        watchpoints_by_ip = defaultdict(list)
+        for watchpoint in watchpoints:
+            watchpoints_by_ip[watchpoint.ip].append(watchpoint)
+
+        program = compile_program(
+            self.program, self.ip_register, watched_ips=set(watchpoints_by_ip)
+        )
+
+        registers = [self.registers[n] for n in range(NUM_REGISTERS)]
+        running_program = program(*registers, self.ip)
+        try:
+            while True:
+                ip, registers = next(running_program)
+                if _check_watchpoints(watchpoints_by_ip[ip], registers):
+                    self.ip, self.registers = ip, dict(enumerate(registers))
+                    return
+        except StopIteration as halted:
+            self.ip, registers = halted.value
+            self.registers = dict(enumerate(registers))
+
 
 class StepwiseAssemblyComputer:
     def __init__(self, raw_program):
@@ -110,8 +159,8 @@ class StepwiseAssemblyComputer:
         # If the first line in a program is a declaration binding the IP
         # to a register, remember which register. Ex: #ip 4
         if raw_program[0].startswith("#"):
-            ip_bind_line = raw_program.pop(0)
-            self.ip_register = int(ip_bind_line.split(" ")[-1])
+            self.ip_register = int(raw_program[0].split(" ")[-1])
+            raw_program = raw_program[1:]
 
         self.program = [
             CompleteAssemblyInstruction.from_line(line) for line in raw_program
@@ -141,6 +190,160 @@ class StepwiseAssemblyComputer:
             if self.ip_register is not None:
                 self.ip = self.registers[self.ip_register] + 1
 
+    def trace(self, max_steps=None, watchpoints=()):
+        """Runs the program until it halts, a watchpoint stops it, or `max_steps` instructions
+        have run, and returns an ExecutionProfile of how often each instruction and each basic
+        block ran along the way.
+
+        Each watchpoint is checked each time the instruction it watches is about to run. Only
+        counters are updated on every instruction, and the watchpoints are only looked at on
+        the instructions they watch."""
+
+        profile = ExecutionProfile(ip_counts=[0] * self.program_size)
+        ip_counts = profile.ip_counts
+        block_counts = profile.block_counts
+
+        watchpoints_by_ip = defaultdict(list)
+        for watchpoint in watchpoints:
+            watchpoints_by_ip[watchpoint.ip].append(watchpoint)
+
+        # Everything used on every step is kept in local variables, since that's so much faster
+        # than looking up attributes.
+        program = self.program
+        program_size = self.program_size
+        ip_register = self.ip_register
+        registers = self.registers
+        step_limit = float("inf") if max_steps is None else max_steps
+
+        # A basic block runs from wherever execution lands, up to the next instruction which
+        # doesn't just continue on to the one after it.
+        ip = self.ip
+        block_start = ip
+        steps = 0
+
+        is_watched = [i in watchpoints_by_ip for i in range(program_size)]
+
+        while 0 <= ip < program_size and steps < step_limit:
+            if ip_register is not None:
+                registers[ip_register] = ip
+
+            if is_watched[ip] and _check_watchpoints(watchpoints_by_ip[ip], registers):
+                break
+
+            registers = program[ip].execute(registers)
+            ip_counts[ip] += 1
+            steps += 1
+
+            next_ip = ip + 1 if ip_register is None else registers[ip_register] + 1
+            if next_ip != ip + 1:
+                block_counts[block_start, ip] += 1
+                block_start = next_ip
+
+            ip = next_ip
+
+        # Count the block which was partway through running when the trace stopped, if any.
+        # Right after a jump, the next block starts where the IP is and hasn't run yet.
+        if block_start != ip:
+            block_counts[block_start, ip - 1] += 1
+
+        self.ip = ip
+        self.registers = registers
+        profile.steps = steps
+        return profile
+
+
+@dataclass
+class Watchpoint:
+    """Watches a register's value each time the instruction at `ip` is about to run, if the
+    registers at that point pass the predicate (or always, if there's no predicate).
+
+    Records each distinct value in the order they first appear. If `stop_on_repeat` is set,
+    the program is stopped the first time a value comes up again.
+
+    Ex: the first and last distinct values of register 3 at instruction 28
+    Watchpoint(ip=28, register=3, stop_on_repeat=True)  -->  .first_value, .last_value
+    """
+
+    ip: int
+    register: int
+    predicate: Optional[Callable] = None
+    stop_on_repeat: bool = False
+
+    hits: int = 0
+    distinct_values: List[int] = field(default_factory=list)
+    _values_seen: set = field(default_factory=set, repr=False)
+
+    @property
+    def first_value(self):
+        return self.distinct_values[0] if self.distinct_values else None
+
+    @property
+    def last_value(self):
+        return self.distinct_values[-1] if self.distinct_values else None
+
+    def check(self, registers):
+        """Checks the registers as the watched instruction is about to run, and returns whether
+        the program should be stopped."""
+
+        if self.predicate is not None and not self.predicate(registers):
+            return False
+
+        self.hits += 1
+        value = registers[self.register]
+        if value in self._values_seen:
+            return self.stop_on_repeat
+
+        self._values_seen.add(value)
+        self.distinct_values.append(value)
+        return False
+
+
+def _check_watchpoints(watchpoints, registers):
+    """Checks each of the watchpoints against the registers, and returns whether any of them
+    says the program should be stopped."""
+
+    should_stop = False
+    for watchpoint in watchpoints:
+        should_stop |= watchpoint.check(registers)
+
+    return should_stop
+
+
+@dataclass
+class ExecutionProfile:
+    """How many times each instruction ran while tracing a program, and how many times each
+    basic block, as (first IP, last IP), ran from start to end."""
+
+    ip_counts: List[int]
+    block_counts: Counter = field(default_factory=Counter)
+    steps: int = 0
+
+    def hot_blocks(self, n=10):
+        """Returns the n basic blocks which ran the most instructions, as tuples of
+        ((first IP, last IP), times run), most instructions first."""
+
+        blocks = sorted(
+            self.block_counts.items(),
+            key=lambda item: item[1] * (item[0][1] - item[0][0] + 1),
+            reverse=True,
+        )
+        return blocks[:n]
+
+    def report(self, program, n=10):
+        """Returns a printable report of how many times each instruction of the program ran,
+        followed by the hottest basic blocks."""
+
+        lines = [f"{self.steps:,} instructions run", ""]
+        for ip, (count, instruction) in enumerate(zip(self.ip_counts, program)):
+            share = count / self.steps if self.steps else 0
+            lines.append(f"{ip:>3}  {str(instruction):<20} {count:>14,}  {share:>6.1%}")
+
+        lines.extend(["", "Hottest basic blocks:"])
+        for (first_ip, last_ip), count in self.hot_blocks(n):
+            lines.append(f"  {first_ip:>3} - {last_ip:<3} {count:>14,} times")
+
+        return "\n".join(lines)
+
 
 @dataclass
 class AssemblyTestCase:
@@ -184,6 +387,100 @@ class AssemblyTestCase:
         return fn(self.instruction.params, before_copy) == self.registers_after
 
 
+@dataclass
+class AssemblySamples:
+    """Represents many test cases for assembly instructions at once, as arrays with a row per
+    sample, so every operation can be checked against every sample with a handful of NumPy
+    array expressions instead of a Python call per sample.
+
+    `before` and `after` hold the 4 register values before and after each sample's instruction
+    runs, and `instructions` holds each instruction's opcode followed by its 3 parameters."""
+
+    before: np.ndarray
+    instructions: np.ndarray
+    after: np.ndarray
+
+    @staticmethod
+    def from_lines(lines: List[str]):
+        """Returns AssemblySamples as parsed from the sample section of the input, where each
+        sample is a "Before:" line, an instruction line, and an "After:" line."""
+
+        numbers = re.findall(r"\d+", "\n".join(lines))
+        table = np.array(numbers, dtype=np.int64).reshape(-1, 12)
+        return AssemblySamples(
+            before=table[:, 0:4],
+            instructions=table[:, 4:8],
+            after=table[:, 8:12],
+        )
+
+    def __len__(self):
+        return len(self.instructions)
+
+    def match_matrix(self):
+        """Returns a boolean array with a row per sample and a column per operator in
+        ALL_OPERATORS, which is True where that operator turns the sample's registers before
+        into its registers after."""
+
+        rows = np.arange(len(self))
+        a, b, c = (self.instructions[:, i] for i in (1, 2, 3))
+
+        # Parameters naming a register which doesn't exist can't match. Clip them so they can
+        # still be used as indices, and rule them out afterwards.
+        a_is_register, b_is_register = a < 4, b < 4
+        register_a = self.before[rows, np.minimum(a, 3)]
+        register_b = self.before[rows, np.minimum(b, 3)]
+
+        # Every register except the output must be unchanged.
+        changed = self.after != self.before
+        others_unchanged = changed.sum(axis=1) == changed[rows, np.minimum(c, 3)]
+        others_unchanged &= c < 4
+        expected = self.after[rows, np.minimum(c, 3)]
+
+        matches = np.empty((len(self), len(ALL_OPERATORS)), dtype=bool)
+        for column, operator in enumerate(ALL_OPERATORS):
+            operation_txt = operator.__name__.lstrip("_")
+            kinds, _ = OPERATION_EXPRESSIONS[operation_txt]
+
+            value_a, valid = (register_a, a_is_register) if kinds[0] == "r" else (a, True)
+            value_b = register_b if kinds[1] == "r" else b
+            if kinds[1] == "r":
+                valid = valid & b_is_register
+
+            result = ARRAY_OPERATIONS[operation_txt](value_a, value_b)
+            matches[:, column] = others_unchanged & (result == expected) & valid
+
+        return matches
+
+    def infer_opcodes(self, matches=None):
+        """Returns a dict of each opcode to the operator it must be, working it out from which
+        operators match every sample with that opcode.
+
+        Any opcode left with only one possible operator must be that operator, which rules it
+        out for every other opcode, and so on until every opcode is decided."""
+
+        if matches is None:
+            matches = self.match_matrix()
+
+        codes = self.instructions[:, 0]
+        possible = {
+            int(code): matches[codes == code].all(axis=0) for code in np.unique(codes)
+        }
+
+        opcodes = dict()
+        while possible:
+            decided = [code for code, candidates in possible.items() if candidates.sum() == 1]
+            if not decided:
+                raise ValueError("The samples don't narrow every opcode down to one operator")
+
+            for code in decided:
+                column = int(np.flatnonzero(possible.pop(code))[0])
+                opcodes[code] = ALL_OPERATORS[column]
+                for candidates in possible.values():
+                    candidates[column] = False
+
+        return opcodes
+
+
 def _addr(params, registers):
     val1 = registers[params[0]]
     val2 = registers[params[1]]
@@ -328,3 +625,344 @@ ALL_OPERATORS = [
     _eqri,
     _eqrr,
 ]
+
+
+# ----------------------------------------------------------------------------------------------
+# Compiling ElfCode programs to Python
+# ----------------------------------------------------------------------------------------------
+
+NUM_REGISTERS = 6
+
+# How each operation reads its first two parameters (r for a register, i for an immediate
+# value, - for unused), and the Python expression it computes from them.
+OPERATION_EXPRESSIONS = {
+    "addr": ("rr", "{a} + {b}"),
+    "addi": ("ri", "{a} + {b}"),
+    "mulr": ("rr", "{a} * {b}"),
+    "muli": ("ri", "{a} * {b}"),
+    "banr": ("rr", "{a} & {b}"),
+    "bani": ("ri", "{a} & {b}"),
+    "borr": ("rr", "{a} | {b}"),
+    "bori": ("ri", "{a} | {b}"),
+    "setr": ("r-", "{a}"),
+    "seti": ("i-", "{a}"),
+    "gtir": ("ir", "1 if {a} > {b} else 0"),
+    "gtri": ("ri", "1 if {a} > {b} else 0"),
+    "gtrr": ("rr", "1 if {a} > {b} else 0"),
+    "eqir": ("ir", "1 if {a} == {b} else 0"),
+    "eqri": ("ri", "1 if {a} == {b} else 0"),
+    "eqrr": ("rr", "1 if {a} == {b} else 0"),
+}
+
+# The NumPy equivalent of each operation, applied to whole arrays of its two inputs at once
+ARRAY_OPERATIONS = {
+    "addr": np.add,
+    "addi": np.add,
+    "mulr": np.multiply,
+    "muli": np.multiply,
+    "banr": np.bitwise_and,
+    "bani": np.bitwise_and,
+    "borr": np.bitwise_or,
+    "bori": np.bitwise_or,
+    "setr": lambda a, b: a,
+    "seti": lambda a, b: a,
+    "gtir": np.greater,
+    "gtri": np.greater,
+    "gtrr": np.greater,
+    "eqir": np.equal,
+    "eqri": np.equal,
+    "eqrr": np.equal,
+}
+
+# Operations whose first two parameters can be swapped without changing the result
+COMMUTATIVE_OPERATIONS = {"addr", "mulr", "banr", "borr", "eqrr"}
+
+
+@dataclass
+class Superinstruction:
+    """Represents a loop which ElfCode programs use for a common calculation, which can be
+    recognized by its instructions and replaced by the equivalent Python.
+
+    In the pattern of instructions, uppercase names are distinct registers, lowercase names are
+    immediate values, "IP" is the register bound to the IP, "@n" is a jump to the n-th
+    instruction of the pattern, and "_" is an ignored parameter. The lines of Python code refer
+    to the registers and values by those same names."""
+
+    name: str
+    pattern: List[tuple]
+    code: List[str]
+    is_valid: Callable = field(default=lambda bindings: True)
+
+
+# For A and B from 1 to N, add A to S whenever A * B == N. Sums the divisors of N.
+DIVISOR_SUM = Superinstruction(
+    name="divisor sum",
+    pattern=[
+        ("seti", 1, "_", "A"),
+        ("seti", 1, "_", "B"),
+        ("mulr", "A", "B", "T"),
+        ("eqrr", "T", "N", "T"),
+        ("addr", "T", "IP", "IP"),
+        ("addi", "IP", 1, "IP"),
+        ("addr", "A", "S", "S"),
+        ("addi", "B", 1, "B"),
+        ("gtrr", "B", "N", "T"),
+        ("addr", "IP", "T", "IP"),
+        ("seti", "@2", "_", "IP"),
+        ("addi", "A", 1, "A"),
+        ("gtrr", "A", "N", "T"),
+        ("addr", "T", "IP", "IP"),
+        ("seti", "@1", "_", "IP"),
+    ],
+    code=[
+        "if {N} >= 1:",
+        "    {S} += _sum_of_divisors({N})",
+        "    {A} = {B} = {N} + 1",
+        "else:",
+        "    {A} = {B} = 2",
+        "{T} = 1",
+    ],
+)
+
+# Count T up from 0 until (T + 1) * k > N. Divides N by k, rounding down.
+DIVISION = Superinstruction(
+    name="division",
+    pattern=[
+        ("seti", 0, "_", "T"),
+        ("addi", "T", 1, "U"),
+        ("muli", "U", "k", "U"),
+        ("gtrr", "U", "N", "U"),
+        ("addr", "U", "IP", "IP"),
+        ("addi", "IP", 1, "IP"),
+        ("seti", "@9", "_", "IP"),
+        ("addi", "T", 1, "T"),
+        ("seti", "@1", "_", "IP"),
+    ],
+    code=[
+        "{T} = max(0, {N} // {k})",
+        "{U} = 1",
+    ],
+    is_valid=lambda bindings: bindings["k"] > 0,
+)
+
+ALL_SUPERINSTRUCTIONS = [DIVISOR_SUM, DIVISION]
+
+
+def _sum_of_divisors(n):
+    """Returns the sum of all the divisors of n, including 1 and n itself."""
+
+    total = 0
+    for i in range(1, isqrt(n) + 1):
+        if n % i == 0:
+            total += i
+            if i != n // i:
+                total += n // i
+
+    return total
+
+
+def _bind_params(pattern_params, params, start, ip_register, bindings):
+    """Returns the bindings extended with the names in the pattern's parameters, if the
+    instruction's parameters match them, or None if they don't."""
+
+    bindings = dict(bindings)
+    for pattern_param, param in zip(pattern_params, params):
+        if pattern_param == "_":
+            continue
+
+        if pattern_param == "IP":
+            matches = param == ip_register
+        elif isinstance(pattern_param, int):
+            matches = param == pattern_param
+        elif pattern_param.startswith("@"):
+            # Jumps set the IP register to 1 before the instruction they go to
+            matches = param + 1 == start + int(pattern_param[1:])
+        else:
+            matches = bindings.setdefault(pattern_param, param) == param
+
+        if not matches:
+            return None
+
+    return bindings
+
+
+def _match_superinstruction(superinstruction, program, start, ip_register):
+    """Returns the names bound to registers and values if the program matches the
+    superinstruction's pattern starting at the instruction at `start`, or None if it doesn't."""
+
+    pattern = superinstruction.pattern
+    if ip_register is None or start + len(pattern) > len(program):
+        return None
+
+    bindings = dict()
+    for offset, (operation_txt, *pattern_params) in enumerate(pattern):
+        instruction = program[start + offset]
+        if instruction.operation_txt != operation_txt:
+            return None
+
+        a, b, c = instruction.params
+        orderings = (
+            [(a, b, c), (b, a, c)] if operation_txt in COMMUTATIVE_OPERATIONS else [(a, b, c)]
+        )
+
+        for params in orderings:
+            matched = _bind_params(pattern_params, params, start, ip_register, bindings)
+            if matched is not None:
+                bindings = matched
+                break
+        else:
+            return None
+
+    registers = [value for name, value in bindings.items() if name.isupper()]
+    if len(set(registers)) != len(registers) or ip_register in registers:
+        return None
+
+    return bindings if superinstruction.is_valid(bindings) else None
+
+
+def _is_jump(instruction, ip_register):
+    """Returns whether the instruction is a jump, that is, whether it writes to the IP
+    register."""
+
+    return ip_register is not None and instruction.params[2] == ip_register
+
+
+def _static_jump_target(instruction, ip, ip_register):
+    """Returns the IP that the jump at `ip` always goes to, or None if it depends on the value
+    of some register other than the IP register."""
+
+    kinds, _ = OPERATION_EXPRESSIONS[instruction.operation_txt]
+    a, b, _ = instruction.params
+
+    if any(kind == "r" and param != ip_register for kind, param in zip(kinds, (a, b))):
+        return None
+
+    registers = {n: 0 for n in range(NUM_REGISTERS)}
+    registers[ip_register] = ip
+    return instruction.execute(registers)[ip_register] + 1
+
+
+def _instruction_code(instruction, ip, ip_register):
+    """Returns a line of Python which does the same as the instruction at `ip`.
+
+    Reading the IP register always gives `ip`, so those reads are replaced by that value. A jump
+    assigns the next IP to the `ip` variable instead of updating a register."""
+
+    kinds, expression = OPERATION_EXPRESSIONS[instruction.operation_txt]
+    a, b, c = instruction.params
+
+    def _operand(kind, param):
+        if kind != "r":
+            return str(param)
+        return str(ip) if param == ip_register else f"r{param}"
+
+    expression = expression.format(a=_operand(kinds[0], a), b=_operand(kinds[1], b))
+    if not _is_jump(instruction, ip_register):
+        return f"r{c} = {expression}"
+
+    target = _static_jump_target(instruction, ip, ip_register)
+    if target is not None:
+        return f"ip = {target}"
+
+    return f"ip = ({expression}) + 1"
+
+
+def _entry_code(program, ip_register, start, watched_ips, superinstructions):
+    """Returns the lines of Python which run the program from the instruction at `start` up to
+    and including the next jump, or up to the end of the program. Recognized superinstructions
+    are replaced by their Python equivalent along the way."""
+
+    registers = [f"r{n}" for n in range(NUM_REGISTERS)]
+
+    lines = list()
+    ip = start
+    while ip < len(program):
+        if ip in watched_ips:
+            watched = [str(ip) if n == ip_register else r for n, r in enumerate(registers)]
+            lines.append(f"yield {ip}, ({', '.join(watched)})")
+
+        for superinstruction in superinstructions:
+            bindings = _match_superinstruction(superinstruction, program, ip, ip_register)
+            size = len(superinstruction.pattern)
+
+            # Don't skip over any instruction that's being watched.
+            if bindings is None or watched_ips.intersection(range(ip + 1, ip + size)):
+                continue
+
+            names = {
+                name: f"r{value}" if name.isupper() else value
+                for name, value in bindings.items()
+            }
+            lines.append(f"# {superinstruction.name}, instructions {ip} to {ip + size - 1}")
+            lines.extend(line.format(**names) for line in superinstruction.code)
+            ip += size
+            break
+
+        else:
+            instruction = program[ip]
+            code = _instruction_code(instruction, ip, ip_register)
+            lines.append(f"{code}  # {ip:02} {instruction}")
+            if _is_jump(instruction, ip_register):
+                return lines
+
+            ip += 1
+
+    lines.append(f"ip = {ip}")
+    return lines
+
+
+def _generate_source(program, ip_register, watched_ips, superinstructions):
+    """Returns the source of a Python function which runs the program, with the registers held
+    in local variables, from the IP it's called with until it halts.
+
+    There's an entry in the function for every instruction, each running straight through to
+    the next jump. Any instruction is a valid place to jump to, but entries for those which are
+    jumped to directly, or which follow a jump, are checked first."""
+
+    # Jumps which depend on a register usually add a comparison's result to the IP, so they go
+    # to one of the next 2 instructions.
+    jump_targets = {0}
+    for ip, instruction in enumerate(program):
+        if _is_jump(instruction, ip_register):
+            target = _static_jump_target(instruction, ip, ip_register)
+            jump_targets.update((ip + 1, ip + 2) if target is None else (ip + 1, target))
+
+    entries = sorted(range(len(program)), key=lambda ip: (ip not in jump_targets, ip))
+
+    registers = [f"r{n}" for n in range(NUM_REGISTERS)]
+    halted = ["ip - 1" if n == ip_register else r for n, r in enumerate(registers)]
+
+    lines = [f"def _program({', '.join(registers)}, ip):", "    while True:"]
+    for i, start in enumerate(entries):
+        lines.append(f"        {'if' if i == 0 else 'elif'} ip == {start}:")
+        for line in _entry_code(program, ip_register, start, watched_ips, superinstructions):
+            lines.append(f"            {line}")
+
+    lines.append("        else:")
+    lines.append(f"            return ip, ({', '.join(halted)})")
+
+    return "\n".join(lines) + "\n"
+
+
+def compile_program(program, ip_register, watched_ips=(), use_superinstructions=True):
+    """Returns a Python function which runs the program, given the value of each register and
+    the IP to start at, until it halts, and then returns the final IP and register values.
+
+    If any instructions are watched, the function is instead a generator which yields the IP
+    and register values each time one of those instructions is about to run."""
+
+    superinstructions = ALL_SUPERINSTRUCTIONS if use_superinstructions else []
+    source = _generate_source(program, ip_register, set(watched_ips), superinstructions)
+
+    namespace = {"_sum_of_divisors": _sum_of_divisors}
+    exec(compile(source, "<elfcode>", "exec"), namespace)
+    return namespace["_program"]
+
+
+if __name__ == "__main__":
+    # python -m 2018.assembly input_file [max_steps]
+    raw_program = get_input(sys.argv[1])
+    max_steps = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+
+    computer = StepwiseAssemblyComputer(raw_program)
+    print(computer.trace(max_steps=max_steps).report(computer.program))
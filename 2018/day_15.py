@@ -1,4 +1,4 @@
-from collections import defaultdict
+from collections import Counter
 from dataclasses import dataclass
 
 from util.decorators import aoc_output_formatter
@@ -15,343 +15,258 @@ PART_TWO_DESCRIPTION = "battle outcome when elves have min power to win without
 PART_TWO_ANSWER = 35354
 
 
-# Global "config" flag to differentiate behavior between part 1 and 2.
-# In part 2, we'll raise if an elf dies so we can reset and try again with higher elf power.
-raise_elf_died = False
-
-
-AIR = "."
 WALL = "#"
+ELF = "E"
+GOBLIN = "G"
 
+STARTING_HP = 200
+GOBLIN_POWER = 3
 
-class CombatEnded(Exception):
-    pass
+# Elves with this much attack power kill any unit in a single hit
+MAX_ELF_POWER = STARTING_HP
 
 
 class ElfDied(Exception):
     pass
 
 
-def _get_shortest_distance_between(c1, c2, units, cavern):
-    """Implement a BFS which finds the distance of the shortest path between two points, inside
-    a given cavern (map) layout and info about the current units' positions."""
-
-    queue = []
-    queue.append((0, c1))
-
-    visited = set()
-    visited.add(c1)
+@dataclass(frozen=True)
+class Cavern:
+    """The cavern layout parsed from the problem input.
 
-    units_positions = set(u.coord for u in units if u.alive)
+    Every cell is identified by its index in a flattened grid (y * width + x), so sorting cells
+    by their index sorts them in reading order.
+    """
 
-    while queue:
-        steps, cell = queue.pop(0)
-        if cell == c2:
-            return steps
+    # For each cell, its neighbors which are open floor rather than walls, in reading order.
+    # Walls have no open neighbors listed, since nothing ever stands in them.
+    open_neighbors: tuple[tuple[int, ...], ...]
 
-        # Find neighboring positions of the current cell which are not cavern walls, and which
-        # are not occupied by any living units.
-        x, y = cell
-        neighbors = [(x + 1, y), (x - 1, y), (x, y - 1), (x, y + 1)]
-        valid_neighbors = [c for c in neighbors if cavern[c] != WALL]
-        valid_neighbors = [c for c in valid_neighbors if c not in units_positions]
-
-        # c2 is usually a target unit we're trying to reach, so it'll show up in `neighbors` but
-        # be removed above because it's also another unit's position. Add it back here so we can
-        # actually reach it.
-        if c2 in neighbors and c2 not in valid_neighbors:
-            valid_neighbors.append(c2)
-
-        for n in valid_neighbors:
-            if n in visited:
-                continue
-            visited.add(n)
-            queue.append((steps + 1, n))
+    # The kind and starting cell of each unit
+    unit_starts: tuple[tuple[str, int], ...]
 
 
 @dataclass
 class Unit:
-    unittype: str
-    x: int
-    y: int
-    hp: int
-    id: str
-    alive: bool
+    kind: str
+    position: int
     power: int
+    hp: int = STARTING_HP
 
     @property
-    def coord(self):
-        return (self.x, self.y)
+    def alive(self):
+        return self.hp > 0
 
     @property
-    def neighbors(self):
-        return {
-            (self.x + 1, self.y),
-            (self.x - 1, self.y),
-            (self.x, self.y + 1),
-            (self.x, self.y - 1),
-        }
-
-    def _identify_targets(self, units):
-        """Find all living units which are of the opposite type of this unit. Elves attack
-        goblins, and vice versa."""
+    def enemy_kind(self):
+        return GOBLIN if self.kind == ELF else ELF
 
-        return [u for u in units if u.unittype != self.unittype and u.alive]
 
-    def _get_walking_targets(self, targets, units, cavern):
-        """Get all positions we can walk to which are within range of an enemy unit (immediately
-        adjacent, not diagonal, and not a cavern wall or already occupied by a living unit)."""
+class Battle:
+    """A battle between the elves and goblins in the cavern.
 
-        walking_targets = set()
+    Which unit (if any) occupies each cell is tracked in a grid which is updated as units move
+    and die, so checking whether a cell is free or holds an enemy is a single lookup."""
 
-        units_positions = set(u.coord for u in units if u.alive)
+    def __init__(self, cavern, elf_power, elves_must_survive=False):
+        self.cavern = cavern
+        self.elves_must_survive = elves_must_survive
 
-        for target in targets:
-            x, y = target.coord
+        self.units = [
+            Unit(kind, position, elf_power if kind == ELF else GOBLIN_POWER)
+            for kind, position in cavern.unit_starts
+        ]
 
-            adjacents = [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]
-            valid_adjacents = [c for c in adjacents if cavern[c] != WALL]
-            valid_adjacents = [c for c in valid_adjacents if c not in units_positions]
+        self.occupants = [None] * len(cavern.open_neighbors)
+        for unit in self.units:
+            self.occupants[unit.position] = unit
 
-            for a in valid_adjacents:
-                walking_targets.add(a)
+        self.units_remaining = Counter(unit.kind for unit in self.units)
 
-        return walking_targets
+    def _adjacent_enemies(self, unit):
+        """Returns the living enemies immediately adjacent to the unit, in reading order."""
 
-    def _get_nearest_walking_targets(self, targets, units, cavern):
-        """For all positions in the cavern we can walk to which put us immediately in range of
-        an enemy unit, return the subset of those which are closest to our current position."""
+        enemies = list()
+        for neighbor in self.cavern.open_neighbors[unit.position]:
+            occupant = self.occupants[neighbor]
+            if occupant is not None and occupant.kind == unit.enemy_kind:
+                enemies.append(occupant)
 
-        walking_targets = self._get_walking_targets(targets, units, cavern)
+        return enemies
 
-        distance_to_targets = defaultdict(list)
+    def _choose_step(self, unit):
+        """Returns the cell the unit should step into to move towards the nearest cell which is
+        in range of an enemy, or None if no such cell can be reached.
 
-        for target in walking_targets:
-            distance = _get_shortest_distance_between(self.coord, target, units, cavern)
-            if distance is None:
-                continue
-            distance_to_targets[distance].append(target)
+        This is a single breadth-first search outwards from the unit, one distance at a time.
+        Along with each cell's distance, it remembers which of the unit's neighboring cells is
+        the first step on a shortest path to it, preferring the first in reading order when
+        several shortest paths start with different steps. Once any in-range cell is found, the
+        nearest in-range cell which is first in reading order is the destination, and its
+        remembered first step is the step to take."""
 
-        if not distance_to_targets:
-            return []
+        open_neighbors = self.cavern.open_neighbors
+        occupants = self.occupants
 
-        min_distance = min(distance_to_targets.keys())
-        return distance_to_targets[min_distance]
-
-    def _choose_target_by_min_hp(self, targets):
-        """Return the enemy target with the lowest HP."""
-
-        targets.sort(key=lambda t: t.hp)
-        return targets[0]
-
-    def _attack_target(self, target):
-        """Perform an attack on an enemy target."""
+        in_range = {
+            neighbor
+            for enemy in self.units
+            if enemy.alive and enemy.kind == unit.enemy_kind
+            for neighbor in open_neighbors[enemy.position]
+            if occupants[neighbor] is None
+        }
 
-        global raise_elf_died
+        # The first cells reached are the unit's free neighbors, and each is its own first step.
+        frontier = {
+            neighbor: neighbor
+            for neighbor in open_neighbors[unit.position]
+            if occupants[neighbor] is None
+        }
+        visited = {unit.position, *frontier}
 
-        target.hp -= self.power
+        while frontier:
+            destinations = in_range.intersection(frontier)
+            if destinations:
+                return frontier[min(destinations)]
 
-        if target.hp <= 0:
-            target.alive = False
+            # Every cell at the next distance is reached only from cells at this distance, so
+            # each keeps the lowest first step of all the cells it can be reached from.
+            next_frontier = dict()
+            for position, first_step in frontier.items():
+                for neighbor in open_neighbors[position]:
+                    if neighbor in visited or occupants[neighbor] is not None:
+                        continue
+                    if first_step < next_frontier.get(neighbor, first_step + 1):
+                        next_frontier[neighbor] = first_step
 
-            # Only raise the ElfDied exception for part 2.
-            if target.unittype == "e" and raise_elf_died:
-                raise ElfDied()
+            visited.update(next_frontier)
+            frontier = next_frontier
 
-    def _get_targets_in_range(self, units):
-        """Return enemy targets within range to be attacked."""
+        return None
 
-        targets = self._identify_targets(units)
-        if not targets:
-            raise CombatEnded()
+    def _attack(self, unit, target):
+        """Performs an attack on an enemy target, removing it from the cavern if it dies."""
 
-        # Targets are in range to be attacked if they are immediately adjacent to us.
-        return [t for t in targets if t.coord in self.neighbors]
+        target.hp -= unit.power
+        if target.alive:
+            return
 
-    def _pick_target_and_walk_towards(self, units, cavern):
-        """Choose an enemy target and take one step towards it (rules elucidated below)."""
+        self.occupants[target.position] = None
+        self.units_remaining[target.kind] -= 1
 
-        # These are the positions from which we can attack an enemy unit, that are the closest
-        # to our current position.
-        nearest_walking_targets = self._get_nearest_walking_targets(
-            self._identify_targets(units),
-            units,
-            cavern,
-        )
+        if target.kind == ELF and self.elves_must_survive:
+            raise ElfDied()
 
-        if not nearest_walking_targets:
-            return
+    def _take_turn(self, unit):
+        """Executes one turn for the unit. Returns False if the unit has no enemies left to
+        fight, which means combat has ended."""
 
-        # Sort the candidate positions to walk towards by "reading order" (x then y coords) and
-        # choose the first as the position we want to walk towards.
-        nearest_walking_targets.sort(key=lambda c: c[0])
-        nearest_walking_targets.sort(key=lambda c: c[1])
-        walk_target = nearest_walking_targets[0]
-
-        # Find positions neighboring us right now, which we can step into (not a cavern wall or
-        # otherwise occupied by a living unit.)
-        units_positions = set(u.coord for u in units if u.alive)
-        valid_neighbors = [c for c in self.neighbors if cavern[c] != WALL]
-        valid_neighbors = [c for c in valid_neighbors if c not in units_positions]
-
-        # For each position adjacent to our current position, find the distance between that and
-        # the final enemy-adjacent position we want to reach.
-        distances_to_neighbors = defaultdict(list)
-        for n in valid_neighbors:
-            d = _get_shortest_distance_between(n, walk_target, units, cavern)
-            if d is None:
-                continue
-            distances_to_neighbors[d].append(n)
-
-        # Find which places we can step (1 step away) which are closest to the target
-        # enemy-adjacent position we want to walk towards.
-        min_d = min(distances_to_neighbors.keys())
-        candidates = distances_to_neighbors[min_d]
-
-        # Sort those 1 step away positions by reading order (x then y coords), and choose the
-        # first as the step we're going to take this turn.
-        candidates.sort(key=lambda c: c[0])
-        candidates.sort(key=lambda c: c[1])
-        nx, ny = candidates[0]
-
-        # Move this unit to that position.
-        self.x = nx
-        self.y = ny
-
-    def perform_turn(self, units, cavern):
-        """Executes one turn for this unit."""
-
-        # Dead people can't do anything.
-        if not self.alive:
-            return
+        if not self.units_remaining[unit.enemy_kind]:
+            return False
 
-        # If there aren't any targets within range right now, pick the best to walk towards
-        # and walk towards it.
-        if not self._get_targets_in_range(units):
-            self._pick_target_and_walk_towards(units, cavern)
+        # If there aren't any targets within range right now, take a step towards the nearest
+        # position that's in range of a target.
+        if not self._adjacent_enemies(unit):
+            step = self._choose_step(unit)
+            if step is not None:
+                self.occupants[unit.position] = None
+                self.occupants[step] = unit
+                unit.position = step
 
-        # Find targets within range of attack now.
-        targets_in_range = self._get_targets_in_range(units)
+        # If there are targets in range now, attack the one with the least HP, choosing the
+        # first in reading order if there's a tie.
+        targets = self._adjacent_enemies(unit)
+        if targets:
+            self._attack(unit, min(targets, key=lambda target: target.hp))
 
-        # If none, our turn is done because we've already walked.
-        if not targets_in_range:
-            return
+        return True
 
-        # Otherwise choose a target and attack.
-        chosen_target = self._choose_target_by_min_hp(targets_in_range)
-        self._attack_target(chosen_target)
+    def fight(self):
+        """Runs the battle until one side has no units left. Returns the outcome of the battle,
+        which is the number of full rounds completed multiplied by the total HP remaining."""
 
+        for full_rounds in int_stream():
+            self.units = [unit for unit in self.units if unit.alive]
+            self.units.sort(key=lambda unit: unit.position)
 
-def _parse_units(grid, elf_power=3):
-    """Parse unit information out of the problem input."""
+            for unit in self.units:
+                # Units killed earlier in this round don't get a turn.
+                if not unit.alive:
+                    continue
 
-    curr_unit_id = 0
-    units = list()
+                if not self._take_turn(unit):
+                    return full_rounds * sum(u.hp for u in self.units if u.alive)
 
-    for y, row in enumerate(grid):
-        for x, cell in enumerate(row):
-            if cell not in "EG":
-                continue
 
-            if cell == "E":
-                unittype = "e"
-                unit_id = f"E-{curr_unit_id}"
-                power = elf_power
-            else:
-                unittype = "g"
-                unit_id = f"G-{curr_unit_id}"
-                power = 3
-
-            curr_unit_id += 1
+def _parse_cavern(grid):
+    """Parse a map of the cavern walls and open space, and the units in it, from the problem
+    input."""
 
-            units.append(
-                Unit(
-                    id=unit_id,
-                    unittype=unittype,
-                    x=x,
-                    y=y,
-                    hp=200,
-                    alive=True,
-                    power=power,
-                )
-            )
+    width = len(grid[0])
+    cells = "".join(grid)
 
-    return units
+    # The cavern is surrounded by walls, so stepping to a neighbor never wraps around an edge.
+    # These offsets are to the up, left, right, and down neighbors, which is reading order.
+    offsets = (-width, -1, 1, width)
 
+    open_neighbors = tuple(
+        ()
+        if cell == WALL
+        else tuple(position + offset for offset in offsets if cells[position + offset] != WALL)
+        for position, cell in enumerate(cells)
+    )
 
-def _parse_cavern(grid):
-    """Parse a map of the cavern walls and open space from the problem input."""
+    unit_starts = tuple(
+        (cell, position) for position, cell in enumerate(cells) if cell in (ELF, GOBLIN)
+    )
 
-    cavern = defaultdict(lambda: WALL)
+    return Cavern(open_neighbors=open_neighbors, unit_starts=unit_starts)
 
-    for y, row in enumerate(grid):
-        for x, cell in enumerate(row):
 
-            # Positions occupied by a unit we're going to call "air" for the purpose of this
-            # dict, because we CAN go there if we determine it's not already occupied by a unit.
-            # That'll be a problem for elsewhere in the solution.
-            cavern[(x, y)] = WALL if cell == WALL else AIR
+def _outcome_without_elf_deaths(cavern, elf_power):
+    """Returns the outcome of the battle with the given elf attack power, or None if any elf
+    dies during it."""
 
-    return cavern
+    try:
+        return Battle(cavern, elf_power, elves_must_survive=True).fight()
+    except ElfDied:
+        return None
 
 
 @aoc_output_formatter(YEAR, DAY, 1, PART_ONE_DESCRIPTION, assert_answer=PART_ONE_ANSWER)
 def part_one(populated_cavern):
     cavern = _parse_cavern(populated_cavern)
-    units = _parse_units(populated_cavern)
-
-    for round in int_stream():
-
-        try:
-            units.sort(key=lambda u: u.x)
-            units.sort(key=lambda u: u.y)
-
-            for unit in units:
-                unit.perform_turn(units, cavern)
-
-        except CombatEnded:
-            remaining = [u.hp for u in units if u.alive]
-            return sum(remaining) * round
+    return Battle(cavern, elf_power=GOBLIN_POWER).fight()
 
 
 @aoc_output_formatter(YEAR, DAY, 2, PART_TWO_DESCRIPTION, assert_answer=PART_TWO_ANSWER)
 def part_two(populated_cavern):
+    cavern = _parse_cavern(populated_cavern)
 
-    global raise_elf_died
-    raise_elf_died = True
-
-    elf_power = 5
-    counting_up = True
-
-    last_successful_outcome = None
-
-    while True:
-        cavern = _parse_cavern(populated_cavern)
-        units = _parse_units(populated_cavern, elf_power=elf_power)
-
-        for round in int_stream():
-
-            try:
-                units.sort(key=lambda u: u.x)
-                units.sort(key=lambda u: u.y)
-
-                for unit in units:
-                    unit.perform_turn(units, cavern)
-
-            except CombatEnded:
-                remaining = [u.hp for u in units if u.alive]
-
-                last_successful_outcome = sum(remaining) * round
-                counting_up = False
-                elf_power -= 1
-                break
-
-            except ElfDied:
-                if counting_up:
-                    elf_power += 5
-                    break
-                else:
-                    return last_successful_outcome
+    # Binary search for the least elf power where they all survive. This relies on assuming
+    # that if the elves all survive with some power, they'd also survive with any more. That
+    # isn't guaranteed, since killing a goblin sooner changes who targets whom and how units
+    # move for the rest of the battle, but it holds in practice. The power the search settles
+    # on is always one the elves were actually seen to survive with.
+    low, high = GOBLIN_POWER + 1, MAX_ELF_POWER
+    outcomes = dict()
+
+    while low < high:
+        elf_power = (low + high) // 2
+        outcome = _outcome_without_elf_deaths(cavern, elf_power)
+
+        if outcome is None:
+            low = elf_power + 1
+        else:
+            outcomes[elf_power] = outcome
+            high = elf_power
+
+    if low not in outcomes:
+        outcomes[low] = _outcome_without_elf_deaths(cavern, low)
+    if outcomes[low] is None:
+        raise ValueError(f"Some elf dies even with {MAX_ELF_POWER} attack power")
+
+    return outcomes[low]
 
 
 # ----------------------------------------------------------------------------------------------
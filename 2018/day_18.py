@@ -1,7 +1,8 @@
+import numpy as np
+
+from util.automaton import Automaton, grid_from_rows
 from util.decorators import aoc_output_formatter
-from util.input import get_input_grid_map
-from util.iter import int_stream
-from util.structures import get_neighbors_of_dict_based
+from util.input import get_input
 
 DAY = 18
 YEAR = 2018
@@ -12,107 +13,82 @@ PART_ONE_ANSWER = 360720
 PART_TWO_DESCRIPTION = "Lumber collection resource value after 1 billion minutes"
 PART_TWO_ANSWER = 197276
 
-TREES = "|"
-GROUND = "."
-LUMBERYARD = "#"
+GROUND = 0
+TREES = 1
+LUMBERYARD = 2
+
+# The characters for each kind of acre, in the order of the states above
+ACRE_STATES = ".|#"
 
 
-def _evolve_lumber_collection_map(lumber_collection_map):
+def _evolve_lumber_collection_map(
+    lumber_collection_map: np.ndarray,
+    counts: dict[int, np.ndarray],
+) -> np.ndarray:
     """The lumber collection area evolves over time, like a cellular automata. Evolve the map
     1 unit of time forward following the rules, and return the new state of map."""
 
-    new_lumber_collection_map = dict()
-    for coord, item in lumber_collection_map.items():
-        x, y = coord
-        neighbors = list(get_neighbors_of_dict_based(x, y, lumber_collection_map))
-        num_adj_trees = len([n for n in neighbors if n == TREES])
-        num_adj_lumber = len([n for n in neighbors if n == LUMBERYARD])
-
-        # An open acre will become filled with trees if three or more adjacent acres contained
-        # trees. Otherwise, nothing happens.
-        if item == GROUND:
-            new_lumber_collection_map[(x, y)] = GROUND
-            if num_adj_trees >= 3:
-                new_lumber_collection_map[(x, y)] = TREES
-
-        # An acre filled with trees will become a lumberyard if three or more adjacent acre
-        # were lumberyards. Otherwise, nothing happens.
-        elif item == TREES:
-            new_lumber_collection_map[(x, y)] = TREES
-            if num_adj_lumber >= 3:
-                new_lumber_collection_map[(x, y)] = LUMBERYARD
-
-        # An acre containing a lumberyard will remain a lumberyard if it was adjacent to at
-        # least one other lumberyard and at least one acre containing trees. Otherwise, it
-        # becomes open.
-        else:
-            new_lumber_collection_map[(x, y)] = GROUND
-            if num_adj_lumber >= 1 and num_adj_trees >= 1:
-                new_lumber_collection_map[(x, y)] = LUMBERYARD
+    num_adj_trees = counts[TREES]
+    num_adj_lumber = counts[LUMBERYARD]
+    new_lumber_collection_map = lumber_collection_map.copy()
+
+    # An open acre will become filled with trees if three or more adjacent acres contained
+    # trees. Otherwise, nothing happens.
+    is_ground = lumber_collection_map == GROUND
+    new_lumber_collection_map[is_ground & (num_adj_trees >= 3)] = TREES
+
+    # An acre filled with trees will become a lumberyard if three or more adjacent acre
+    # were lumberyards. Otherwise, nothing happens.
+    is_trees = lumber_collection_map == TREES
+    new_lumber_collection_map[is_trees & (num_adj_lumber >= 3)] = LUMBERYARD
+
+    # An acre containing a lumberyard will remain a lumberyard if it was adjacent to at
+    # least one other lumberyard and at least one acre containing trees. Otherwise, it
+    # becomes open.
+    is_lumberyard = lumber_collection_map == LUMBERYARD
+    stays_lumberyard = (num_adj_lumber >= 1) & (num_adj_trees >= 1)
+    new_lumber_collection_map[is_lumberyard & ~stays_lumberyard] = GROUND
 
     return new_lumber_collection_map
 
 
-def _get_static_repr(lumber_collection_map):
-    """Return a single-line representation of the map, suitable for using as the key in a
-    dictionary because it's hashable."""
+def _build_lumber_collection(rows) -> Automaton:
+    """Returns an automaton which evolves the lumber collection area described by the rows."""
 
-    line = []
-    for y in range(0, 50):
-        for x in range(0, 50):
-            line.append(lumber_collection_map[(x, y)])
-    return "".join(line)
+    return Automaton(
+        grid_from_rows(rows, ACRE_STATES),
+        _evolve_lumber_collection_map,
+        counted_states=[TREES, LUMBERYARD],
+    )
 
 
-def _get_resource_value(lumber_collection_map):
-    num_trees = sum(1 for item in lumber_collection_map.values() if item == TREES)
-    num_lumber = sum(1 for item in lumber_collection_map.values() if item == LUMBERYARD)
-    return num_trees * num_lumber
+def _get_resource_value(lumber_collection: Automaton) -> int:
+    return lumber_collection.count(TREES) * lumber_collection.count(LUMBERYARD)
 
 
 @aoc_output_formatter(YEAR, DAY, 1, PART_ONE_DESCRIPTION, assert_answer=PART_ONE_ANSWER)
-def part_one(lumber_collection_map):
-    for _ in range(10):
-        lumber_collection_map = _evolve_lumber_collection_map(lumber_collection_map)
+def part_one(rows):
+    lumber_collection = _build_lumber_collection(rows)
+    lumber_collection.run(10)
 
-    return _get_resource_value(lumber_collection_map)
+    return _get_resource_value(lumber_collection)
 
 
 @aoc_output_formatter(YEAR, DAY, 2, PART_TWO_DESCRIPTION, assert_answer=PART_TWO_ANSWER)
-def part_two(lumber_collection_map):
-    last_iteration = -1
-    key_to_first_iteration = dict()
-
-    # Iterate the lumber collection map until we see a state we've already seen before,
-    # indicating we've entered a repeating cycle.
-    for i in int_stream(start=1):
-        lumber_collection_map = _evolve_lumber_collection_map(lumber_collection_map)
-        key = _get_static_repr(lumber_collection_map)
-        if key not in key_to_first_iteration.keys():
-            key_to_first_iteration[key] = i
-            continue
-
-        # Once we've found the cycle, find out how long it is and advance the timestep as close
-        # to 1 billion seconds as we can and then break out of this loop.
-        cycle_size = i - key_to_first_iteration[key]
-        while (i + cycle_size) < 1_000_000_000:
-            i += cycle_size
-        last_iteration = i
-        break
-
-    # Start at the next timestep after the the last one we visited, and continue evolving
-    # the lumber collection area to 1 billion seconds.
-    for _ in int_stream(start=last_iteration + 1, end=1_000_000_000):
-        lumber_collection_map = _evolve_lumber_collection_map(lumber_collection_map)
-
-    return _get_resource_value(lumber_collection_map)
+def part_two(rows):
+    # The lumber collection area eventually enters a repeating cycle, which the automaton skips
+    # over as soon as it finds it.
+    lumber_collection = _build_lumber_collection(rows)
+    lumber_collection.advance_to(1_000_000_000)
+
+    return _get_resource_value(lumber_collection)
 
 
 # ----------------------------------------------------------------------------------------------
 
 
 def run(input_file):
-    lumber_collection_map = get_input_grid_map(input_file)
+    rows = get_input(input_file)
 
-    part_one(lumber_collection_map)
-    part_two(lumber_collection_map)
+    part_one(rows)
+    part_two(rows)
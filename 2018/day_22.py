@@ -1,10 +1,10 @@
 from enum import Enum, auto
 from functools import lru_cache
-from heapq import heappop, heappush, heapify
 
 from util.decorators import aoc_output_formatter
 from util.input import get_input
 from util.iter import nested_iterable, triple_iterable
+from util.search import dijkstra
 
 
 DAY = 22
@@ -149,24 +149,17 @@ def part_two(depth, target_coord):
                 cell_edge_weights[(x, y, z)].add(((nx, ny, nz), 1))
                 continue
 
-    visited = set()
-    queue = [(0, (0, 0, 0))]
-
+    # Start at the mouth of the cave holding the torch, and find the shortest path to the
+    # target also holding the torch.
     tx, ty = target_coord
     tz = Tool.TORCH.value
 
-    while queue:
-        minutes_so_far, coord = heappop(queue)
-        visited.add(coord)
-
-        queue = [t for t in queue if t[1] not in visited]
-        heapify(queue)
-
-        for neighbor, min_to_neighbor in cell_edge_weights[coord]:
-            if neighbor == (tx, ty, tz):
-                return minutes_so_far + min_to_neighbor
-            if neighbor not in visited:
-                heappush(queue, (minutes_so_far + min_to_neighbor, neighbor))
+    result = dijkstra(
+        [(0, 0, Tool.TORCH.value)],
+        lambda coord: cell_edge_weights[coord],
+        is_target=lambda coord: coord == (tx, ty, tz),
+    )
+    return result.target_distance
 
 
 # ----------------------------------------------------------------------------------------------
@@ -4,7 +4,7 @@ from typing import Literal
 from util.decorators import aoc_output_formatter
 from util.input import get_input
 
-from .intcode import InputNotAvailableException, IntcodeComputer
+from .intcode import FastIntcodeComputer, InputNotAvailableException
 
 DAY = 11
 YEAR = 2019
@@ -52,7 +52,7 @@ def _paint_hull(hull_colors: dict[Coord, Color], program: list[int]) -> set[Coor
     coords_painted: set[Coord] = set()
 
     complete = False
-    computer = IntcodeComputer()
+    computer = FastIntcodeComputer()
 
     while not complete:
         try:
@@ -5,7 +5,7 @@ from time import sleep
 from util.decorators import aoc_output_formatter
 from util.input import get_input
 
-from .intcode import InputNotAvailableException, IntcodeComputer
+from .intcode import FastIntcodeComputer, InputNotAvailableException
 
 DAY = 13
 YEAR = 2019
@@ -30,7 +30,7 @@ def _run(
     program: list[int],
     program_input: Generator[int] | None = None,
 ) -> Generator[list[int]]:
-    computer = IntcodeComputer()
+    computer = FastIntcodeComputer()
     while True:
         try:
             computer.execute(
@@ -1,13 +1,15 @@
 import curses
-import msvcrt
 import sys
+from collections import deque
 from collections.abc import Generator
+from contextlib import suppress
 
 from util.decorators import aoc_output_formatter
+from util.grid import DictGrid
 from util.input import get_input
 from util.structures import get_neighbors_of_dict_based
 
-from .intcode import InputNotAvailableException, IntcodeComputer
+from .intcode import FastIntcodeComputer, InputNotAvailableException, IntcodeSnapshot
 
 DAY = 15
 YEAR = 2019
@@ -27,12 +29,24 @@ OPEN = "░"
 OXYGEN = "X"
 START = "S"
 
+# Movement commands understood by the droid, and the offset each one moves it by
+MOVES: dict[int, Coord] = {
+    1: (0, -1),  # north
+    2: (0, 1),  # south
+    3: (-1, 0),  # west
+    4: (1, 0),  # east
+}
+
+STATUS_WALL = 0
+STATUS_MOVED = 1
+STATUS_OXYGEN = 2
+
 
 def _run(
     program: list[int],
     program_input: Generator[int] | None = None,
 ) -> Generator[list[int]]:
-    computer = IntcodeComputer()
+    computer = FastIntcodeComputer()
     while True:
         try:
             computer.execute(
@@ -55,6 +69,8 @@ def arrow_keys(direction_buffer: list[int]) -> Generator[int]:
 
     And also puts the most recent direction into the buffer.
     """
+    import msvcrt
+
     mapping = {
         b"H": 2,  # up
         b"P": 1,  # down
@@ -96,13 +112,56 @@ def _render(stdscr: curses.window, screen: dict[Coord, str]) -> None:
     stdscr.refresh()
 
 
-@aoc_output_formatter(YEAR, DAY, 1, PART_ONE_DESCRIPTION, assert_answer=PART_ONE_ANSWER)  # noqa: RET503
-def part_one(raw_input: list[str], *, render: bool = True) -> int | str | None:
-    # I manually explored the maze by piping keyboard input into the Intcode
-    # program, gradually exploring and uncovering the full maze and finding
-    # the oxygen system. Then I manually counted and found the shortest path
-    # from the start to the oxygen system.
-    return 254
+def _find_oxygen_system(program: list[int]) -> int:
+    """Returns the fewest steps the droid needs to reach the oxygen system.
+
+    Breadth-first search outward from the start, where each position in the queue carries a
+    snapshot of the droid's computer as it was upon reaching that position. Trying a move from
+    a position restores that snapshot into the droid's computer and sends it a single command,
+    rather than replaying the whole path from the start. The same computer is reused for every
+    move, so each restore only copies back the pages of memory which differ.
+    """
+    computer = FastIntcodeComputer()
+    with suppress(InputNotAvailableException):
+        computer.execute(program)
+
+    queue: deque[tuple[Coord, int, IntcodeSnapshot]] = deque([((0, 0), 0, computer.snapshot())])
+    seen: set[Coord] = {(0, 0)}
+
+    droid = FastIntcodeComputer()
+    while queue:
+        (x, y), steps, snapshot = queue.popleft()
+
+        for command, (dx, dy) in MOVES.items():
+            neighbor = (x + dx, y + dy)
+            if neighbor in seen:
+                continue
+            seen.add(neighbor)
+
+            droid.restore(snapshot)
+            with suppress(InputNotAvailableException):
+                droid.execute(program, program_input=[command])
+
+            status = droid.get_output()
+            if status == STATUS_OXYGEN:
+                return steps + 1
+            if status == STATUS_MOVED:
+                queue.append((neighbor, steps + 1, droid.snapshot()))
+
+    raise ValueError("The droid can't reach an oxygen system")
+
+
+@aoc_output_formatter(YEAR, DAY, 1, PART_ONE_DESCRIPTION, assert_answer=PART_ONE_ANSWER)
+def part_one(raw_input: list[str]) -> int | str | None:
+    program = [int(x) for x in raw_input[0].split(",")]
+    return _find_oxygen_system(program)
+
+
+def _explore_manually(raw_input: list[str], *, render: bool = True) -> None:
+    # I originally explored the maze manually by piping keyboard input into the
+    # Intcode program, gradually exploring and uncovering the full maze and finding
+    # the oxygen system. Then I manually counted and found the shortest path from
+    # the start to the oxygen system.
 
     # Set up a curses window in case we want to render the game.
     stdscr = None
@@ -196,7 +255,7 @@ def part_two(raw_input: list[str]) -> int | str | None:
     SPACE = " "
 
     start: Coord | None = None
-    maze: dict[Coord, str] = {}
+    maze: DictGrid = DictGrid()
 
     for y, line in enumerate(raw_input):
         for x, char in enumerate(line):
@@ -242,5 +301,5 @@ def part_two(raw_input: list[str]) -> int | str | None:
 
 
 def run(input_file: str) -> None:
-    part_one(get_input(input_file), render=True)
+    part_one(get_input(input_file))
     part_two(get_input(input_file.replace("day15", "day15_map")))
@@ -3,7 +3,7 @@ from collections.abc import Generator
 from util.decorators import aoc_output_formatter
 from util.input import get_input
 
-from .intcode import InputNotAvailableException, IntcodeComputer
+from .intcode import FastIntcodeComputer, InputNotAvailableException
 
 DAY = 17
 YEAR = 2019
@@ -21,7 +21,7 @@ SCAFFOLD = "#"
 
 
 def _run(program: list[int], prog_input: Generator[int] | None = None) -> Generator[list[int]]:
-    computer = IntcodeComputer()
+    computer = FastIntcodeComputer()
     while True:
         try:
             computer.execute(
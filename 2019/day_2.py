@@ -2,7 +2,7 @@ from util.decorators import aoc_output_formatter
 from util.input import get_tokenized_input
 from util.iter import nested_iterable
 
-from .intcode import IntcodeComputer
+from .intcode import FastIntcodeComputer
 
 DAY = 2
 YEAR = 2019
@@ -21,7 +21,7 @@ def part_one(program):
     program[1] = 12
     program[2] = 2
 
-    computer = IntcodeComputer()
+    computer = FastIntcodeComputer()
     computer.execute(program)
 
     return computer.program[0]
@@ -39,7 +39,7 @@ def part_two(original_program):
         program[1] = noun
         program[2] = verb
 
-        computer = IntcodeComputer()
+        computer = FastIntcodeComputer()
         computer.execute(program)
 
         if computer.program[0] == 19690720:
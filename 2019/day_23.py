@@ -1,24 +1,88 @@
+import asyncio
+
 from util.decorators import aoc_output_formatter
 from util.input import get_input
 
+from .intcode import FastIntcodeComputer
+from .intcode.network import IntcodeNetwork
+
 DAY = 23
 YEAR = 2019
 
-PART_ONE_DESCRIPTION = ""
+PART_ONE_DESCRIPTION = "Y value of the first packet sent to address 255"
 PART_ONE_ANSWER = None
 
-PART_TWO_DESCRIPTION = ""
+PART_TWO_DESCRIPTION = "first Y value delivered by the NAT twice in a row"
 PART_TWO_ANSWER = None
 
 
+NUM_COMPUTERS = 50
+NAT_ADDRESS = 255
+
+# Input read by a computer when no packets are waiting for it
+NO_PACKET = -1
+
+
+def _build_network(program: list[int], *, use_nat: bool) -> IntcodeNetwork:
+    """Builds the network of computers, each of which is first told its own address.
+
+    Without the NAT, the network stops with the Y value of the first packet sent to address
+    255. With the NAT, it holds onto the last packet sent to address 255 and delivers it to
+    address 0 whenever the network goes idle, and the network stops with the first Y value it
+    delivers twice in a row.
+    """
+    nat_packet: tuple[int, int] | None = None
+    last_delivered_y: int | None = None
+
+    def route(network: IntcodeNetwork, _address: int, computer: FastIntcodeComputer) -> None:
+        nonlocal nat_packet
+
+        # Packets are 3 values: destination address, X, Y
+        while len(computer.output_buffer) >= 3:
+            destination, x, y = (computer.get_output() for _ in range(3))
+            if destination != NAT_ADDRESS:
+                network.send(destination, x, y)
+            elif use_nat:
+                nat_packet = (x, y)
+            else:
+                network.stop(y)
+
+    def wake_network(network: IntcodeNetwork) -> None:
+        nonlocal last_delivered_y
+
+        if nat_packet is None:
+            return
+
+        x, y = nat_packet
+        if y == last_delivered_y:
+            network.stop(y)
+
+        last_delivered_y = y
+        network.send(0, x, y)
+
+    network = IntcodeNetwork(
+        program,
+        range(NUM_COMPUTERS),
+        route,
+        idle_input=NO_PACKET,
+        on_idle=wake_network if use_nat else None,
+    )
+    for address in range(NUM_COMPUTERS):
+        network.send(address, address)
+
+    return network
+
+
 @aoc_output_formatter(YEAR, DAY, 1, PART_ONE_DESCRIPTION, assert_answer=PART_ONE_ANSWER)
 def part_one(raw_input: list[str]) -> int | str | None:
-    pass
+    program = [int(x) for x in raw_input[0].split(",")]
+    return asyncio.run(_build_network(program, use_nat=False).run())
 
 
 @aoc_output_formatter(YEAR, DAY, 2, PART_TWO_DESCRIPTION, assert_answer=PART_TWO_ANSWER)
 def part_two(raw_input: list[str]) -> int | str | None:
-    pass
+    program = [int(x) for x in raw_input[0].split(",")]
+    return asyncio.run(_build_network(program, use_nat=True).run())
 
 
 def run(input_file: str) -> None:
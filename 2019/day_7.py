@@ -1,9 +1,11 @@
+import asyncio
 from itertools import permutations
 
 from util.decorators import aoc_output_formatter
 from util.input import get_tokenized_input
 
-from .intcode import InputNotAvailableException, IntcodeComputer
+from .intcode import FastIntcodeComputer
+from .intcode.network import IntcodeNetwork
 
 DAY = 7
 YEAR = 2019
@@ -27,7 +29,7 @@ def part_one(input_program):
         for n in range(5):
             inputs = [phase_sequence[n], signal]
 
-            computer = IntcodeComputer()
+            computer = FastIntcodeComputer()
             computer.execute(copy(input_program), program_input=inputs)
 
             signal = computer.get_output()
@@ -37,35 +39,40 @@ def part_one(input_program):
     return max_output_signal
 
 
-@aoc_output_formatter(YEAR, DAY, 2, PART_TWO_DESCRIPTION, assert_answer=PART_TWO_ANSWER)
-def part_two(input_program):
-    max_output_signal = 0
+async def _run_feedback_loop(program, phase_sequence):
+    """Returns the final signal sent to the thrusters by a feedback loop of amplifiers, each
+    running as a computer in a network and sending its output to the next amplifier.
+    """
+    num_amps = len(phase_sequence)
+    last_amp = num_amps - 1
 
-    for phase_sequence in permutations([9, 8, 7, 6, 5]):
-        signal = 0
-        amps = [IntcodeComputer() for _ in range(5)]
-
-        complete = False
-        while not complete:
-            for n in range(5):
-                computer = amps[n]
-                try:
-                    if computer.state == IntcodeComputer.STATE_WAITING:
-                        inputs = [signal]
-                    else:
-                        inputs = [phase_sequence[n], signal]
-                    computer.execute(copy(input_program), program_input=inputs)
-                except InputNotAvailableException:
-                    signal = computer.get_output()
-                    continue
-                else:
-                    signal = computer.get_output()
-                    if n == 4:
-                        complete = True
+    def route(network, address, computer):
+        for signal in computer.get_all_output():
+            network.send((address + 1) % num_amps, signal)
+            if address == last_amp:
+                network.set_result(signal)
 
-        max_output_signal = max(max_output_signal, signal)
+    network = IntcodeNetwork(program, range(num_amps), route)
+    for address, phase in enumerate(phase_sequence):
+        network.send(address, phase)
+    network.send(0, 0)
 
-    return max_output_signal
+    return await network.run()
+
+
+async def _find_max_feedback_signal(program):
+    """Returns the max thruster signal across every phase sequence, with every sequence's
+    feedback loop running concurrently.
+    """
+    signals = await asyncio.gather(
+        *(_run_feedback_loop(program, phases) for phases in permutations([9, 8, 7, 6, 5])),
+    )
+    return max(signals)
+
+
+@aoc_output_formatter(YEAR, DAY, 2, PART_TWO_DESCRIPTION, assert_answer=PART_TWO_ANSWER)
+def part_two(input_program):
+    return asyncio.run(_find_max_feedback_signal(input_program))
 
 
 # ----------------------------------------------------------------------------------------------
@@ -1,7 +1,7 @@
 from util.decorators import aoc_output_formatter
 from util.input import get_tokenized_input
 
-from .intcode import IntcodeComputer
+from .intcode import FastIntcodeComputer
 
 DAY = 9
 YEAR = 2019
@@ -15,7 +15,7 @@ PART_TWO_ANSWER = 35106
 
 @aoc_output_formatter(YEAR, DAY, 1, PART_ONE_DESCRIPTION, assert_answer=PART_ONE_ANSWER)
 def part_one(program):
-    computer = IntcodeComputer()
+    computer = FastIntcodeComputer()
     computer.execute(program, program_input=[1])
 
     assert computer.has_output()
@@ -24,7 +24,7 @@ def part_one(program):
 
 @aoc_output_formatter(YEAR, DAY, 2, PART_TWO_DESCRIPTION, assert_answer=PART_TWO_ANSWER)
 def part_two(program):
-    computer = IntcodeComputer()
+    computer = FastIntcodeComputer()
     computer.execute(program, program_input=[2])
 
     assert computer.has_output()
@@ -0,0 +1,225 @@
+"""Benchmarks the 2019 day 15 oxygen system search, built on FastIntcodeComputer snapshots,
+against the ways a search had to branch a computer before snapshots existed.
+
+There's no puzzle input in the tree, so the droid is a generated Intcode program which walks a
+random maze, reporting the same statuses the real repair droid does.
+
+    python -m 2019.intcode.benchmark [maze_size ...]
+"""
+
+import random
+import sys
+from collections import deque
+from contextlib import suppress
+from copy import deepcopy
+from time import perf_counter
+
+from ..day_15 import MOVES, STATUS_MOVED, STATUS_OXYGEN, _find_oxygen_system
+from . import FastIntcodeComputer, InputNotAvailableException, IntcodeComputer
+
+Coord = tuple[int, int]
+
+DEFAULT_MAZE_SIZES = (41, 81)
+
+# Variables of the droid program, stored in memory right after its code
+DROID_VARIABLES = ("X", "Y", "NX", "NY", "D", "T", "ADDR", "NADDR", "CELL")
+
+# The droid program, as instructions whose parameters are either literal ints, the names of
+# variables, "GRID" for the address of the maze, or "@LOOP" for the address of the loop start.
+# Each time around the loop it reads a movement command, looks up the cell in that direction,
+# outputs that cell's value as its status, and moves there unless it's a wall.
+DROID_INSTRUCTIONS = (
+    (3, "D"),  # D = input
+    (1001, "X", 0, "NX"),  # NX = X
+    (1001, "Y", 0, "NY"),  # NY = Y
+    (1008, "D", 1, "T"),  # NY -= (D == 1)
+    (1002, "T", -1, "T"),
+    (1, "NY", "T", "NY"),
+    (1008, "D", 2, "T"),  # NY += (D == 2)
+    (1, "NY", "T", "NY"),
+    (1008, "D", 3, "T"),  # NX -= (D == 3)
+    (1002, "T", -1, "T"),
+    (1, "NX", "T", "NX"),
+    (1008, "D", 4, "T"),  # NX += (D == 4)
+    (1, "NX", "T", "NX"),
+    (1002, "NY", "WIDTH", "ADDR"),  # ADDR = GRID + NY * WIDTH + NX
+    (1, "ADDR", "NX", "ADDR"),
+    (1001, "ADDR", "GRID", "ADDR"),
+    (1002, "ADDR", -1, "NADDR"),
+    (9, "ADDR"),  # CELL = memory[ADDR], via the relative base
+    (1201, 0, 0, "CELL"),
+    (9, "NADDR"),
+    (4, "CELL"),  # output CELL
+    (1006, "CELL", "@LOOP"),  # if CELL == 0, it's a wall, so don't move
+    (1001, "NX", 0, "X"),  # X, Y = NX, NY
+    (1001, "NY", 0, "Y"),
+    (1105, 1, "@LOOP"),
+)
+
+
+def _generate_maze(size: int, seed: int) -> list[list[int]]:
+    """Returns a square maze of walls (0) and open cells (1) with odd side length `size`, carved
+    by a randomized depth-first search, with the oxygen system (2) in the bottom-right corner.
+    """
+    rng = random.Random(seed)
+    maze = [[0] * size for _ in range(size)]
+
+    maze[1][1] = 1
+    stack = [(1, 1)]
+    while stack:
+        x, y = stack[-1]
+        unvisited = [
+            (x + dx, y + dy)
+            for dx, dy in ((2, 0), (-2, 0), (0, 2), (0, -2))
+            if 0 < x + dx < size - 1 and 0 < y + dy < size - 1 and not maze[y + dy][x + dx]
+        ]
+        if not unvisited:
+            stack.pop()
+            continue
+
+        nx, ny = rng.choice(unvisited)
+        maze[(y + ny) // 2][(x + nx) // 2] = 1
+        maze[ny][nx] = 1
+        stack.append((nx, ny))
+
+    maze[size - 2][size - 2] = 2
+    return maze
+
+
+def _assemble_droid(maze: list[list[int]], start: Coord) -> list[int]:
+    """Returns an Intcode program for a droid which starts at the specified cell of the maze."""
+    code_size = sum(len(instruction) for instruction in DROID_INSTRUCTIONS)
+    variables = {name: code_size + i for i, name in enumerate(DROID_VARIABLES)}
+    constants = {
+        "GRID": code_size + len(DROID_VARIABLES),
+        "WIDTH": len(maze[0]),
+        "@LOOP": 0,
+    }
+
+    program = list()
+    for instruction in DROID_INSTRUCTIONS:
+        for param in instruction:
+            if isinstance(param, int):
+                program.append(param)
+            else:
+                program.append(variables.get(param, constants.get(param)))
+
+    initial_values = {"X": start[0], "Y": start[1]}
+    program.extend(initial_values.get(name, 0) for name in DROID_VARIABLES)
+    for row in maze:
+        program.extend(row)
+
+    return program
+
+
+def _shortest_path(maze: list[list[int]], start: Coord) -> int:
+    """Returns the fewest steps from the start to the oxygen system, found directly from the
+    maze, to check the searches against.
+    """
+    queue = deque([(start, 0)])
+    seen = {start}
+    while queue:
+        (x, y), steps = queue.popleft()
+        if maze[y][x] == STATUS_OXYGEN:
+            return steps
+
+        for dx, dy in MOVES.values():
+            neighbor = (x + dx, y + dy)
+            if neighbor not in seen and maze[neighbor[1]][neighbor[0]]:
+                seen.add(neighbor)
+                queue.append((neighbor, steps + 1))
+
+    raise ValueError("The maze has no oxygen system")
+
+
+def _search_by_replaying(program: list[int]) -> int:
+    """Searches for the oxygen system by running a fresh computer from the start of the program
+    for every move tried, replaying the whole path to the position being moved from.
+    """
+    queue: deque[tuple[Coord, list[int]]] = deque([((0, 0), list())])
+    seen = {(0, 0)}
+    while queue:
+        (x, y), path = queue.popleft()
+        for command, (dx, dy) in MOVES.items():
+            neighbor = (x + dx, y + dy)
+            if neighbor in seen:
+                continue
+            seen.add(neighbor)
+
+            droid = FastIntcodeComputer()
+            with suppress(InputNotAvailableException):
+                droid.execute(program, program_input=[*path, command])
+
+            status = droid.get_all_output()[-1]
+            if status == STATUS_OXYGEN:
+                return len(path) + 1
+            if status == STATUS_MOVED:
+                queue.append((neighbor, [*path, command]))
+
+    raise ValueError("The droid can't reach an oxygen system")
+
+
+def _search_by_deepcopy(program: list[int]) -> int:
+    """Searches for the oxygen system by deep-copying the original defaultdict-based
+    IntcodeComputer at the position being moved from, for every move tried.
+    """
+    computer = IntcodeComputer()
+    with suppress(InputNotAvailableException):
+        computer.execute(program)
+
+    queue: deque[tuple[Coord, int, IntcodeComputer]] = deque([((0, 0), 0, computer)])
+    seen = {(0, 0)}
+    while queue:
+        (x, y), steps, computer = queue.popleft()
+        for command, (dx, dy) in MOVES.items():
+            neighbor = (x + dx, y + dy)
+            if neighbor in seen:
+                continue
+            seen.add(neighbor)
+
+            droid = deepcopy(computer)
+            with suppress(InputNotAvailableException):
+                droid.execute(program, program_input=[command])
+
+            status = droid.get_output()
+            if status == STATUS_OXYGEN:
+                return steps + 1
+            if status == STATUS_MOVED:
+                queue.append((neighbor, steps + 1, droid))
+
+    raise ValueError("The droid can't reach an oxygen system")
+
+
+def benchmark(size: int, seed: int = 1) -> dict[str, float]:
+    """Returns the seconds each way of searching takes to find the oxygen system in a random
+    maze of the specified size, after checking that each one finds the right number of steps.
+    """
+    maze = _generate_maze(size, seed)
+    start = (size // 2 | 1, size // 2 | 1)
+    program = _assemble_droid(maze, start)
+    expected = _shortest_path(maze, start)
+
+    timings = dict()
+    for name, search in (
+        ("snapshot", _find_oxygen_system),
+        ("replay", _search_by_replaying),
+        ("deepcopy", _search_by_deepcopy),
+    ):
+        started = perf_counter()
+        steps = search(program)
+        timings[name] = perf_counter() - started
+
+        if steps != expected:
+            raise ValueError(f"{name} search took {steps} steps, expected {expected}")
+
+    return timings
+
+
+if __name__ == "__main__":
+    sizes = [int(size) for size in sys.argv[1:]] or DEFAULT_MAZE_SIZES
+    for size in sizes:
+        timings = benchmark(size)
+        results = ", ".join(
+            f"{name} {seconds * 1000:.0f} ms" for name, seconds in timings.items()
+        )
+        print(f"{size}x{size} maze: {results}")
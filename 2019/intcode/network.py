@@ -0,0 +1,202 @@
+"""Runs networks of cooperating Intcode computers, each one as its own asyncio task."""
+
+import asyncio
+from collections.abc import Callable, Iterable
+
+from . import FastIntcodeComputer, InputNotAvailableException
+
+
+class _StopNetwork(Exception):  # noqa: N818
+    """Raised inside a node's task to shut down the whole network."""
+
+
+class NetworkDeadlockError(Exception):
+    """Raised when every computer in a network which hasn't halted is waiting for input, and
+    none is on its way.
+    """
+
+
+class IntcodeNetwork:
+    """A network of FastIntcodeComputers all running the same program, which communicate by
+    sending values into each other's inboxes.
+
+    Each computer runs as its own coroutine. It executes until it halts or needs input that
+    isn't available, hands its computer to the `route` callback so its output can be sent
+    wherever it needs to go, and then either:
+
+    - waits for a value to arrive in its inbox, if `idle_input` is None. If every computer is
+      waiting like this (or has halted) and the inboxes of those waiting are all empty, nothing
+      can ever arrive, so `run` raises a NetworkDeadlockError.
+    - otherwise, if its inbox is empty, reads `idle_input` instead and yields to the other
+      computers. If every computer is idle like this and every inbox is empty, the network
+      is idle and `on_idle` is called.
+
+    Inboxes are asyncio queues, so sending and receiving values is O(1).
+    """
+
+    def __init__(
+        self,
+        program: list[int],
+        addresses: Iterable[int],
+        route: Callable[["IntcodeNetwork", int, FastIntcodeComputer], None],
+        *,
+        idle_input: int | None = None,
+        on_idle: Callable[["IntcodeNetwork"], None] | None = None,
+    ):
+        self.program = program
+        self.addresses = list(addresses)
+        self.route = route
+        self.idle_input = idle_input
+        self.on_idle = on_idle
+
+        self.inboxes: dict[int, asyncio.Queue[int]] = {
+            a: asyncio.Queue() for a in self.addresses
+        }
+        self.idle_addresses: set[int] = set()
+        self.waiting_addresses: set[int] = set()
+        self.halted_addresses: set[int] = set()
+        self.result = None
+        self._deadlocked = False
+
+    def send(self, address: int, *values: int) -> None:
+        """Sends values to the inbox of the computer at the specified address."""
+        inbox = self.inboxes[address]
+        for value in values:
+            inbox.put_nowait(value)
+
+    def set_result(self, result) -> None:
+        """Makes `run` return the provided result once the network finishes, unless it's set
+        again before then. The network keeps running.
+        """
+        self.result = result
+
+    def stop(self, result=None):
+        """Stops every computer in the network, and makes `run` return the provided result.
+        Only call this from within the `route` or `on_idle` callbacks. It doesn't return.
+        """
+        self.set_result(result)
+        raise _StopNetwork
+
+    async def run(self):
+        """Runs every computer in the network until they've all halted, or until the network is
+        stopped. Returns the result the network was stopped with, if any.
+        """
+        try:
+            async with asyncio.TaskGroup() as group:
+                for address in self.addresses:
+                    group.create_task(self._run_node(address))
+        except* _StopNetwork:
+            pass
+
+        if self._deadlocked:
+            raise NetworkDeadlockError(
+                f"Computers {sorted(self.waiting_addresses)} are waiting for input, but no "
+                f"computer is left to send any",
+            )
+
+        return self.result
+
+    def _is_idle(self) -> bool:
+        """Returns whether every computer is idle and there are no values waiting to be read."""
+        return len(self.idle_addresses) == len(self.addresses) and all(
+            inbox.empty() for inbox in self.inboxes.values()
+        )
+
+    def _check_for_deadlock(self) -> None:
+        """Stops the network as deadlocked if any computer is waiting for input, and every other
+        computer is either waiting too or has halted, with no values waiting to be read. Values
+        left in the inbox of a computer which has halted will never be read, so don't count.
+        """
+        if (
+            self.waiting_addresses
+            and len(self.waiting_addresses | self.halted_addresses) == len(self.addresses)
+            and all(
+                inbox.empty()
+                for address, inbox in self.inboxes.items()
+                if address not in self.halted_addresses
+            )
+        ):
+            self._deadlocked = True
+            raise _StopNetwork
+
+    async def _run_node(self, address: int) -> None:
+        """Runs the computer at the specified address until it halts."""
+        computer = FastIntcodeComputer()
+        inbox = self.inboxes[address]
+        program_input: list[int] = []
+
+        while True:
+            try:
+                computer.execute(self.program, program_input=program_input)
+            except InputNotAvailableException:
+                pass
+            else:
+                self.route(self, address, computer)
+                self.halted_addresses.add(address)
+                self._check_for_deadlock()
+                return
+
+            if computer.has_output():
+                self.idle_addresses.discard(address)
+            self.route(self, address, computer)
+
+            if inbox.empty() and self.idle_input is not None:
+                program_input = [self.idle_input]
+                self.idle_addresses.add(address)
+
+                if self.on_idle is not None and self._is_idle():
+                    self.on_idle(self)
+
+                # Nothing to do for now, give the other computers a chance to run
+                await asyncio.sleep(0)
+                continue
+
+            # Take everything that's arrived in the inbox in one go, once anything has
+            if inbox.empty():
+                self.waiting_addresses.add(address)
+                self._check_for_deadlock()
+            program_input = [await inbox.get()]
+            self.waiting_addresses.discard(address)
+            while not inbox.empty():
+                program_input.append(inbox.get_nowait())
+            self.idle_addresses.discard(address)
+
+
+# A program which outputs 0, then reads two values and halts
+_OUTPUT_THEN_READ_TWICE = [4, 50, 3, 100, 3, 101, 99]
+
+
+def _route_to_other_node(network: IntcodeNetwork, address: int, computer) -> None:
+    network.send(1 - address, *computer.get_all_output())
+
+
+def _check_deadlock_detection() -> None:
+    """Checks that deadlocks are detected, including once a computer has halted with values left
+    unread in its inbox, which can never be read and so mustn't keep the network waiting.
+    """
+    cases = (
+        ("nothing ever sent", ()),
+        ("values left in a halted computer's inbox", (5, 6)),
+    )
+    for description, initial_values in cases:
+        network = IntcodeNetwork(_OUTPUT_THEN_READ_TWICE, [0, 1], _route_to_other_node)
+        network.send(0, *initial_values)
+        try:
+            asyncio.run(asyncio.wait_for(network.run(), timeout=5))
+        except NetworkDeadlockError:
+            continue
+        except TimeoutError:
+            raise ValueError(f"Deadlock with {description} wasn't detected") from None
+        raise ValueError(f"Network with {description} finished without deadlocking")
+
+    # Each computer gets the two values it needs, so this network halts normally
+    network = IntcodeNetwork(_OUTPUT_THEN_READ_TWICE, [0, 1], _route_to_other_node)
+    network.send(0, 5)
+    network.send(1, 7)
+    asyncio.run(asyncio.wait_for(network.run(), timeout=5))
+
+
+if __name__ == "__main__":
+    # python -m 2019.intcode.network
+    _check_deadlock_detection()
+    print("Deadlock detection OK")
@@ -2,6 +2,7 @@ from string import ascii_lowercase
 
 from util.decorators import aoc_output_formatter
 from util.input import get_input_grid_map
+from util.search import bfs
 
 DAY = 12
 YEAR = 2022
@@ -24,11 +25,7 @@ def _neighbors(coord, grid, is_valid_neighbor):
 
     neighbors = list()
 
-    cx, cy = coord
-    for neighbor_coord in [(cx, cy + 1), (cx, cy - 1), (cx + 1, cy), (cx - 1, cy)]:
-        if neighbor_coord not in grid:
-            continue
-
+    for neighbor_coord in grid.neighbors(coord, include_diagonals=False):
         # If the candidate neighbor is within the allowed height range then add it to the list
         # of accessible neighbors.
         if is_valid_neighbor(coord, neighbor_coord):
@@ -54,29 +51,12 @@ def part_one(grid):
     is_valid_neighbor = lambda c, n: height_map[grid[n]] <= height_map[grid[c]] + 1
 
     # Basic breadth-first search until we reach the target position.
-    visited = set()
-
-    queue = list()
-    queue.append((start_coord, 0))
-
-    while queue:
-        current_coord, steps = queue.pop(0)
-        if current_coord == end_coord:
-            return steps
-
-        for neighbor in _neighbors(current_coord, grid, is_valid_neighbor):
-            if neighbor in visited:
-                continue
-            else:
-                # Add the neighbor we're about to enqueue to the visited set here, instead of
-                # above where we actually visit it, because it doesn't change the BFS
-                # functionality and it prevents us from having to do another "have we visisted
-                # this yet" check above.
-                #
-                # This is because we can enqueue the same neighbor coordinate multiple times
-                # before visiting it if there are multiple paths to reach it in short order.
-                visited.add(neighbor)
-                queue.append((neighbor, steps + 1))
+    result = bfs(
+        [start_coord],
+        lambda coord: _neighbors(coord, grid, is_valid_neighbor),
+        is_target=lambda coord: coord == end_coord,
+    )
+    return result.target_distance
 
 
 @aoc_output_formatter(YEAR, DAY, 2, PART_TWO_DESCRIPTION, assert_answer=PART_TWO_ANSWER)
@@ -92,30 +72,13 @@ def part_two(grid):
     # (basically just invert the conditions of the search above).
     is_valid_neighbor = lambda c, n: height_map[grid[n]] >= height_map[grid[c]] - 1
 
-    # Basic breadth-first search until we reach the target position.
-    visited = set()
-
-    queue = list()
-    queue.append((start_coord, 0))
-
-    while queue:
-        current_coord, steps = queue.pop(0)
-        if height_map[grid[current_coord]] == 0:
-            return steps
-
-        for neighbor in _neighbors(current_coord, grid, is_valid_neighbor):
-            if neighbor in visited:
-                continue
-            else:
-                # Add the neighbor we're about to enqueue to the visited set here, instead of
-                # above where we actually visit it, because it doesn't change the BFS
-                # functionality and it prevents us from having to do another "have we visisted
-                # this yet" check above.
-                #
-                # This is because we can enqueue the same neighbor coordinate multiple times
-                # before visiting it if there are multiple paths to reach it in short order.
-                visited.add(neighbor)
-                queue.append((neighbor, steps + 1))
+    # Basic breadth-first search until we reach any position at the lowest elevation.
+    result = bfs(
+        [start_coord],
+        lambda coord: _neighbors(coord, grid, is_valid_neighbor),
+        is_target=lambda coord: height_map[grid[coord]] == 0,
+    )
+    return result.target_distance
 
 
 # ----------------------------------------------------------------------------------------------
@@ -1,6 +1,7 @@
 from util.algs import manhattan_distance as distance
 from util.decorators import aoc_output_formatter
 from util.input import get_input
+from util.intervals import IntervalSet
 
 DAY = 15
 YEAR = 2022
@@ -66,6 +67,24 @@ def _is_beacon_impossible(target, beacon_free_zones, beacons):
     return False
 
 
+def _count_beacon_free_cells_in_row(row, beacon_free_zones, beacons):
+    """Returns the number of cells in the specified row where a beacon can't be, because they
+    are within a sensor's beacon-free zone and aren't a known beacon.
+
+    Each sensor's beacon-free zone crosses the row (if at all) in a single range of x values,
+    which is narrower the further the sensor is from the row, so the whole row can be counted
+    from those ranges without checking every cell."""
+
+    beacon_free_ranges = IntervalSet(
+        (sx - reach, sx + reach + 1)
+        for (sx, sy), free_distance in beacon_free_zones.items()
+        if (reach := free_distance - abs(sy - row)) >= 0
+    )
+    beacons_in_row = IntervalSet((bx, bx + 1) for bx, by in beacons if by == row)
+
+    return (beacon_free_ranges - beacons_in_row).size
+
+
 def _sensor_perimeter_coordinates(sensor, distance):
     """A generator which yields all coordinates along the "perimeter" of a boundary defined by
     a given central coordinate, and a Manhattan distance away from that coordinate."""
@@ -116,24 +135,10 @@ def _sensor_perimeter_coordinates(sensor, distance):
 @aoc_output_formatter(YEAR, DAY, 1, PART_ONE_DESCRIPTION, assert_answer=PART_ONE_ANSWER)
 def part_one(problem_input):
 
-    sensors, beacons, beacon_free_zones = _parse_sensor_info(problem_input)
-
-    # For all "beacon free zones" find the one with the largest size
-    dx = max(beacon_free_zones.values())
-
-    # Find the min and max x coordinates across all sensors, and extend that by the largest
-    # beacon free zone size found above. This should give us the maximum x coord window we need
-    # to check to be sure that no beacons reside in it.
-    min_x = min(s[0] for s in sensors) - dx
-    max_x = max(s[0] for s in sensors) + dx
+    _, beacons, beacon_free_zones = _parse_sensor_info(problem_input)
 
-    # For every possible x value in the row y=2000000, count how many cells in that row could
-    # not contain a beacon.
-    count = 0
-    for x in range(min_x, max_x):
-        if _is_beacon_impossible((x, 2000000), beacon_free_zones, beacons):
-            count += 1
-    return count
+    # Count how many cells in the row y=2000000 could not contain a beacon.
+    return _count_beacon_free_cells_in_row(2000000, beacon_free_zones, beacons)
 
 
 @aoc_output_formatter(YEAR, DAY, 2, PART_TWO_DESCRIPTION, assert_answer=PART_TWO_ANSWER)
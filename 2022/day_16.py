@@ -1,7 +1,5 @@
 from collections import defaultdict
-from copy import copy
-from itertools import combinations
-from typing import Any, List, Tuple
+from itertools import product
 
 from util.decorators import aoc_output_formatter
 from util.input import get_input
@@ -41,106 +39,115 @@ def _parse_valve_tunnel_map(raw_tunnel_info):
     return valves_to_visit, valve_flow_rate, valve_connections
 
 
-def _get_distance_between(a, b, connections):
-    """Performs a BFS between two nodes in the map and returns the distance between them."""
+def _get_all_distances(connections):
+    """Returns a map of the stepwise distance between every pair of valves, via Floyd-Warshall.
+    Every valve is reachable from every other, so there's a distance for every pair."""
 
-    visited = set()
-    queue: List[Tuple[Any, int]] = [(a, 0)]
+    valves = list(connections)
+    distances = {(a, b): 0 if a == b else float("inf") for a, b in product(valves, repeat=2)}
+    for a in valves:
+        for b in connections[a]:
+            distances[(a, b)] = 1
 
-    while queue:
-        curr, steps = queue.pop(0)
-        if curr == b:
-            return steps
+    for via, a, b in product(valves, repeat=3):
+        if distances[(a, via)] + distances[(via, b)] < distances[(a, b)]:
+            distances[(a, b)] = distances[(a, via)] + distances[(via, b)]
 
-        for neighbor in connections[curr]:
-            if neighbor in visited:
-                continue
-            visited.add(neighbor)
-            queue.append((neighbor, steps + 1))
-
-    raise ValueError(f"Couldn't find path between {a} and {b},")
+    return distances
 
 
 def _get_distance_map(connections, valves_to_visit, starting_valve):
     """Given a graph of valve connections, a starting valve, and a set of valves to be visited,
     returns a map of the stepwise distance between each pair of relevant valves."""
 
-    distance_map = dict()
+    all_distances = _get_all_distances(connections)
+    relevant_valves = valves_to_visit | {starting_valve}
 
-    relevant_valves = copy(valves_to_visit)
-    relevant_valves.add(starting_valve)
+    # It takes 1 minute to open the valve when you arrive, let's just account for that here
+    return {
+        (a, b): all_distances[(a, b)] + 1
+        for a, b in product(relevant_valves, repeat=2)
+        if a != b
+    }
 
-    for a, b in combinations(relevant_valves, 2):
 
-        # It takes 1 minute to open the valve when you arrive, let's just account for that here
-        distance = _get_distance_between(a, b, connections) + 1
-        distance_map[(a, b)] = distance
-        distance_map[(b, a)] = distance
+def _best_pressure_by_valve_set(start_valve, valves_to_visit, rates, distances, total_minutes):
+    """Returns a list holding, for each set of valves, the most pressure which can be released
+    by a single agent which opens exactly that set of valves (and no others) in the time given.
 
-    return distance_map
+    Sets of valves are bitmasks, where bit i is set if the ith valve to visit is opened. A set
+    which can't be opened in time has a best pressure of 0.
 
+    States of (current valve, valves opened) are explored in order of the minutes left when
+    they're reached, most first. Arriving at a state with less time and no more pressure than an
+    earlier arrival can't lead anywhere better, so each state is only explored again if it's
+    reached having released more pressure than every arrival with more time left."""
 
-def _score_path(path_info, rates):
-    """Give a path (a list of tuples of valve and minutes_remaining when it was visited),
-    and a map of valve flow rates, "score" the path by calculating total pressure released."""
+    valves = sorted(valves_to_visit)
+    start = len(valves)
 
-    return sum(rates[valve] * min_remaining for valve, min_remaining in path_info)
+    # Each state is encoded as a single int, `valves_opened * (num_valves + 1) + current_valve`,
+    # where the starting valve is numbered after all the valves to visit.
+    state_stride = len(valves) + 1
 
+    # For each valve by its number, a list of (bit, distance, flow rate, number) of each valve
+    # to visit from there.
+    moves = [
+        [(1 << i, distances[(a, b)], rates[b], i) for i, b in enumerate(valves) if a != b]
+        for a in valves + [start_valve]
+    ]
 
-def _possible_paths(
-    curr_valve,
-    valves_to_visit,
-    distances,
-    minutes_left,
-    valves_visited_with_min_left,
-):
-    """Given a starting valve, time remaining, and valves remaining to visit, returns all
-    possible paths between these valves with the remaining time."""
+    best_by_valve_set = [0] * (1 << len(valves))
+    best_explored = dict()
 
-    # Base case, no remaining valves to visit.
-    if not valves_to_visit:
-        return [valves_visited_with_min_left]
+    # The best pressure released on arrival at each state, by the minutes left on arrival.
+    arrivals = [dict() for _ in range(total_minutes + 1)]
+    arrivals[total_minutes][start] = 0
 
-    # Base case, no time remaining.
-    if minutes_left <= 0:
-        return [valves_visited_with_min_left]
+    for minutes_left in range(total_minutes, 0, -1):
+        for state, pressure in arrivals[minutes_left].items():
+            if best_explored.get(state, -1) >= pressure:
+                continue
+            best_explored[state] = pressure
 
-    # Base case, there's some time left, but not enough to visit any remaining valves.
-    if not any(
-        distances[(curr_valve, next_valve)] <= minutes_left
-        for next_valve in valves_to_visit
-    ):
-        return [valves_visited_with_min_left]
+            opened, curr = divmod(state, state_stride)
+            if pressure > best_by_valve_set[opened]:
+                best_by_valve_set[opened] = pressure
 
-    # For each choice available for next valve to visit, aggregate all possible paths for that
-    # choice and then return them all.
-    next_scores_and_remaining_and_visited = list()
+            for bit, distance, rate, i in moves[curr]:
+                if opened & bit:
+                    continue
 
-    for next_valve in valves_to_visit:
+                next_min_left = minutes_left - distance
+                if next_min_left <= 0:
+                    continue
 
-        distance = distances[(curr_valve, next_valve)]
-        if distance > minutes_left:
-            # Not enough time to visit this valve.
-            continue
+                next_state = (opened | bit) * state_stride + i
+                next_pressure = pressure + rate * next_min_left
 
-        next_min_left = minutes_left - distance
-        visited_so_far = copy(valves_visited_with_min_left) + [
-            (next_valve, next_min_left)
-        ]
+                next_arrivals = arrivals[next_min_left]
+                if next_arrivals.get(next_state, -1) < next_pressure:
+                    next_arrivals[next_state] = next_pressure
 
-        next_remaining_valves = {v for v in valves_to_visit if v != next_valve}
+    return best_by_valve_set
 
-        next_scores_and_remaining_and_visited.extend(
-            _possible_paths(
-                next_valve,
-                next_remaining_valves,
-                distances,
-                next_min_left,
-                visited_so_far,
-            )
-        )
 
-    return next_scores_and_remaining_and_visited
+def _best_pressure_within_valve_set(best_by_valve_set):
+    """Given the best pressure released by opening exactly each set of valves, returns a list of
+    the best pressure released by opening any subset of each set of valves."""
+
+    best_within = list(best_by_valve_set)
+    num_valves = len(best_within).bit_length() - 1
+
+    # For each valve in turn, every set containing that valve is at least as good as the same
+    # set without it. After every valve, each set has seen every one of its subsets.
+    for i in range(num_valves):
+        bit = 1 << i
+        for valve_set in range(len(best_within)):
+            if valve_set & bit and best_within[valve_set ^ bit] > best_within[valve_set]:
+                best_within[valve_set] = best_within[valve_set ^ bit]
+
+    return best_within
 
 
 @aoc_output_formatter(YEAR, DAY, 1, PART_ONE_DESCRIPTION, assert_answer=PART_ONE_ANSWER)
@@ -152,22 +159,23 @@ def part_one(raw_valve_info):
     valves_to_visit, valve_rates, connections = _parse_valve_tunnel_map(raw_valve_info)
     valve_distances = _get_distance_map(connections, valves_to_visit, start_valve)
 
-    paths = _possible_paths(
-        start_valve,
-        valves_to_visit,
-        valve_distances,
-        total_minutes,
-        list(),
+    return max(
+        _best_pressure_by_valve_set(
+            start_valve,
+            valves_to_visit,
+            valve_rates,
+            valve_distances,
+            total_minutes,
+        )
     )
 
-    return max(_score_path(path, valve_rates) for path in paths)
-
 
 @aoc_output_formatter(YEAR, DAY, 2, PART_TWO_DESCRIPTION, assert_answer=PART_TWO_ANSWER)
 def part_two(raw_valve_info):
 
-    # Divvy the sets of valves between elf and elephant, and find the best possible arrangement
-    # of valves between the two to yield the most pressure release.
+    # The elf and elephant open disjoint sets of valves, and neither affects the pressure the
+    # other releases, so the best they can do together is the best split of the valves between
+    # them, where each does the best they can alone within their share.
 
     start_valve = "AA"
     total_minutes = 26
@@ -175,51 +183,21 @@ def part_two(raw_valve_info):
     valves_to_visit, valve_rates, connections = _parse_valve_tunnel_map(raw_valve_info)
     valve_distances = _get_distance_map(connections, valves_to_visit, start_valve)
 
-    # Something of a hack and it's not exhaustive, but let's ~roughly~ split the valves in half
-    # between elf and elephant. Intuitively, having one take most of the valves, and the other
-    # only handle a few, isn't going to yield the best results.
-    little_under_half = (len(valves_to_visit) // 2) - 1
-    little_over_half = (len(valves_to_visit) // 2) + 2
-
-    best_score = 0
-
-    for elf_set_size in range(little_under_half, little_over_half):
-        for elf_valves_combo in combinations(valves_to_visit, elf_set_size):
-
-            elf_valves = set(elf_valves_combo)
-            elephant_valves = set(valves_to_visit) - elf_valves
-
-            elf_paths = _possible_paths(
-                start_valve,
-                elf_valves,
-                valve_distances,
-                total_minutes,
-                list(),
-            )
-
-            best_elf_score = 0
-            for elf_path in elf_paths:
-                best_elf_score = max(
-                    [best_elf_score, _score_path(elf_path, valve_rates)]
-                )
-
-            elephant_paths = _possible_paths(
-                start_valve,
-                elephant_valves,
-                valve_distances,
-                total_minutes,
-                list(),
-            )
-
-            best_elephant_score = 0
-            for elephant_path in elephant_paths:
-                best_elephant_score = max(
-                    [best_elephant_score, _score_path(elephant_path, valve_rates)]
-                )
-
-            best_score = max([best_score, best_elf_score + best_elephant_score])
-
-    return best_score
+    best_within_valve_set = _best_pressure_within_valve_set(
+        _best_pressure_by_valve_set(
+            start_valve,
+            valves_to_visit,
+            valve_rates,
+            valve_distances,
+            total_minutes,
+        )
+    )
+
+    all_valves = len(best_within_valve_set) - 1
+    return max(
+        best_within_valve_set[elf_valves] + best_within_valve_set[all_valves ^ elf_valves]
+        for elf_valves in range(len(best_within_valve_set))
+    )
 
 
 # ----------------------------------------------------------------------------------------------
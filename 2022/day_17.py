@@ -1,5 +1,5 @@
-from collections import defaultdict
-from email.policy import default
+import sys
+from time import perf_counter
 
 from util.decorators import aoc_output_formatter
 from util.input import get_input
@@ -18,283 +18,186 @@ ONE_TRILLION = 1_000_000_000_000
 GUST_RIGHT = ">"
 GUST_LEFT = "<"
 
-AIR_SPACE = "."
+# Each row of the chamber is a 7-bit integer, where the highest bit is the leftmost column and a
+# set bit is rock. A falling rock is up to 4 rows packed into one integer, 8 bits per row with
+# its bottom row in the lowest byte, so that moving or checking the whole rock against the
+# chamber rows it overlaps is a single bitwise operation.
 
 # Rock patterns defined with the chamber in mind -- that it's 7 wide units wide, and that the
-# rocks appear in the chamber with its left-most edge 2 units away from the left wall.
+# rocks appear in the chamber with its left-most edge 2 units away from the left wall. Rows are
+# listed from the top down, as they'd be drawn.
 
 HORIZONTAL_BLOCK = [
-    list("..####."),
+    0b0011110,
 ]
 
 PLUS_BLOCK = [
-    list("...#..."),
-    list("..###.."),
-    list("...#..."),
+    0b0001000,
+    0b0011100,
+    0b0001000,
 ]
 
 L_BLOCK = [
-    list("....#.."),
-    list("....#.."),
-    list("..###.."),
+    0b0000100,
+    0b0000100,
+    0b0011100,
 ]
 
 VERTICAL_BLOCK = [
-    list("..#...."),
-    list("..#...."),
-    list("..#...."),
-    list("..#...."),
+    0b0010000,
+    0b0010000,
+    0b0010000,
+    0b0010000,
 ]
 
 SQUARE_BLOCK = [
-    list("..##..."),
-    list("..##..."),
+    0b0011000,
+    0b0011000,
 ]
 
+BLOCKS = [HORIZONTAL_BLOCK, PLUS_BLOCK, L_BLOCK, VERTICAL_BLOCK, SQUARE_BLOCK]
 
-def block_generator():
-    while True:
-        yield from enumerate(
-            [HORIZONTAL_BLOCK, PLUS_BLOCK, L_BLOCK, VERTICAL_BLOCK, SQUARE_BLOCK]
-        )
+# Masks of the leftmost and rightmost columns in each of a packed rock's 4 rows
+LEFT_WALL = 0x40404040
+RIGHT_WALL = 0x01010101
 
+FULL_ROW = 0b1111111
 
-def _rotate(sequence, steps):
-    """Rotates a sequence by N steps, wrapping elements back to the beginning. A positive step
-    value rotates to the right.
+# How many rows from the top of the tower are compared when looking for a repeated state
+TOP_ROWS_PROFILE = 32
 
-    Ex:
-    _rotate('--A--', 1)
-    gives
-    '---A-'
 
-    _rotate('ABCDE', -2)
-    gives
-    'CDEAB'
-    """
+def _pack_rows(rows):
+    """Packs a rock's rows, listed top down, into a single integer, bottom row lowest."""
 
-    steps = steps % len(sequence)
-    return sequence[-steps:] + sequence[:-steps]
-
-
-def _empty_row():
-    return list(".......")
-
-
-class CannotOccupySameSpaceException(Exception):
-    pass
+    return sum(row << (8 * i) for i, row in enumerate(reversed(rows)))
 
 
 class RockChamber:
-    def __init__(self):
+    def __init__(self, wind_gusts):
+        # Row 0 is the chamber floor, so the tower height is the index of its highest row.
+        self.rows = bytearray([FULL_ROW])
         self.height = 0
 
         self.n_blocks_resting = 0
-        self.latest_gi = None
+        self.block_index = 0
 
-        self.resting_rows = defaultdict(_empty_row)
-        self.falling_rows = defaultdict(_empty_row)
+        self.gusts_left = [gust == GUST_LEFT for gust in wind_gusts]
+        self.gust_index = 0
 
-        # Ppopulate bottom resting_row with empty row so we can assume later we always have at
-        # least one row.
-        self.resting_rows[0] = _empty_row()
+        self.packed_blocks = [(_pack_rows(block), len(block)) for block in BLOCKS]
 
-    def _trim_chamber(self):
-        """Trim the chamber by removing empty air rows above the highest row containing a
-        resting rock."""
+    def _state_key(self):
+        """Returns the next block, the next wind gust, and the shape of the top of the tower.
+        If we see the same key twice, everything after that will repeat too."""
 
-        to_del = list()
+        lowest_row = max(0, self.height + 1 - TOP_ROWS_PROFILE)
+        return self.block_index, self.gust_index, bytes(self.rows[lowest_row : self.height + 1])
 
-        i = max(self.resting_rows.keys())
-        while True:
-            if all(c == AIR_SPACE for c in self.resting_rows[i]):
-                to_del.append(i)
-                i -= 1
-                continue
-            break
-
-        for i in to_del:
-            del self.resting_rows[i]
-
-    def _combine(self, resting, falling):
-        """Accept a rows representing a single horizontal layer of a resting rock and of a
-        falling rock, and combine them into single row if possible. Otherwise if impossible
-        because falling and resting rocks would occupy the same space, raise a
-        CannotOccupySameSpaceException for control flow."""
-
-        combined = list()
-        for r, f in zip(resting, falling):
-            if r == AIR_SPACE and f == AIR_SPACE:
-                combined.append(AIR_SPACE)
-            elif r != AIR_SPACE and f != AIR_SPACE:
-                raise CannotOccupySameSpaceException()
-            elif r != AIR_SPACE or f != AIR_SPACE:
-                combined.append("#")
-            else:
-                raise ValueError("One of the 3 above cases should have matched")
-        return combined
-
-    def _apply_gravity(self):
-        """Makes a falling rock move down by one unit, unless it cannot because it would enter a
-        space occupied by a resting rock."""
-
-        # First check if the falling rock has reached the very bottom row (ix=0), meaning it
-        # reached the chamber floor. This would be the very first falling rock. If yes, raise
-        # CannotOccupySameSpaceException to have the rock come to rest.
-        if min(self.falling_rows.keys()) == 0:
-            raise CannotOccupySameSpaceException()
-
-        # Otherwise, attempt a _combine for each falling row on the resting row beneath it. If
-        # any cannot move downwards, we'll raise CannotOccupySameSpaceException (from inside
-        # _combine) to indicate the rock is coming to rest.
-        for i, falling_row in self.falling_rows.items():
-            self._combine(self.resting_rows[i - 1], falling_row)
-
-        # No collisions, move all the falling rock rows down one unit.
-        new_falling_rows = defaultdict(_empty_row)
-        for i, falling_row in self.falling_rows.items():
-            new_falling_rows[i - 1] = falling_row
-        self.falling_rows = new_falling_rows
-
-    def _apply_gust(self, gust):
-        """Apply a gust of wind to the rock and maybe move it left or right."""
-
-        # First just see if the rock would hit the wall of the chamber. If moving left, make
-        # sure the leftmost occupied rock is not at column 0. If moving right, make sure the
-        # rightmost occupied rock is not at the highest column index (accessed via -1).
-        x_to_check = -1 if gust == GUST_RIGHT else 0
-        if any(row[x_to_check] != AIR_SPACE for row in self.falling_rows.values()):
-            return
-
-        # Then check if moving each falling rock row left or right would cause it to collide
-        # with a resting rock row at the same height.
-        dx = -1 if gust == GUST_LEFT else 1
-        try:
-            # First try to see if it's possible to move each row.
-            for i, falling_row in self.falling_rows.items():
-                self._combine(self.resting_rows[i], _rotate(falling_row, dx))
-
-            # If we reach here, it's possible (otherwise exception would've been raised). Now we
-            # actually commit the change for each moved row.
-            for i in self.falling_rows.keys():
-                self.falling_rows[i] = _rotate(self.falling_rows[i], dx)
-            return
-        except CannotOccupySameSpaceException:
-            return
-
-    def simulate_falling_rock(self, rock_pattern, wind_gusts):
-        """Simulate a falling block by alternating blasting it with wind and then having it fall
-        down a unit, until the block comes to rest."""
+    def simulate_falling_rock(self):
+        """Simulate the next falling block by alternating blasting it with wind and then having
+        it fall down a unit, until the block comes to rest."""
 
-        # A new falling block comes into existence 3 spaces above the highest resting block.
-        self.falling_rows = defaultdict(_empty_row)
-        max_height = max(self.resting_rows.keys())
-        if self.n_blocks_resting == 0:
-            self.resting_rows[max_height + 1] = _empty_row()
-            self.resting_rows[max_height + 2] = _empty_row()
-
-            for i, falling_row in enumerate(reversed(rock_pattern)):
-                self.falling_rows[max_height + 3 + i] = falling_row
-        else:
-            self.resting_rows[max_height + 1] = _empty_row()
-            self.resting_rows[max_height + 2] = _empty_row()
-            self.resting_rows[max_height + 3] = _empty_row()
-
-            for i, falling_row in enumerate(reversed(rock_pattern)):
-                self.falling_rows[max_height + 4 + i] = falling_row
-
-        # Continue alternating wind and gravity until the falling block would occupy the same
-        # space as a resting block...
-        try:
-            while True:
-                gi, gust = next(wind_gusts)
-                self.latest_gi = gi
-
-                self._apply_gust(gust)
-                self._apply_gravity()
-
-        # ... then bring the falling block to rest.
-        except CannotOccupySameSpaceException:
-            # Combine the falling and resting block rows.
-            for i in self.falling_rows.keys():
-                self.resting_rows[i] = self._combine(
-                    self.resting_rows[i],
-                    self.falling_rows[i],
-                )
-            # Trim the chamber of excess empty air space at the top, calculate new current
-            # height and add one block to the resting blocks count.
-            self._trim_chamber()
-            self.height = max(self.resting_rows.keys()) + 1
-            self.n_blocks_resting += 1
+        rock, rock_height = self.packed_blocks[self.block_index]
+        self.block_index = (self.block_index + 1) % len(self.packed_blocks)
 
+        gusts_left = self.gusts_left
+        num_gusts = len(gusts_left)
+        gust_index = self.gust_index
+        rows = self.rows
 
-@aoc_output_formatter(YEAR, DAY, 1, PART_ONE_DESCRIPTION, assert_answer=PART_ONE_ANSWER)
-def part_one(wind_gusts):
+        # A new falling block comes into existence 3 spaces above the highest resting block.
+        # Make sure there's (empty) room in the chamber for every row it could occupy.
+        y = self.height + 4
+        if len(rows) < y + 4:
+            rows.extend(bytes(y + 4 - len(rows)))
+
+        # The first 4 gusts all blow the rock around above the top of the tower, and it falls 3
+        # units in between them, so only the walls can get in its way.
+        for _ in range(4):
+            if gusts_left[gust_index]:
+                if not rock & LEFT_WALL:
+                    rock <<= 1
+            elif not rock & RIGHT_WALL:
+                rock >>= 1
+            gust_index = (gust_index + 1) % num_gusts
+        y -= 3
+
+        # Continue alternating gravity and wind until the falling block would occupy the same
+        # space as a resting block.
+        while True:
+            # The rows just below the rock, which are the rows it occupies if it can fall.
+            window = int.from_bytes(rows[y - 1 : y + 3], "little")
+            if rock & window:
+                break
+            y -= 1
 
-    chamber = RockChamber()
+            if gusts_left[gust_index]:
+                if not rock & LEFT_WALL and not (rock << 1) & window:
+                    rock <<= 1
+            elif not rock & RIGHT_WALL and not (rock >> 1) & window:
+                rock >>= 1
+            gust_index = (gust_index + 1) % num_gusts
 
-    def wind_generator():
-        while True:
-            yield from enumerate(wind_gusts)
+        # Then bring the falling block to rest.
+        resting = int.from_bytes(rows[y : y + 4], "little") | rock
+        rows[y : y + 4] = resting.to_bytes(4, "little")
 
-    endless_wind = wind_generator()
+        self.height = max(self.height, y + rock_height - 1)
+        self.gust_index = gust_index
+        self.n_blocks_resting += 1
 
-    for _, block in block_generator():
-        chamber.simulate_falling_rock(block, endless_wind)
-        if chamber.n_blocks_resting == 2022:
-            break
+    def height_after(self, total_blocks):
+        """Returns the height of the tower once the total number of blocks have come to rest.
 
-    return chamber.height
+        After every block, the next block, next wind gust, and the top of the tower are
+        remembered. As soon as those repeat, the blocks and height gained between the two
+        sightings will repeat forever, so we skip as many whole cycles as fit without simulating
+        them, and only simulate the remainder."""
 
+        seen_states = dict()
 
-@aoc_output_formatter(YEAR, DAY, 2, PART_TWO_DESCRIPTION, assert_answer=PART_TWO_ANSWER)
-def part_two(wind_gusts):
+        while self.n_blocks_resting < total_blocks:
+            key = self._state_key()
 
-    chamber = RockChamber()
-    wind_gusts_size = len(wind_gusts)
+            if key in seen_states:
+                prev_blocks, prev_height = seen_states[key]
+                cycle_blocks = self.n_blocks_resting - prev_blocks
+                cycle_height = self.height - prev_height
 
-    def wind_generator():
-        while True:
-            yield from enumerate(wind_gusts)
+                cycles, remainder = divmod(total_blocks - self.n_blocks_resting, cycle_blocks)
+                for _ in range(remainder):
+                    self.simulate_falling_rock()
 
-    endless_wind = wind_generator()
-    block_gen = block_generator()
+                return self.height + cycles * cycle_height
 
-    seen_states = defaultdict(list)
+            seen_states[key] = (self.n_blocks_resting, self.height)
+            self.simulate_falling_rock()
 
-    bi = None
-    while True:
+        return self.height
 
-        if chamber.latest_gi == wind_gusts_size - 1:
 
-            bigi_key = (chamber.latest_gi, bi)
-            seen_states[bigi_key].append((chamber.n_blocks_resting, chamber.height))
+def _rocks_per_second(wind_gusts, n_blocks=200_000):
+    """Microbenchmark of the raw simulation speed, without any cycle skipping. Returns how many
+    blocks per second come to rest."""
 
-            # We've identified a cycle if we're back to the same next wind gust and block.
-            # Find the delta of blocks and height in between the last two times we saw this
-            # state and fast-forward as close to we can to 1 trillion blocks, then let the rest
-            # of the simulation finish out.
-            if len(seen_states[bigi_key]) == 2:
-                s1 = seen_states[bigi_key].pop(-1)
-                s2 = seen_states[bigi_key].pop(-1)
+    chamber = RockChamber(wind_gusts)
 
-                delta_blocks = s1[0] - s2[0]
-                delta_height = s1[1] - s2[1]
+    start = perf_counter()
+    for _ in range(n_blocks):
+        chamber.simulate_falling_rock()
 
-                remaining = ONE_TRILLION - chamber.n_blocks_resting
-                multiplier = remaining // delta_blocks
+    return n_blocks / (perf_counter() - start)
 
-                chamber.n_blocks_resting += multiplier * delta_blocks
-                new_resting_rows = defaultdict(_empty_row)
-                for i, row in chamber.resting_rows.items():
-                    new_resting_rows[i + (multiplier * delta_height)] = row
-                chamber.resting_rows = new_resting_rows
 
-        bi, block = next(block_gen)
-        chamber.simulate_falling_rock(block, endless_wind)
+@aoc_output_formatter(YEAR, DAY, 1, PART_ONE_DESCRIPTION, assert_answer=PART_ONE_ANSWER)
+def part_one(wind_gusts):
+    return RockChamber(wind_gusts).height_after(2022)
 
-        if chamber.n_blocks_resting == ONE_TRILLION:
-            return chamber.height
+
+@aoc_output_formatter(YEAR, DAY, 2, PART_TWO_DESCRIPTION, assert_answer=PART_TWO_ANSWER)
+def part_two(wind_gusts):
+    return RockChamber(wind_gusts).height_after(ONE_TRILLION)
 
 
 # ----------------------------------------------------------------------------------------------
@@ -306,3 +209,11 @@ def run(input_file):
 
     part_one(wind_gusts)
     part_two(wind_gusts)
+
+
+if __name__ == "__main__":
+    # python -m 2022.day_17 [input_file]
+    input_file = sys.argv[1] if len(sys.argv) > 1 else f"{YEAR}/inputs/input_day{DAY}.txt"
+    wind_gusts = get_input(input_file)[0]
+
+    print(f"{_rocks_per_second(wind_gusts):,.0f} rocks/second")
@@ -1,7 +1,3 @@
-from collections import defaultdict
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
-
 from util.decorators import aoc_output_formatter
 from util.input import get_input
 from util.iter import int_stream
@@ -9,10 +5,6 @@ from util.iter import int_stream
 DAY = 23
 YEAR = 2022
 
-# TODO make this faster later!
-# TODO can we only consider elves which have moved in the last N rounds?
-# Things are probably fairly static in the middle of the pack of elves after a while.
-
 PART_ONE_DESCRIPTION = "count of empty tiles in smallest rectangle holding all elves"
 PART_ONE_ANSWER = 4181
 
@@ -20,12 +12,6 @@ PART_TWO_DESCRIPTION = "which round is the first where no elves move"
 PART_TWO_ANSWER = 973
 
 
-@dataclass
-class MovementRule:
-    dirs_to_check: List[Tuple[int, int]]
-    to_move: Tuple[int, int]
-
-
 DELTA_N = (0, -1)
 DELTA_NE = (1, -1)
 DELTA_NW = (-1, -1)
@@ -48,184 +34,162 @@ ALL_DELTAS = [
     DELTA_NW,
 ]
 
+# Each movement rule is the direction an elf proposes moving, and the directions which must all
+# be free of elves for it to propose that. Every elf considers the rules in the same order, and
+# the first rule moves to the back of the line after each round.
+MOVEMENT_RULES = [
+    (DELTA_N, [DELTA_N, DELTA_NE, DELTA_NW]),
+    (DELTA_S, [DELTA_S, DELTA_SE, DELTA_SW]),
+    (DELTA_W, [DELTA_W, DELTA_NW, DELTA_SW]),
+    (DELTA_E, [DELTA_E, DELTA_NE, DELTA_SE]),
+]
 
-def _starting_rules():
-    return [
-        MovementRule(
-            dirs_to_check=[DELTA_N, DELTA_NE, DELTA_NW],
-            to_move=DELTA_N,
-        ),
-        MovementRule(
-            dirs_to_check=[DELTA_S, DELTA_SE, DELTA_SW],
-            to_move=DELTA_S,
-        ),
-        MovementRule(
-            dirs_to_check=[DELTA_W, DELTA_NW, DELTA_SW],
-            to_move=DELTA_W,
-        ),
-        MovementRule(
-            dirs_to_check=[DELTA_E, DELTA_NE, DELTA_SE],
-            to_move=DELTA_E,
-        ),
-    ]
+# How many empty rows and columns to leave around the elves whenever the grove is laid out
+GROWTH_PADDING = 16
+
+
+def _shift(bits, offset):
+    """Shifts a bitboard so that each bit holds the bit `offset` positions above it."""
+
+    return bits >> offset if offset >= 0 else bits << -offset
+
+
+class Grove:
+    """The positions of all the elves, as a bitboard -- a single integer with a bit per position
+    in a rectangle around the elves, where the rows are laid out end to end.
+
+    Checking each elf's neighbor in some direction is then a single shift of the whole board,
+    so every step of a round happens for all the elves at once with a handful of bitwise ops.
+
+    The rectangle has empty rows and columns around its edges. Whenever an elf reaches an edge,
+    the grove is laid out again in a bigger rectangle. That keeps shifts from mixing up the end
+    of one row with the start of the next, because only empty edge columns ever wrap around."""
+
+    def __init__(self, elf_positions):
+        self._lay_out(elf_positions)
+
+    def _lay_out(self, elf_positions):
+        """Lays out the elves in a rectangle with room to spread out in every direction."""
+
+        xs = [x for x, _ in elf_positions]
+        ys = [y for _, y in elf_positions]
+
+        self.min_x = min(xs) - GROWTH_PADDING
+        self.min_y = min(ys) - GROWTH_PADDING
+        self.width = max(xs) - self.min_x + 1 + GROWTH_PADDING
+        height = max(ys) - self.min_y + 1 + GROWTH_PADDING
 
+        self.elves = 0
+        for x, y in elf_positions:
+            self.elves |= 1 << ((y - self.min_y) * self.width + (x - self.min_x))
 
-@dataclass
-class Elf:
-    id: int
-    x: int
-    y: int
-    rules: List[MovementRule]
-    just_moved: bool
-
-    @property
-    def coord(self):
-        return (self.x, self.y)
-
-    @property
-    def rotated_rules(self):
-        return self.rules[1:] + self.rules[0:1]
-
-    def wait(self):
-        return Elf(
-            id=self.id,
-            x=self.x,
-            y=self.y,
-            rules=self.rotated_rules,
-            just_moved=False,
-        )
-
-    def next(self, current_elf_locations):
-        """Figures out where this elf is moving next (if anywhere at all, and returns a new Elf
-        dataclass instance representing an elf at that location."""
-
-        # First check if the elf has any neighbors. If there are no neighbors, the elf doesn't
-        # need to move.
-        has_no_neighbors = True
-        for delta in ALL_DELTAS:
-            dx, dy = delta
-            nx = self.x + dx
-            ny = self.y + dy
-            if (nx, ny) in current_elf_locations:
-                has_no_neighbors = False
-                break
-
-        if has_no_neighbors:
-            return self.wait()
-
-        # Next, check each of the movement rules in order. If there are no elves in the
-        # specified direction, propose moving that direction.
-        for rule in self.rules:
-            has_no_neighbors_in_dir = True
-            for delta in rule.dirs_to_check:
-                dx, dy = delta
-                nx = self.x + dx
-                ny = self.y + dy
-                if (nx, ny) in current_elf_locations:
-                    has_no_neighbors_in_dir = False
-                    break
-            if has_no_neighbors_in_dir:
-                to_move = rule.to_move
-                dx, dy = to_move
-                return Elf(
-                    id=self.id,
-                    x=self.x + dx,
-                    y=self.y + dy,
-                    rules=self.rotated_rules,
-                    just_moved=True,
-                )
-
-        # Otherwise the elf doesn't have anywhere to move, just stay put.
-        return self.wait()
+        full_row = (1 << self.width) - 1
+        row_ends = 1 | (1 << (self.width - 1))
+
+        self.edges = full_row | (full_row << ((height - 1) * self.width))
+        for y in range(height):
+            self.edges |= row_ends << (y * self.width)
+
+        # How far away the neighbor in each direction is, in bits.
+        self.offsets = {(dx, dy): dy * self.width + dx for dx, dy in ALL_DELTAS}
+
+    def elf_positions(self):
+        """Returns a list of the (x, y) position of each elf."""
+
+        bits = bin(self.elves)[:1:-1]
+        return [
+            (self.min_x + i % self.width, self.min_y + i // self.width)
+            for i, bit in enumerate(bits)
+            if bit == "1"
+        ]
+
+    def move_elves(self, round_index):
+        """Move every elf to their new location based on their current location, the location
+        of the nearby elves around them, and the current order of the movement rules. Returns
+        whether any elf moved."""
+
+        if self.elves & self.edges:
+            self._lay_out(self.elf_positions())
+
+        elves = self.elves
+        offsets = self.offsets
+        occupied = {delta: _shift(elves, offset) for delta, offset in offsets.items()}
+
+        # Elves with no neighbors at all don't need to move.
+        has_neighbors = 0
+        for neighbors in occupied.values():
+            has_neighbors |= neighbors
+        undecided = elves & has_neighbors
+
+        # Each elf proposes moving in the direction of the first rule (in this round's order)
+        # whose directions are all free of elves. Shift those elves onto their destinations.
+        destinations = dict()
+        for i in range(len(MOVEMENT_RULES)):
+            to_move, (a, b, c) = MOVEMENT_RULES[(round_index + i) % len(MOVEMENT_RULES)]
+
+            proposing = undecided & ~(occupied[a] | occupied[b] | occupied[c])
+            undecided &= ~proposing
+
+            destinations[to_move] = _shift(proposing, -offsets[to_move])
+
+        # Elves only move if no other elf proposed moving to the same position. That can only
+        # happen between elves proposing opposite directions -- e.g. an elf proposing north and
+        # another proposing west can't share a destination, since each would be the other's
+        # diagonal neighbor in the direction it checked.
+        north, south = destinations[DELTA_N], destinations[DELTA_S]
+        west, east = destinations[DELTA_W], destinations[DELTA_E]
+
+        uncontested = {
+            DELTA_N: north & ~south,
+            DELTA_S: south & ~north,
+            DELTA_W: west & ~east,
+            DELTA_E: east & ~west,
+        }
+
+        # Destinations are always empty, so each elf that moves just leaves its position and
+        # fills its destination.
+        did_move = False
+        for to_move, arrivals in uncontested.items():
+            if arrivals:
+                did_move = True
+                elves ^= arrivals | _shift(arrivals, offsets[to_move])
+
+        self.elves = elves
+        return did_move
 
 
 def _get_elf_positions(raw_input):
-    """Parse the raw problem input and extract the starting positions of all the elves,
-    assigning each of them an ID for tracking later and then returning a dict of elf ID to the
-    Elf instance."""
-
-    elves = dict()
-
-    elf_id = 0
-    for y, row in enumerate(raw_input):
-        for x, cell in enumerate(row):
-            if cell != "#":
-                continue
-            elves[elf_id] = Elf(
-                id=elf_id,
-                x=x,
-                y=y,
-                rules=_starting_rules(),
-                just_moved=False,
-            )
-            elf_id += 1
-
-    return elves
-
-
-def _move_elves(elves: Dict):
-    """Move each elf to their new location based on their current location, the location of the
-    nearby elves around them, and their ruleset."""
-
-    # Get the proposed next location for each elf, and then group them by their proposed coords.
-    elves_coords_set = [elf.coord for elf in elves.values()]
-    proposed_next_elves = [elf.next(elves_coords_set) for elf in elves.values()]
-
-    proposed_next_by_coord = defaultdict(list)
-    for proposed_next_elf in proposed_next_elves:
-        proposed_next_by_coord[proposed_next_elf.coord].append(proposed_next_elf)
-
-    # Start a dictionary holding elf ID to that elf's next location. Only include proposed moves
-    # where that elf is the only one who proposed moving to that next location.
-    actual_next_elves = dict()
-    for prop_elves in proposed_next_by_coord.values():
-        if len(prop_elves) == 1:
-            elf = prop_elves[0]
-            actual_next_elves[elf.id] = elf
-
-    # Figure out which elves did not actually move, because they proposed moving to the same
-    # coord as another elf. Keep them in the same spot.
-    moved_elves = set(actual_next_elves.keys())
-    remaining_elves = set(elves.keys()) - moved_elves
-
-    for elf_id in remaining_elves:
-        actual_next_elves[elf_id] = elves[elf_id].wait()
-
-    # Figure out if the whole group stayed put.
-    whole_group_did_not_move = True
-    for elf in actual_next_elves.values():
-        if elf.just_moved:
-            whole_group_did_not_move = False
-            break
-
-    return actual_next_elves, whole_group_did_not_move
+    """Parse the raw problem input and extract the starting (x, y) position of each elf."""
+
+    return [
+        (x, y) for y, row in enumerate(raw_input) for x, cell in enumerate(row) if cell == "#"
+    ]
 
 
 @aoc_output_formatter(YEAR, DAY, 1, PART_ONE_DESCRIPTION, assert_answer=PART_ONE_ANSWER)
 def part_one(starting_elf_grid):
 
-    elves = _get_elf_positions(starting_elf_grid)
+    grove = Grove(_get_elf_positions(starting_elf_grid))
 
-    for _ in range(10):
-        elves, _ = _move_elves(elves)
+    for round_index in range(10):
+        grove.move_elves(round_index)
 
-    raw_coords = [(elf.x, elf.y) for elf in elves.values()]
+    raw_coords = grove.elf_positions()
 
     min_x = min(x for x, _ in raw_coords)
     max_x = max(x for x, _ in raw_coords)
     min_y = min(y for _, y in raw_coords)
     max_y = max(y for _, y in raw_coords)
 
-    return (((max_x + 1) - min_x) * ((max_y + 1) - min_y)) - len(elves)
+    return (((max_x + 1) - min_x) * ((max_y + 1) - min_y)) - len(raw_coords)
 
 
 @aoc_output_formatter(YEAR, DAY, 2, PART_TWO_DESCRIPTION, assert_answer=PART_TWO_ANSWER)
 def part_two(starting_elf_grid):
-    elves = _get_elf_positions(starting_elf_grid)
+    grove = Grove(_get_elf_positions(starting_elf_grid))
 
     for i in int_stream(1):
-        elves, did_not_move = _move_elves(elves)
-        if did_not_move:
+        if not grove.move_elves(i - 1):
             return i
 
 
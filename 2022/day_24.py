@@ -1,8 +1,6 @@
-from dataclasses import dataclass
-from typing import Tuple
-
 from util.decorators import aoc_output_formatter
 from util.input import get_input
+from util.iter import int_stream
 
 DAY = 24
 YEAR = 2022
@@ -14,44 +12,63 @@ PART_TWO_DESCRIPTION = "Fewest minutes to round-trip and then reach the exit"
 PART_TWO_ANSWER = 908
 
 
-@dataclass(frozen=True)
-class Blizzard:
-    """Represents a blizzard which has a location and is traveling in a specific direction. Due
-    to conservation of blizzard energy, it'll wrap back around to the opposite side at ix=1
-    (because ix=0 is the bounding wall) or to the max_x/y position it can occupy."""
-
-    coord: Tuple[int, int]
-    dir: str
-    max_x: int
-    max_y: int
-
-    def next(self):
-        # Move the blizzard 1 unit in the specified direction.
-        x, y = self.coord
-        x, y = {
-            "r": (x + 1, y),
-            "l": (x - 1, y),
-            "u": (x, y - 1),
-            "d": (x, y + 1),
-        }[self.dir]
-
-        # Wrap the blizzard around if it goes out of bounds.
-        if x > self.max_x:
-            x = 1
-        if x < 1:
-            x = self.max_x
-        if y < 1:
-            y = self.max_y
-        if y > self.max_y:
-            y = 1
-
-        # Return a new Blizzard instance at the next coordinate.
-        return Blizzard(
-            coord=(x, y),
-            dir=self.dir,
-            max_x=self.max_x,
-            max_y=self.max_y,
-        )
+class BlizzardTimeline:
+    """Knows which cells of the valley are covered by a blizzard at any minute.
+
+    The valley's interior spans x=1..max_x and y=1..max_y (ix=0 is the bounding wall). Each row
+    of the interior is a bitmask, where bit x-1 is set if cell x is covered. Blizzards wrap
+    around the interior, so horizontal blizzards repeat every max_x minutes and vertical ones
+    every max_y minutes, and the whole valley repeats every lcm(max_x, max_y) minutes.
+
+    Horizontal blizzards stay in their row, so each row's mask of them is precomputed for
+    every minute of their period. Vertical blizzards keep their column, so the ones in a row at
+    any minute are just the ones which started some number of rows away. That's
+    O(max_x * max_y) memory in total, no matter how long the valley takes to repeat."""
+
+    def __init__(self, starting_map):
+        self.max_x = len(starting_map[0]) - 2
+        self.max_y = len(starting_map) - 2
+        self.full_row = (1 << self.max_x) - 1
+
+        # For each row of the interior, the bitmask of blizzards which start there, by
+        # direction.
+        rows = {direction: [0] * self.max_y for direction in "><^v"}
+        for y, row in enumerate(starting_map[1:-1]):
+            for x, cell in enumerate(row[1:-1]):
+                if cell in rows:
+                    rows[cell][y] |= 1 << x
+
+        self.up_rows = rows["^"]
+        self.down_rows = rows["v"]
+
+        # horizontal[t % max_x][y] is the bitmask of horizontal blizzards in row y at minute t.
+        self.horizontal = list()
+        for t in range(self.max_x):
+            self.horizontal.append(
+                [
+                    self._rotate_left(right_movers, t) | self._rotate_left(left_movers, -t)
+                    for right_movers, left_movers in zip(rows[">"], rows["<"])
+                ]
+            )
+
+    def _rotate_left(self, row, steps):
+        """Rotates a row's bitmask left (towards higher x) by the number of steps, wrapping
+        bits back around the interior."""
+
+        steps %= self.max_x
+        return ((row << steps) | (row >> (self.max_x - steps))) & self.full_row
+
+    def covered_rows(self, t):
+        """Returns a list of the bitmask of covered cells in each row of the interior at minute
+        t."""
+
+        horizontal = self.horizontal[t % self.max_x]
+        up_rows, down_rows, max_y = self.up_rows, self.down_rows, self.max_y
+
+        return [
+            horizontal[y] | up_rows[(y + t) % max_y] | down_rows[(y - t) % max_y]
+            for y in range(max_y)
+        ]
 
 
 def _find_entrances(starting_map):
@@ -73,142 +90,66 @@ def _find_entrances(starting_map):
     return entrance, exit
 
 
-def _parse_blizzard_starts(starting_map, max_x, max_y):
-    """Parse the starting map for blizzard info, and return a blizzards map which contains the
-    set of blizzards at time t=0."""
-
-    blizzards = dict()
-    blizzards[0] = list()
-
-    blizz_dir_map = {
-        ">": "r",
-        "<": "l",
-        "v": "d",
-        "^": "u",
-    }
-
-    for y, row in enumerate(starting_map):
-        for x, cell in enumerate(row):
-            if cell in set("#."):
-                continue
-            blizzards[0].append(
-                Blizzard(
-                    coord=(x, y),
-                    dir=blizz_dir_map[cell],
-                    max_x=max_x,
-                    max_y=max_y,
-                )
-            )
-
-    return blizzards
-
-
-def _get_neighbors_at(coord, enter, exit, t, blizzards, max_x, max_y):
-    """Return the possible next positions from the current coordinate at the timestep t, based
-    on where the blizzards will be at that time."""
-
-    # Start off assuming that we can visit any adjacent (non-diagonal) grid coordinate, or stay
-    # in the same place.
-    cx, cy = coord
-    candidates = [
-        (cx, cy),
-        (cx + 1, cy),
-        (cx - 1, cy),
-        (cx, cy + 1),
-        (cx, cy - 1),
-    ]
-
-    # Filter out the candidate next coordinates which are outside the bounds.
-    bounds_filtered = list()
-    for x, y in candidates:
-        if x < 1 or x > max_x or y < 1 or y > max_y:
-            continue
-        bounds_filtered.append((x, y))
-
-    # Get the coordinates of the blizzards at timestep t. If we haven't calculuated where the
-    # blizzards are going to be at that time yet, do so now based on their positions at the
-    # previous timestep.
-    if t not in blizzards.keys():
-        blizzards[t] = [blizz.next() for blizz in blizzards[t - 1]]
-
-    blizz_coords = set(blizz.coord for blizz in blizzards[t])
-
-    # Filter out candidate next coordinates where a blizzard will be.
-    blizzard_filtered = list()
-    for cand_coord in bounds_filtered:
-        if cand_coord in blizz_coords:
-            continue
-        blizzard_filtered.append(cand_coord)
-
-    # Add back in the exit and entrance if they are neighbors because the bounds filter would
-    # have removed it above (because the exit and entrances are the only visitable spots on the
-    # boundary).
-    cx, cy = coord
-    if (cx, cy + 1) == exit:
-        blizzard_filtered.append(exit)
-    elif (cx, cy - 1) == exit:
-        blizzard_filtered.append(exit)
-    blizzard_filtered.append(enter)
-
-    return blizzard_filtered
-
-
-def _get_outta_da_cold(start, exit, start_t, blizzards, max_x, max_y):
+def _get_outta_da_cold(start, exit, start_t, timeline):
     """BFS a path through the blizzard from the start coordinate to the exit coordinate,
-    starting at time T."""
+    starting at time T. Returns the time we reach the exit.
 
-    queue = list()
-    queue.append((start, start_t))
+    Rather than queueing individual positions, every position we could possibly be in at a
+    given minute is tracked at once, as a bitmask per row of the interior. Each minute, those
+    spread to their neighbors (or stay put), and then any which are covered by a blizzard are
+    dropped. We can always wait at the start, since blizzards never reach it."""
 
-    visited = set()
+    max_y = timeline.max_y
+    full_row = timeline.full_row
 
-    while queue:
-        current, t = queue.pop(0)
-        if current == exit:
-            return t
+    start_x, start_y = start
+    exit_x, exit_y = exit
 
-        for neighbor in _get_neighbors_at(
-            current, start, exit, t + 1, blizzards, max_x, max_y
-        ):
-            # "Visited" isn't just a set of coordinates we've visited, it's a set of coordinates
-            # at specific timesteps because the surrounding blizzard positions will be different
-            next_state = (neighbor, t + 1)
-            if next_state in visited:
-                continue
-            visited.add(next_state)
-            queue.append(next_state)
+    # The row of the interior adjacent to the start and the exit, and the bit of their column.
+    start_row, start_bit = (0 if start_y == 0 else max_y - 1), 1 << (start_x - 1)
+    exit_row, exit_bit = (0 if exit_y == 0 else max_y - 1), 1 << (exit_x - 1)
 
+    reachable = [0] * max_y
 
-@aoc_output_formatter(YEAR, DAY, 1, PART_ONE_DESCRIPTION, assert_answer=PART_ONE_ANSWER)
-def part_one(starting_map):
+    for t in int_stream(start_t):
+        if reachable[exit_row] & exit_bit:
+            return t + 1
 
-    entrance, exit = _find_entrances(starting_map)
-    max_x = len(starting_map[0]) - 2
-    max_y = len(starting_map) - 2
+        covered = timeline.covered_rows(t + 1)
+
+        next_reachable = list()
+        for y, row in enumerate(reachable):
+            spread = row | (row << 1) | (row >> 1)
+            if y > 0:
+                spread |= reachable[y - 1]
+            if y < max_y - 1:
+                spread |= reachable[y + 1]
+            next_reachable.append(spread & full_row & ~covered[y])
 
-    blizzards = _parse_blizzard_starts(starting_map, max_x, max_y)
+        next_reachable[start_row] |= start_bit & ~covered[start_row]
+        reachable = next_reachable
 
-    return _get_outta_da_cold(entrance, exit, 0, blizzards, max_x, max_y)
+
+@aoc_output_formatter(YEAR, DAY, 1, PART_ONE_DESCRIPTION, assert_answer=PART_ONE_ANSWER)
+def part_one(starting_map, timeline):
+
+    entrance, exit = _find_entrances(starting_map)
+    return _get_outta_da_cold(entrance, exit, 0, timeline)
 
 
 @aoc_output_formatter(YEAR, DAY, 2, PART_TWO_DESCRIPTION, assert_answer=PART_TWO_ANSWER)
-def part_two(starting_map, exit_time):
+def part_two(starting_map, timeline, exit_time):
 
     entrance, exit = _find_entrances(starting_map)
-    max_x = len(starting_map[0]) - 2
-    max_y = len(starting_map) - 2
 
-    # Since we re-parsed the blizzard info from the input, we have to pre-fill the blizzards at
-    # timesteps up through the `exit_time` passed in to part two here from part one previously.
-    blizzards = _parse_blizzard_starts(starting_map, max_x, max_y)
-    for t in range(1, exit_time + 1):
-        blizzards[t] = [blizz.next() for blizz in blizzards[t - 1]]
+    # The timeline knows where the blizzards are at any minute, so the remaining legs of the
+    # trip reuse the one built for part one, starting from `exit_time` passed in from part one.
 
     # Oh crap, forgot snacks, have to go backwards to the start (starting at time `exit_time`).
-    t2 = _get_outta_da_cold(exit, entrance, exit_time, blizzards, max_x, max_y)
+    t2 = _get_outta_da_cold(exit, entrance, exit_time, timeline)
 
     # Now we have snacks, go back to the exit starting from time t2.
-    return _get_outta_da_cold(entrance, exit, t2, blizzards, max_x, max_y)
+    return _get_outta_da_cold(entrance, exit, t2, timeline)
 
 
 # ----------------------------------------------------------------------------------------------
@@ -217,6 +158,7 @@ def part_two(starting_map, exit_time):
 def run(input_file):
 
     starting_map = get_input(input_file)
+    timeline = BlizzardTimeline(starting_map)
 
-    exit_time = part_one(starting_map)
-    part_two(starting_map, exit_time)
+    exit_time = part_one(starting_map, timeline)
+    part_two(starting_map, timeline, exit_time)
@@ -1,4 +1,5 @@
 from util.decorators import aoc_output_formatter
+from util.grid import DictGrid
 from util.input import get_input_grid_map
 
 DAY = 8
@@ -82,21 +83,17 @@ def _scenic_score(tree_coordinate, forest, forest_width, forest_height):
 @aoc_output_formatter(YEAR, DAY, 1, PART_ONE_DESCRIPTION, assert_answer=PART_ONE_ANSWER)
 def part_one(forest):
 
-    width = max([x for x, y in forest.keys()]) + 1
-    height = max([y for x, y in forest.keys()]) + 1
-
     return sum(
-        1 for coord in forest.keys() if _is_visible(coord, forest, width, height)
+        1 for coord in forest.keys() if _is_visible(coord, forest, forest.width, forest.height)
     )
 
 
 @aoc_output_formatter(YEAR, DAY, 2, PART_TWO_DESCRIPTION, assert_answer=PART_TWO_ANSWER)
 def part_two(forest):
 
-    width = max([x for x, y in forest.keys()]) + 1
-    height = max([y for x, y in forest.keys()]) + 1
-
-    return max(_scenic_score(coord, forest, width, height) for coord in forest.keys())
+    return max(
+        _scenic_score(coord, forest, forest.width, forest.height) for coord in forest.keys()
+    )
 
 
 # ----------------------------------------------------------------------------------------------
@@ -105,7 +102,7 @@ def part_two(forest):
 def run(input_file):
 
     forest = get_input_grid_map(input_file)
-    forest = {coord: int(tree) for coord, tree in forest.items()}
+    forest = DictGrid({coord: int(tree) for coord, tree in forest.items()})
 
     part_one(forest)
     part_two(forest)
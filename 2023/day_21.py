@@ -1,287 +1,202 @@
-from typing import List, Tuple
+from collections import Counter
 
 from util.decorators import aoc_output_formatter
 from util.input import get_input
+from util.search import bfs, encode_coord
 
 DAY = 21
 YEAR = 2023
 
-PART_ONE_DESCRIPTION = ""
+PART_ONE_DESCRIPTION = "garden plots reachable in exactly 64 steps"
 PART_ONE_ANSWER = None
 
-PART_TWO_DESCRIPTION = ""
+PART_TWO_DESCRIPTION = "garden plots reachable in exactly 26501365 steps in the infinite garden"
 PART_TWO_ANSWER = None
 
+PART_ONE_STEPS = 64
+PART_TWO_STEPS = 26501365
 
-def _get_start(stuff):
-    for y, line in enumerate(stuff):
+GARDEN_PLOTS = ".S"
+
+
+def _get_start(garden_map: list[str]) -> tuple[int, int]:
+    """Returns the (x, y) coordinate of the starting position."""
+    for y, line in enumerate(garden_map):
         for x, char in enumerate(line):
             if char == "S":
                 return x, y
-    raise ValueError()
+    raise ValueError("The garden map has no starting position")
 
 
-@aoc_output_formatter(YEAR, DAY, 1, PART_ONE_DESCRIPTION, assert_answer=PART_ONE_ANSWER)
-def part_one(stuff):
-    start_x, start_y = _get_start(stuff)
-
-    def _neighs(tcoord):
-        tx, ty = tcoord
-        for nx, ny in [
-            (tx - 1, ty),
-            (tx + 1, ty),
-            (tx, ty - 1),
-            (tx, ty + 1),
-        ]:
-            try:
-                if stuff[ny][nx] in ".S":
-                    yield nx, ny
-            except IndexError:
-                pass
-
-    q: List[Tuple[Tuple[int, int], int]] = [((start_x, start_y), 0)]
-    visited = set()
-
-    reachable_in_64 = set()
-
-    while q:
-        coord, steps = q.pop(0)
-        visited.add((coord, steps))
-
-        if steps == 6:
-            reachable_in_64.add(coord)
-            continue
-
-        for neigh in _neighs(coord):
-            if (neigh, steps + 1) in visited:
+def _get_plot_neighbors(garden_map: list[str]) -> list[list[int]]:
+    """Returns a list of the neighboring garden plots of each position on the map, where each
+    position is encoded as a single integer. Rocks have no neighbors.
+    """
+    width = len(garden_map[0])
+    height = len(garden_map)
+
+    neighbors: list[list[int]] = [list() for _ in range(width * height)]
+    for y, line in enumerate(garden_map):
+        for x, char in enumerate(line):
+            if char not in GARDEN_PLOTS:
                 continue
-            visited.add((neigh, steps + 1))
-            q.append((neigh, steps + 1))
+            for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                if 0 <= nx < width and 0 <= ny < height and garden_map[ny][nx] in GARDEN_PLOTS:
+                    neighbors[encode_coord(x, y, width)].append(encode_coord(nx, ny, width))
 
-    return len(reachable_in_64)
+    return neighbors
 
 
-@aoc_output_formatter(YEAR, DAY, 2, PART_TWO_DESCRIPTION, assert_answer=PART_TWO_ANSWER)
-def part_two(stuff):
-    start_x, start_y = _get_start(stuff)
-    start_x += 1
-    # start_x, start_y = 65 + 66, 65 + 65
-
-    size_y = len(stuff)
-    size_x = len(stuff[0])
-    print(f"{size_x=}, {size_y=}")
-
-    def _neighs(tcoord):
-        tx, ty = tcoord
-        for nx, ny in [
-            (tx - 1, ty),
-            (tx + 1, ty),
-            (tx, ty - 1),
-            (tx, ty + 1),
-        ]:
-            try:
-                if stuff[ny % size_y][nx % size_x] in ".S":
-                    yield nx, ny
-            except IndexError:
-                pass
-
-    # # for size in [6, 10, 50, 100, 500]:
-    # # for size in [67]:  # right up against the edge
-    for size in [65]:
-        # for size in [197]:
-        q: List[Tuple[Tuple[int, int], int]] = [((start_x, start_y), 0)]
-        visited = set()
-
-        reachable_in_64 = set()
-
-        while q:
-            coord, steps = q.pop(0)
-            visited.add((coord, steps))
-
-            if steps == size:
-                reachable_in_64.add(coord)
-                continue
+def _distance_counts(neighbors: list[list[int]], source: int) -> Counter[int]:
+    """Returns how many garden plots are at each distance from the specified position."""
+    result = bfs([source], neighbors.__getitem__)
+    return Counter(result.distances.values())
 
-            for neigh in _neighs(coord):
-                if (neigh, steps + 1) in visited:
-                    continue
-                visited.add((neigh, steps + 1))
-                q.append((neigh, steps + 1))
-
-        print("\n---------\n\n")
-        print(len(reachable_in_64))
-        for y in range(start_y - 65, start_y + 65 + 1):
-            for x in range(start_x - 65, start_x + 65 + 1):
-                if (x, y) == (start_x, start_y):
-                    print("S", end="")
-                elif (x, y) in reachable_in_64:
-                    print("O", end="")
-                else:
-                    char = stuff[y % size_y][x % size_x]
-                    if char == "#":
-                        char = "█"
-                    if char in "S.":
-                        char = " "
-                    print(char, end="")
-            print()
-
-    # # size = 26501365
-    # size = 130
-    size = 65
-
-    # # for size 65, correct answer 3874
-
-    upper_bound = (2 * ((size // 2) + 1)) ** 2
-    print(f"{upper_bound=}")
-
-    # # There's 11 spaces in the interior which would be reachable in an odd number
-    # # of steps, except that it's surrounded by walls. So we count that even though
-    # # it won't have a rock on it itself.
-    subtrs = 1
-
-    for x in range(start_x - size, start_x + size + 1, 2):
-        if stuff[start_y % size_y][x % size_x] == "#":
-            subtrs += 1
-
-    print(f"{len(reachable_in_64)=}")
-    # print(f"start is at {start_x}, {start_y}")
-
-    # going down
-    for y in range(1, size + 1):
-        # print(f"x range is {start_x - size + y} to {start_x + size + 1 - y}")
-        for x in range(start_x - size + y, start_x + size + 1 - y, 2):
-            # if num_rows_shown <= 30:
-            # print(f"checking {x}, {(start_y + y)}")
-            # num_rows_shown += 1
-            if stuff[(start_y + y) % size_y][x % size_x] == "#":
-                subtrs += 1
-
-    # going up
-    for y in range(1, size + 1):
-        for x in range(start_x - size + y, start_x + size + 1 - y, 2):
-            if stuff[(start_y - y) % size_y][x % size_x] == "#":
-                subtrs += 1
-
-    print(f"{subtrs=}")
-    return upper_bound - subtrs
-
-    # -------------------------------------
-    # diamond big repeating diamond
-    # substrs_overall = 4170
-    # 5 of diamond A, 4 of diamond B
-    #
-    # # diamond A on odd rows
-    substrs_a_center = 482
-    substrs_a_off = 452
-    #
-    # which means there are 1760 substrs in the 4 diamond Bs
-    # so 440 in each of diamond B
-    #
-    # diamond B on even rows
-    substrs_b_a = 464
-    substrs_b_off = 476  # ?
-    # -------------------------------------
-
-    f = """
-                aa
-              ba  bb
-            aa  ab  aa
-          ba  bb  ba  bb
-        aa  ab  aa  ab  aa
-      ba  bb  ba  bb  ba  bb
-    aa  ab  aa  ab  aa  ab  aa
-      bb  ba  bb  ba  bb  ba
-        aa  ab  aa  ab  aa
-          bb  ba  bb  ba
-            aa  ab  aa
-              bb  ba
-                aa
+
+def _count_with_parity(distance_counts: Counter[int], steps: int) -> int:
+    """Returns how many plots are reachable in exactly the specified number of steps, given how
+    many plots are at each distance.
+
+    A plot is reachable in exactly that many steps if it's reachable in at most that many, and
+    its distance has the same parity as the steps, since the elf can spend any spare steps
+    walking back and forth between two plots.
+    """
+    return sum(
+        count
+        for distance, count in distance_counts.items()
+        if distance <= steps and distance % 2 == steps % 2
+    )
+
+
+class InfiniteGarden:
+    """A garden map which repeats infinitely in every direction, which can count the plots
+    reachable in a number of steps far too large to actually walk.
+
+    This relies on the shape of the puzzle input: the map is square with an odd size, the start
+    is in the exact center, and the start's row and column, and the map's edges, are all garden
+    plots. With those clear paths, the quickest way into any other copy of the map is straight
+    to the nearest point on its edge (the middle of the edge for copies directly in line with
+    the start, a corner for the others), and then on from there within that copy. So the
+    distance from the start to any plot is the distance to the point it enters its copy from,
+    which grows by the map's size per copy, plus the plot's distance from that point within a
+    single copy of the map.
+
+    A breadth-first search from the start and from each of those entry points, within one copy
+    of the map, is all that's needed. Then for each plot, the copies where it's reachable with
+    the right parity are counted with a little arithmetic rather than visiting them.
     """
-    assert f
-
-    # each diamond is 131 wide
-
-    # return (((26501365 - 65) // 131) * 2) + 1
-    # 404601 diamonds across the center row
-
-    size = 26501365
-    upper_bound = (2 * ((size // 2) + 1)) ** 2
-
-    # center row
-    dia_count = 404601
-    upper_bound -= substrs_a_center
-    upper_bound -= ((dia_count - 1) // 2) * substrs_a_off
-    upper_bound -= ((dia_count - 1) // 2) * substrs_a_center
-
-    while dia_count > 1:
-        dia_count -= 1
-        # if dia_count % 1000 == 0:
-        #     print(f"{dia_count=}")
-
-        if dia_count % 2 == 1:
-            for _ in range(2):
-                upper_bound -= substrs_a_center
-                upper_bound -= ((dia_count - 1) // 2) * substrs_a_off
-                upper_bound -= ((dia_count - 1) // 2) * substrs_a_center
-            continue
-
-        else:
-            for _ in range(2):
-                upper_bound -= ((dia_count) // 2) * substrs_b_a
-                upper_bound -= ((dia_count) // 2) * substrs_b_off
-
-    return upper_bound
-    # # -------------------------------------
-    # #
-    # size = 26501365
-    # subtrs = 4170
-    # upper_bound = (2 * ((size // 2) + 1)) ** 2
-    # return upper_bound - ((134867**2) * subtrs)
-    # #
-    # # -------------------------------------
-
-    # this is all bad, ignore me below
-
-    # # -------------------------------------
-    # #
-    # size = 26501365
-    # subtrs = 4170
-    # upper_bound = (2 * ((size // 2) + 1)) ** 2
-    # return upper_bound - ((202300**2) * subtrs)
-    # #
-    # # -------------------------------------
-
-    # subtrs is 4170 for the large repeating diamond
-    # return upper_bound - subtrs
-    # return 26501365 % size_x ---> 65
-    # return 26501365 // 65 ----> 407713
-
-    # return 26501365 // 195
 
+    def __init__(self, garden_map: list[str]) -> None:
+        self.size = len(garden_map)
+        start_x, start_y = _get_start(garden_map)
+
+        middle = self.size // 2
+        is_plot = [[char in GARDEN_PLOTS for char in line] for line in garden_map]
+        clear_paths = (
+            is_plot[0],
+            is_plot[-1],
+            is_plot[middle],
+            [row[0] for row in is_plot],
+            [row[-1] for row in is_plot],
+            [row[middle] for row in is_plot],
+        )
+        if (
+            self.size % 2 == 0
+            or any(len(row) != self.size for row in is_plot)
+            or (start_x, start_y) != (middle, middle)
+            or not all(all(path) for path in clear_paths)
+        ):
+            raise ValueError(
+                "The infinite garden can only be counted for a square map with an odd size, "
+                "with the start in the center, and clear paths along the edges and through the "
+                "start"
+            )
+
+        self._neighbors = _get_plot_neighbors(garden_map)
+
+        last = self.size - 1
+        self.start_distances = self._distance_counts(middle, middle)
+
+        # Copies of the map directly in line with the start are entered from the middle of the
+        # edge facing the start, 1 step past the end of the clear path out of the start's copy.
+        self.edge_distances = [
+            self._distance_counts(x, y)
+            for x, y in ((0, middle), (last, middle), (middle, 0), (middle, last))
+        ]
+        self.edge_entry_distance = middle + 1
+
+        # All other copies are entered from the corner nearest the start, 1 step past the
+        # corner of the copy next to them which is in line with the start.
+        self.corner_distances = [
+            self._distance_counts(x, y) for x, y in ((0, 0), (last, 0), (0, last), (last, last))
+        ]
+        self.corner_entry_distance = 2 * (middle + 1)
+
+    def _distance_counts(self, x: int, y: int) -> Counter[int]:
+        """Returns how many plots in a single copy of the map are at each distance from the
+        specified position, without leaving that copy of the map.
+        """
+        return _distance_counts(self._neighbors, encode_coord(x, y, self.size))
+
+    def _copies_reachable(self, steps_left: int) -> tuple[int, int]:
+        """Returns the number of copies k >= 0 further out from the nearest copy, which a plot
+        with the specified number of steps left over when reaching it in that nearest copy can
+        be reached in with the right parity. Also returns the sum of (k + 1) over those copies,
+        since k + 1 diagonal copies are each k copies further out from the nearest one.
+        """
+        if steps_left < 0:
+            return 0, 0
+
+        # Reaching the plot k copies further out takes k * size more steps, and since the size
+        # is odd, the parity is right whenever k has the same parity as the steps left.
+        furthest = steps_left // self.size
+        parity = steps_left % 2
+        if furthest < parity:
+            return 0, 0
+
+        count = (furthest - parity) // 2 + 1
+        return count, count * (parity + 1) + count * (count - 1)
+
+    def reachable_in(self, steps: int) -> int:
+        """Returns the number of garden plots reachable in exactly the specified number of
+        steps.
+        """
+        total = _count_with_parity(self.start_distances, steps)
+
+        for distance_counts in self.edge_distances:
+            for distance, count in distance_counts.items():
+                copies, _ = self._copies_reachable(steps - self.edge_entry_distance - distance)
+                total += copies * count
+
+        for distance_counts in self.corner_distances:
+            for distance, count in distance_counts.items():
+                _, copies = self._copies_reachable(
+                    steps - self.corner_entry_distance - distance
+                )
+                total += copies * count
+
+        return total
 
-# ----------------------------------------------------------------------------------------------
 
+@aoc_output_formatter(YEAR, DAY, 1, PART_ONE_DESCRIPTION, assert_answer=PART_ONE_ANSWER)
+def part_one(garden_map: list[str]) -> int | str | None:
+    start_x, start_y = _get_start(garden_map)
+    start = encode_coord(start_x, start_y, len(garden_map[0]))
+
+    distance_counts = _distance_counts(_get_plot_neighbors(garden_map), start)
+    return _count_with_parity(distance_counts, PART_ONE_STEPS)
 
-def run(input_file):
-    stuff = get_input(input_file)
-    part_one(stuff)
 
-    stuff = get_input(input_file)
+@aoc_output_formatter(YEAR, DAY, 2, PART_TWO_DESCRIPTION, assert_answer=PART_TWO_ANSWER)
+def part_two(garden_map: list[str]) -> int | str | None:
+    return InfiniteGarden(garden_map).reachable_in(PART_TWO_STEPS)
 
-    # not 531663940565956, too low
-    # not 625302928475236, too low
-    # not 683350879212724, too high
-    # not 626437442587448
-    # not 626473820802826
 
-    # maybe 683351441877848
+# ----------------------------------------------------------------------------------------------
 
-    # maybe 683360536296826 ** prefer this one with 4170 subtrs,
-    # still not sure if (26501365) // 393 == 67433 is the right count for num large diamonds across
 
-    # 626855792064274, not right
-    # 624809517449274, not right
-    # 624891368433874, not right, what the hell
-    # 625628021226274 *****
+def run(input_file: str) -> None:
+    garden_map = get_input(input_file)
 
-    part_two(stuff)
+    part_one(garden_map)
+    part_two(garden_map)
@@ -1,209 +1,282 @@
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
 from util.decorators import aoc_output_formatter
 from util.input import get_input
 
-from math import inf
-
 DAY = 23
 YEAR = 2023
 
-PART_ONE_DESCRIPTION = ""
+PART_ONE_DESCRIPTION = "longest hike down the icy slopes"
 PART_ONE_ANSWER = None
 
-PART_TWO_DESCRIPTION = ""
+PART_TWO_DESCRIPTION = "longest hike, climbing the slopes as if they were dry"
 PART_TWO_ANSWER = None
 
 
-NEGATIVE_INFINITY = inf * -1
-
-
-def _find_junctions(maze):
-    junctions = set()
-
-    sx = 0
-    while True:
-        if maze[(sx, 0)] == ".":
-            # print(f"found start at {(sx, 0)}, calling it a junction")
-            junctions.add((sx, 0))
-            break
-        else:
-            sx += 1
-
-    ex = 0
-    maxy = max(y for _, y in maze.keys())
-    while True:
-        if maze[(ex, maxy)] == ".":
-            # print(f"found end at {(ex, maxy)}, calling it a junction")
-            junctions.add((ex, maxy))
-            break
-        else:
-            ex += 1
-
-    for coord, char in maze.items():
-        if char != ".":
-            continue
-
-        cx, cy = coord
-        neighs = list()
-        for dx, dy in (
-            (1, 0),
-            (-1, 0),
-            (0, 1),
-            (0, -1),
-        ):
-            nx, ny = cx + dx, cy + dy
-            if (nx, ny) in maze and maze[(nx, ny)] in ".<>^v":
-                neighs.append((nx, ny))
-        if len(neighs) > 2:
-            neighs_repr = "".join([maze[n] for n in neighs])
-            # print(f"{coord} is a junction with these neighbors: {neighs_repr}")
-            junctions.add(coord)
+DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
 
-    return junctions
+# The only direction a hiker can step off each kind of icy slope
+SLOPES = {">": (1, 0), "<": (-1, 0), "v": (0, 1), "^": (0, -1)}
 
+# How many junctions deep the hikes are followed before the rest of each one is handed off to a
+# worker process
+FAN_OUT_DEPTH = 6
 
-def _get_start_end(maze):
-    start = None
-    end = None
-
-    sx = 0
-    while True:
-        if maze[(sx, 0)] == ".":
-            # print(f"found start at {(sx, 0)}, calling it a junction")
-            start = (sx, 0)
-            break
-        else:
-            sx += 1
-
-    ex = 0
-    maxy = max(y for _, y in maze.keys())
-    while True:
-        if maze[(ex, maxy)] == ".":
-            # print(f"found end at {(ex, maxy)}, calling it a junction")
-            end = (ex, maxy)
-            break
-        else:
-            ex += 1
-
-    return start, end
-
-
-def _walk_junctions_get_edge_weights(maze):
-    junctions = _find_junctions(maze)
-    edge_weights = defaultdict(list)
-
-    for junction in junctions:
-        # print(f"\nWalking {junction}")
-        jx, jy = junction
-        for dx, dy in (
-            (1, 0),
-            (-1, 0),
-            (0, 1),
-            (0, -1),
-        ):
-            nx, ny = jx + dx, jy + dy
-            if (nx, ny) in maze and maze[(nx, ny)] in ".^<>v":
-                # if dx == -1 and maze[(nx, ny)] == ">":
-                #     continue
-                # if dx == 1 and maze[(nx, ny)] == "<":
-                #     continue
-                # if dy == -1 and maze[(nx, ny)] == "v":
-                #     continue
-                # if dy == 1 and maze[(nx, ny)] == "^":
-                #     continue
-
-                visited = set()
-                visited.add((jx, jy))
-                visited.add((nx, ny))
-                steps = 1
-
-                while True:
-                    found_jn = False
-                    neighs = list()
-                    for dx, dy in (
-                        (1, 0),
-                        (-1, 0),
-                        (0, 1),
-                        (0, -1),
-                    ):
-                        nnx, nny = nx + dx, ny + dy
-                        # print(f"looking at {(nnx, nny)}")
-                        if (nnx, nny) not in visited and maze[(nnx, nny)] in ".<>^v":
-                            if (nnx, nny) in junctions:
-                                # print(
-                                #     f"{steps+1} steps between {(jx, jy)} and {(nnx, nny)}"
-                                # )
-                                edge_weights[(jx, jy)].append(((nnx, nny), steps + 1))
-                                found_jn = True
-                                break
-                            else:
-                                neighs.append((nnx, nny))
-
-                    if found_jn:
-                        break
-
-                    if len(neighs) == 1:
-                        nx, ny = neighs[0]
-                        visited.add((nx, ny))
-                        steps += 1
-
-    return edge_weights
-
-
-def _get_path_lengths(jn, edge_weights, target, visited):
-    # print(f"at {jn} having already visited {visited}")
-    path_lengths = []
-
-    for next_jn, weight in edge_weights[jn]:
-        if next_jn == target:
-            path_lengths.append(weight)
-            continue
-
-        if next_jn in visited:
-            continue
-
-        v_copy = {x for x in visited}
-        v_copy.add(next_jn)
-        for remaining_path_len in _get_path_lengths(
-            next_jn, edge_weights, target, v_copy
-        ):
-            path_lengths.append(weight + remaining_path_len)
-
-    return [] if not path_lengths else [max(path_lengths)]
-    return [max(path_lengths)]
+# The (neighbor, steps) trails leading out of each junction, indexed by junction id
+type JunctionGraph = tuple[tuple[tuple[int, int], ...], ...]
 
+# The trails leading out of each junction, ready for searching, as tuples of the neighbor's id,
+# the neighbor's bit in a bitmask of junctions, the steps, and the neighbor's potential
+type SearchTrails = tuple[tuple[tuple[int, int, int, int], ...], ...]
 
-@aoc_output_formatter(YEAR, DAY, 1, PART_ONE_DESCRIPTION, assert_answer=PART_ONE_ANSWER)
-def part_one(stuff):
-    maze = defaultdict(lambda: "#")
-    for y, row in enumerate(stuff):
+# A hike which hasn't reached the target yet, as its junction, a bitmask of the junctions it has
+# visited, its length so far, and its potential
+type PartialHike = tuple[int, int, int, int]
+
+
+def _is_open(trail_map: list[str], x: int, y: int) -> bool:
+    """Returns whether the specified position is on the map and isn't forest."""
+    return 0 <= y < len(trail_map) and 0 <= x < len(trail_map[y]) and trail_map[y][x] != "#"
+
+
+def _find_junctions(trail_map: list[str]) -> list[tuple[int, int]]:
+    """Returns the (x, y) coordinates of the start, every spot where the trail branches, and
+    the exit, in reading order. The start is the only path tile in the top row and the exit is
+    the only path tile in the bottom row, so they're the first and last junctions.
+    """
+    junctions = list()
+    last_row = len(trail_map) - 1
+
+    for y, row in enumerate(trail_map):
         for x, char in enumerate(row):
-            maze[x, y] = char
+            if char != ".":
+                continue
 
-    start, end = _get_start_end(maze)
-    edge_weights = _walk_junctions_get_edge_weights(maze)
-    from pprint import pprint
+            open_neighbors = sum(_is_open(trail_map, x + dx, y + dy) for dx, dy in DIRECTIONS)
+            if y in (0, last_row) or open_neighbors > 2:
+                junctions.append((x, y))
+
+    return junctions
 
-    # print(start)
-    # print(end)
-    # pprint(edge_weights)
 
-    path_lengths = _get_path_lengths(start, edge_weights, end, set())
-    # print(path_lengths)
-    return max(path_lengths)
+def _walk_trail(trail_map, junction_ids, junction, first_step, respect_slopes):
+    """Follows the trail from a junction, starting with a step to `first_step`, until it
+    reaches another junction. Returns that junction's id and the number of steps taken, or None
+    if the trail is a dead end or a slope turns the hiker back.
+    """
+    previous, (x, y) = junction, first_step
+    steps = 1
+
+    while (x, y) not in junction_ids:
+        char = trail_map[y][x]
+        directions = (SLOPES[char],) if respect_slopes and char in SLOPES else DIRECTIONS
+
+        next_steps = [
+            (x + dx, y + dy)
+            for dx, dy in directions
+            if (x + dx, y + dy) != previous and _is_open(trail_map, x + dx, y + dy)
+        ]
+        if len(next_steps) != 1:
+            return None
+
+        previous, (x, y) = (x, y), next_steps[0]
+        steps += 1
+
+    return junction_ids[(x, y)], steps
+
+
+def _build_junction_graph(trail_map: list[str], respect_slopes: bool) -> JunctionGraph:
+    """Returns the graph of the trails between junctions, where junctions are numbered in
+    reading order, so the start is 0 and the exit is the last. When respecting slopes, a trail
+    only leads from one junction to another if the slopes along it allow it.
+    """
+    junctions = _find_junctions(trail_map)
+    junction_ids = {junction: i for i, junction in enumerate(junctions)}
+
+    graph = list()
+    for x, y in junctions:
+        trails = list()
+        for dx, dy in DIRECTIONS:
+            if not _is_open(trail_map, x + dx, y + dy):
+                continue
+
+            trail = _walk_trail(
+                trail_map, junction_ids, (x, y), (x + dx, y + dy), respect_slopes
+            )
+            if trail is not None:
+                trails.append(trail)
+
+        graph.append(tuple(trails))
+
+    return tuple(graph)
+
+
+def _longest_hike_from(
+    trails: SearchTrails, target: int, floor: int, partial_hike: PartialHike
+) -> int:
+    """Returns the length of the longest hike to the target junction which continues on from a
+    partial hike, if it's longer than `floor`, or otherwise just `floor`.
+
+    A hike's potential is the sum, over every junction it hasn't visited yet, of the longest
+    trail leading to that junction. Each further trail ends at a different unvisited junction,
+    so the hike can't get longer than its length plus its potential, and it's abandoned as soon
+    as that can't beat the longest hike found so far.
+
+    When a hike gets past that check, its potential is tightened to only count the unvisited
+    junctions it can still reach, which also abandons it right away if the target is out of
+    reach.
+    """
+    potentials = [0] * len(trails)
+    neighbor_masks = [0] * len(trails)
+    for junction, junction_trails in enumerate(trails):
+        for neighbor, bit, _, neighbor_potential in junction_trails:
+            potentials[neighbor] = neighbor_potential
+            neighbor_masks[junction] |= bit
+
+    target_bit = 1 << target
+    best = floor
+
+    def _reachable_potential(junction, visited):
+        """Returns the sum of the potentials of the unvisited junctions reachable from the
+        specified junction, or -1 if the target isn't one of them."""
+        reached = visited
+        frontier = neighbor_masks[junction] & ~visited
+        potential = 0
+
+        while frontier:
+            bit = frontier & -frontier
+            frontier ^= bit
+            reached |= bit
+
+            neighbor = bit.bit_length() - 1
+            potential += potentials[neighbor]
+            frontier |= neighbor_masks[neighbor] & ~reached
+
+        return potential if reached & target_bit else -1
+
+    def _search(junction, visited, length, potential):
+        nonlocal best
+
+        if junction == target:
+            if length > best:
+                best = length
+            return
+
+        if length + potential <= best:
+            return
+
+        reachable_potential = _reachable_potential(junction, visited)
+        if reachable_potential < 0 or length + reachable_potential <= best:
+            return
+
+        for neighbor, bit, steps, neighbor_potential in trails[junction]:
+            if not visited & bit:
+                _search(neighbor, visited | bit, length + steps, potential - neighbor_potential)
+
+    _search(*partial_hike)
+    return best
+
+
+def _longest_hike(graph: JunctionGraph) -> int:
+    """Returns the length of the longest hike from the start junction to the exit junction
+    which never visits a junction twice.
+
+    Every hike is followed a few junctions out from the start, and the rest of each of those
+    partial hikes is searched in a pool of worker processes. The most promising partial hike is
+    searched first, so the workers all start off knowing a long hike to beat.
+    """
+    start, exit_junction = 0, len(graph) - 1
+
+    # Only one junction leads to the exit, so a hike which reaches it has to head straight to
+    # the exit, since going anywhere else means it could never get back to it. So search for
+    # the longest hike to that junction instead, and add on the last trail afterwards.
+    entrances: dict[int, int] = dict()
+    for junction, junction_trails in enumerate(graph):
+        for neighbor, steps in junction_trails:
+            if neighbor == exit_junction:
+                entrances[junction] = max(entrances.get(junction, 0), steps)
+
+    if len(entrances) == 1:
+        ((target, last_trail),) = entrances.items()
+    else:
+        target, last_trail = exit_junction, 0
+
+    potentials = [0] * len(graph)
+    for junction_trails in graph:
+        for neighbor, steps in junction_trails:
+            if neighbor != exit_junction or target == exit_junction:
+                potentials[neighbor] = max(potentials[neighbor], steps)
+
+    trails = tuple(
+        tuple(
+            (neighbor, 1 << neighbor, steps, potentials[neighbor])
+            for neighbor, steps in junction_trails
+            if neighbor != exit_junction or target == exit_junction
+        )
+        for junction_trails in graph
+    )
+
+    # Follow every hike a few junctions out from the start, keeping the partial hikes to search
+    # the rest of in parallel.
+    partial_hikes = [(start, 1 << start, 0, sum(potentials) - potentials[start])]
+    best = -1
+    for _ in range(FAN_OUT_DEPTH):
+        next_partial_hikes = list()
+        for junction, visited, length, potential in partial_hikes:
+            if junction == target:
+                best = max(best, length)
+                continue
+
+            for neighbor, bit, steps, neighbor_potential in trails[junction]:
+                if not visited & bit:
+                    next_partial_hikes.append(
+                        (
+                            neighbor,
+                            visited | bit,
+                            length + steps,
+                            potential - neighbor_potential,
+                        )
+                    )
+
+        partial_hikes = next_partial_hikes
+
+    if partial_hikes:
+        partial_hikes.sort(key=lambda hike: hike[2] + hike[3], reverse=True)
+        best = _longest_hike_from(trails, target, best, partial_hikes[0])
+
+        with ProcessPoolExecutor() as executor:
+            lengths = executor.map(
+                _longest_hike_from,
+                repeat(trails),
+                repeat(target),
+                repeat(best),
+                partial_hikes[1:],
+                chunksize=max(1, len(partial_hikes) // 64),
+            )
+            best = max([best, *lengths])
+
+    if best < 0:
+        raise ValueError("There's no hike from the start to the exit")
+
+    return best + last_trail
+
+
+@aoc_output_formatter(YEAR, DAY, 1, PART_ONE_DESCRIPTION, assert_answer=PART_ONE_ANSWER)
+def part_one(trail_map: list[str]) -> int | str | None:
+    return _longest_hike(_build_junction_graph(trail_map, respect_slopes=True))
 
 
 @aoc_output_formatter(YEAR, DAY, 2, PART_TWO_DESCRIPTION, assert_answer=PART_TWO_ANSWER)
-def part_two(stuff):
-    pass
+def part_two(trail_map: list[str]) -> int | str | None:
+    return _longest_hike(_build_junction_graph(trail_map, respect_slopes=False))
 
 
 # ----------------------------------------------------------------------------------------------
 
 
-def run(input_file):
-    stuff = get_input(input_file)
-    part_one(stuff)
+def run(input_file: str) -> None:
+    trail_map = get_input(input_file)
 
-    stuff = get_input(input_file)
-    part_two(stuff)
+    part_one(trail_map)
+    part_two(trail_map)
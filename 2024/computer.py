@@ -1,5 +1,26 @@
+from collections.abc import Callable, Iterable
 from types import NoneType
 
+# The names of the registers, in the order their values are stored in
+REGISTER_NAMES = ("A", "B", "C")
+
+# The variable (or literal) which each combo operand reads, in generated code
+COMBO_OPERAND_CODE = ("0", "1", "2", "3", "a", "b", "c")
+
+# Templates of the code generated for each opcode, with `{literal}` and `{combo}` standing in
+# for the instruction's operand. Dividing by a power of two is a right shift, and taking the
+# value modulo 8 is masking its lowest 3 bits.
+OPCODE_CODE = (
+    "a >>= {combo}",  # ADV
+    "b ^= {literal}",  # BXL
+    "b = {combo} & 7",  # BST
+    None,  # JNZ, which is generated separately
+    "b ^= c",  # BXC
+    "output.append({combo} & 7)",  # OUT
+    "b = a >> {combo}",  # BDV
+    "c = a >> {combo}",  # CDV
+)
+
 
 class Computer:
     """A computer than can execute arbitrary pseudo-assembly programs.
@@ -16,6 +37,8 @@ class Computer:
     OPCODE_BDV = 6  # 6, <combo operand>
     OPCODE_CDV = 7  # 7, <combo operand>
 
+    __slots__ = ("instruction_ptr", "instructions", "output", "program", "register_values")
+
     def __init__(
         self,
         program: list[int],
@@ -23,103 +46,228 @@ class Computer:
     ) -> None:
         """Initialize an Intcode computer.
 
-        Sets the instruction pointer to address 0, and establishes some maps defining which
-        action to take for any given opcode.
+        Sets the instruction pointer to address 0, and decodes the instruction starting at
+        every address of the program up front, so that executing it doesn't need to.
         """
         self.instruction_ptr = 0
         self.program = program
 
-        self.registers = (
-            initial_registers.copy()
-            if initial_registers is not None
-            else {
-                "A": 0,
-                "B": 0,
-                "C": 0,
-            }
-        )
+        initial_registers = initial_registers or dict()
+        self.register_values = [initial_registers.get(name, 0) for name in REGISTER_NAMES]
 
         self.output: list[int] = []
 
-        self.opcode_map = {
-            Computer.OPCODE_ADV: self._enact_adv,
-            Computer.OPCODE_BXL: self._enact_bxl,
-            Computer.OPCODE_BST: self._enact_bst,
-            Computer.OPCODE_JNZ: self._enact_jnz,
-            Computer.OPCODE_BXC: self._enact_bxc,
-            Computer.OPCODE_OUT: self._enact_out,
-            Computer.OPCODE_BDV: self._enact_bdv,
-            Computer.OPCODE_CDV: self._enact_cdv,
-        }
+        opcode_map = (
+            self._enact_adv,
+            self._enact_bxl,
+            self._enact_bst,
+            self._enact_jnz,
+            self._enact_bxc,
+            self._enact_out,
+            self._enact_bdv,
+            self._enact_cdv,
+        )
+        self.instructions = [
+            (opcode_map[self.program[ip]], *self._get_opcode_and_operand(ip))
+            for ip in range(len(self.program) - 1)
+        ]
+
+    @property
+    def registers(self) -> dict[str, int]:
+        """Returns the current value of each register, by name."""
+        return dict(zip(REGISTER_NAMES, self.register_values, strict=True))
 
     def execute(self) -> list[int]:
         """Execute the provided program with the specified input."""
 
         while self.instruction_ptr < len(self.program):
-            # Retrieve the next opcode and param modes, and execute that instruction.
-            opcode, param_value = self._get_opcode_and_operand()
+            enact, opcode, literal, register = self.instructions[self.instruction_ptr]
+            operand = literal if register is None else self.register_values[register]
 
             prior_ip = self.instruction_ptr
-            self.opcode_map[opcode](param_value)
+            enact(operand)
             later_ip = self.instruction_ptr
 
             # If the instruction just executed modified the instruction pointer directly,
-            # skip advancing the instruction pointer
-            if opcode != 3 or prior_ip == later_ip:  # noqa: PLR2004
+            # skip advancing the instruction pointer. A jump to its own address doesn't modify
+            # it, so execution carries on with the next instruction, as if it wasn't taken.
+            if opcode != Computer.OPCODE_JNZ or prior_ip == later_ip:
                 self.instruction_ptr += 2
 
         return self.output
 
-    def _get_opcode_and_operand(self) -> tuple[int, int | None]:
-        """Parse the opcode and operand based on the instruction pointer's current value."""
+    def _get_opcode_and_operand(self, ip: int) -> tuple[int, int | None, int | None]:
+        """Parse the opcode and operand of the instruction at the specified address.
+
+        Returns the opcode, and either the literal value of the operand, or the index of the
+        register whose value the operand represents.
+        """
 
-        opcode = self.program[self.instruction_ptr]
-        param = self.program[self.instruction_ptr + 1]
+        opcode = self.program[ip]
+        param = self.program[ip + 1]
 
         # Opcode 4 ignores the operand
         if opcode == 4:  # noqa: PLR2004
-            return opcode, None
+            return opcode, None, None
 
         # Operands to opcodes 1, 3 are literal operands
         if opcode in {1, 3}:
-            return opcode, param
+            return opcode, param, None
 
         # Operands to opcodes 0, 2, 5, 6, 7 are combo operands
 
         # Combo operands 0 through 3 represent literal values 0 through 3.
         if param in {0, 1, 2, 3}:
-            return opcode, param
+            return opcode, param, None
 
         # Combo operand 4 represents the value of register A.
         # Combo operand 5 represents the value of register B.
         # Combo operand 6 represents the value of register C.
-        return opcode, {
-            4: self.registers["A"],
-            5: self.registers["B"],
-            6: self.registers["C"],
-        }[param]
+        # Combo operand 7 is reserved, and can't appear in a valid program.
+        if param == 7:  # noqa: PLR2004
+            return opcode, None, None
+        return opcode, None, param - 4
 
     def _enact_adv(self, operand: int) -> None:
-        self.registers["A"] = self.registers["A"] // (2**operand)
+        self.register_values[0] >>= operand
 
     def _enact_bdv(self, operand: int) -> None:
-        self.registers["B"] = self.registers["A"] // (2**operand)
+        self.register_values[1] = self.register_values[0] >> operand
 
     def _enact_cdv(self, operand: int) -> None:
-        self.registers["C"] = self.registers["A"] // (2**operand)
+        self.register_values[2] = self.register_values[0] >> operand
 
     def _enact_bxl(self, operand: int) -> None:
-        self.registers["B"] = self.registers["B"] ^ operand
+        self.register_values[1] ^= operand
 
     def _enact_bst(self, operand: int) -> None:
-        self.registers["B"] = operand % 8
+        self.register_values[1] = operand & 7
 
     def _enact_out(self, operand: int) -> None:
-        self.output.append(operand % 8)
+        self.output.append(operand & 7)
 
     def _enact_jnz(self, operand: int) -> None:
-        if self.registers["A"] != 0:
+        if self.register_values[0] != 0:
             self.instruction_ptr = operand
 
     def _enact_bxc(self, _: NoneType) -> None:
-        self.registers["B"] = self.registers["B"] ^ self.registers["C"]
+        self.register_values[1] ^= self.register_values[2]
+
+
+class CompiledProgram:
+    """A program translated into a single Python function specialized to it, so that it can be
+    run many times over with different starting registers far faster than by `Computer`.
+
+    The registers are plain local variables of the generated function, every operand is
+    decoded ahead of time into the literal or register it reads, and straight runs of
+    instructions execute without any dispatch between them. Jumps go back through a chain of
+    checks on the instruction pointer, with the program's start checked first, since that's
+    where almost every program loops back to.
+
+    It gives the same output as `Computer` for every program, including one with a jump to its
+    own address, which both carry on past. Registers must start non-negative, which is all the
+    puzzle ever uses.
+    """
+
+    def __init__(self, program: list[int]) -> None:
+        self.program = program
+        self.source = self._generate_source()
+
+        namespace: dict = dict()
+        exec(compile(self.source, "<compiled 2024 program>", "exec"), namespace)
+        self._run: Callable[[int, int, int], list[int]] = namespace["_program"]
+
+    def _instruction_code(self, ip: int) -> list[str]:
+        """Returns the lines of code which execute the instruction at the specified address,
+        indented to sit within the generated function's dispatch loop.
+        """
+        opcode, param = self.program[ip], self.program[ip + 1]
+
+        if opcode == Computer.OPCODE_JNZ:
+            # Just like in `Computer`, a jump to its own address carries on with the next
+            # instruction, as if it wasn't taken
+            if param == ip:
+                return ["pass"]
+            return ["if a:", f"    ip = {param}", "    continue"]
+
+        uses_combo = opcode in {0, 2, 5, 6, 7}
+        if uses_combo and param == 7:  # noqa: PLR2004
+            return ['raise ValueError("Combo operand 7 is reserved")']
+
+        template = OPCODE_CODE[opcode]
+        combo = COMBO_OPERAND_CODE[param] if uses_combo else None
+        return [template.format(literal=param, combo=combo)]
+
+    def _generate_source(self) -> str:
+        """Returns the source of a function `_program(a, b, c)` which runs the program with
+        those starting registers, and returns its output.
+
+        There's an entry point for the start of the program, and for every address that an
+        instruction reachable from it can jump to. Each one runs every instruction from that
+        address to the end of the program, unless a jump is taken first.
+        """
+        entries = {0}
+        pending = [0]
+        while pending:
+            for ip in range(pending.pop(), len(self.program) - 1, 2):
+                if self.program[ip] != Computer.OPCODE_JNZ:
+                    continue
+                target = self.program[ip + 1]
+                if target != ip and target not in entries:
+                    entries.add(target)
+                    pending.append(target)
+
+        lines = ["def _program(a, b, c):", "    output = []", "    ip = 0", "    while True:"]
+        for entry in sorted(entries):
+            lines.append(f"        if ip == {entry}:")
+            for ip in range(entry, len(self.program) - 1, 2):
+                lines.extend(f"            {line}" for line in self._instruction_code(ip))
+            lines.append("            return output")
+
+        # Every jump lands on one of the entry points above, so this is never reached
+        lines.append("        return output")
+        return "\n".join(lines) + "\n"
+
+    def run(self, a: int, b: int = 0, c: int = 0) -> list[int]:
+        """Runs the program with the specified starting registers, and returns its output."""
+        return self._run(a, b, c)
+
+    def run_many(self, a_values: Iterable[int], b: int = 0, c: int = 0) -> list[list[int]]:
+        """Runs the program once for each of the specified starting values of register A, with
+        registers B and C starting at the same values each time, and returns each output.
+        """
+        run = self._run
+        return [run(a, b, c) for a in a_values]
+
+
+def find_octal_inputs(
+    program: list[int],
+    target: list[int] | None = None,
+    *,
+    b: int = 0,
+    c: int = 0,
+) -> list[int]:
+    """Returns, in ascending order, every starting value of register A for which the program
+    outputs the target (by default, the program itself).
+
+    This only works for programs shaped like the puzzle's: a single loop which outputs one value
+    and shifts A right by 3 bits each time around, until A is 0. Each output then depends only
+    on A's octal digits from that point upwards, so the last output is decided by A's highest
+    digit alone. A is built up from its highest digit down, keeping only the candidates whose
+    output matches the tail end of the target so far, and checking all 8 choices for the next
+    digit of every surviving candidate in one batch.
+    """
+    target = program if target is None else target
+    compiled = CompiledProgram(program)
+
+    candidates = [0]
+    for digits in range(1, len(target) + 1):
+        expected = target[-digits:]
+        extended = [(candidate << 3) | digit for candidate in candidates for digit in range(8)]
+        candidates = [
+            a
+            for a, output in zip(extended, compiled.run_many(extended, b, c), strict=True)
+            if output == expected
+        ]
+
+    return sorted(candidates)
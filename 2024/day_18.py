@@ -1,9 +1,9 @@
-from heapq import heappop, heappush
+from bisect import bisect_left
 
 from util.algs import manhattan_distance
 from util.decorators import aoc_output_formatter
 from util.input import get_input
-from util.iter import int_stream
+from util.search import astar
 
 DAY = 18
 YEAR = 2024
@@ -32,84 +32,54 @@ def _neighbors(coord, grid):
     return neighbors
 
 
-@aoc_output_formatter(YEAR, DAY, 1, PART_ONE_DESCRIPTION, assert_answer=PART_ONE_ANSWER)
-def part_one(raw_input: list[str]) -> int | str | None:
+def _build_grid(raw_input: list[str], num_bytes: int) -> dict[tuple[int, int], str]:
+    """Returns the memory grid after the specified number of bytes have fallen into it."""
     grid = {(x, y): "." for x in range(X_SIZE) for y in range(Y_SIZE)}
 
-    for line in raw_input[:1024]:
+    for line in raw_input[:num_bytes]:
         x, y = (int(n) for n in line.split(","))
         grid[(x, y)] = "#"
 
-    start = (0, 0)
-    end = (X_SIZE - 1, Y_SIZE - 1)
-
-    # state is (steps_so_far, manhattan_distance_to_end, curr_position)
-
-    queue = []
-    heappush(queue, (0, manhattan_distance(start, end), start))
+    return grid
 
-    visited = set()
 
-    while queue:
-        steps, _, curr_pos = heappop(queue)
-        if curr_pos in visited:
-            continue
+def _shortest_path_length(grid: dict[tuple[int, int], str]) -> int | None:
+    """Returns the fewest steps from the top left to the bottom right of the grid, or None if
+    the bottom right can't be reached."""
+    start = (0, 0)
+    end = (X_SIZE - 1, Y_SIZE - 1)
 
-        visited.add(curr_pos)
+    result = astar(
+        [start],
+        lambda coord: ((neighbor, 1) for neighbor in _neighbors(coord, grid)),
+        lambda coord: manhattan_distance(coord, end),
+        is_target=lambda coord: coord == end,
+    )
+    return result.target_distance
 
-        if curr_pos == end:
-            return steps
 
-        for neighbor in _neighbors(curr_pos, grid):
-            if neighbor in visited:
-                continue
-            heappush(queue, (steps + 1, manhattan_distance(neighbor, end), neighbor))
+@aoc_output_formatter(YEAR, DAY, 1, PART_ONE_DESCRIPTION, assert_answer=PART_ONE_ANSWER)
+def part_one(raw_input: list[str]) -> int | str | None:
+    steps = _shortest_path_length(_build_grid(raw_input, 1024))
+    if steps is None:
+        raise ValueError("No path found")
 
-    raise ValueError("No path found")
+    return steps
 
 
 @aoc_output_formatter(YEAR, DAY, 2, PART_TWO_DESCRIPTION, assert_answer=PART_TWO_ANSWER)
 def part_two(raw_input: list[str]) -> int | str | None:
-    og_grid = {(x, y): "." for x in range(X_SIZE) for y in range(Y_SIZE)}
-
-    for limit in int_stream(1000):
-        grid = og_grid.copy()
-
-        for line in raw_input[:limit]:
-            x, y = (int(n) for n in line.split(","))
-            grid[(x, y)] = "#"
-
-        start = (0, 0)
-        end = (X_SIZE - 1, Y_SIZE - 1)
-
-        # state is (steps_so_far, manhattan_distance_to_end, curr_position)
-
-        queue = []
-        heappush(queue, (0, manhattan_distance(start, end), start))
-
-        visited = set()
-
-        did_find = False
-        while queue:
-            steps, _, curr_pos = heappop(queue)
-            if curr_pos in visited:
-                continue
-
-            visited.add(curr_pos)
-
-            if curr_pos == end:
-                did_find = True
-                break
-
-            for neighbor in _neighbors(curr_pos, grid):
-                if neighbor in visited:
-                    continue
-                heappush(queue, (steps + 1, manhattan_distance(neighbor, end), neighbor))
-
-        if not did_find:
-            return raw_input[:limit][-1]
-
-    raise ValueError("No answer found")
+    # Once the exit is cut off by some number of fallen bytes, it stays cut off as more fall, so
+    # binary search for the fewest bytes which cut it off.
+    limit = bisect_left(
+        range(len(raw_input) + 1),
+        True,
+        key=lambda limit: _shortest_path_length(_build_grid(raw_input, limit)) is None,
+    )
+    if limit > len(raw_input):
+        raise ValueError("No answer found")
+
+    return raw_input[limit - 1]
 
 
 def run(input_file: str) -> None:
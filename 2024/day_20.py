@@ -2,6 +2,7 @@ from collections import defaultdict
 
 from util.decorators import aoc_output_formatter
 from util.input import get_input
+from util.search import bfs
 
 DAY = 20
 YEAR = 2024
@@ -35,37 +36,22 @@ def _parse_maze(raw_input: list[str]) -> dict[tuple[int, int], str]:
     return maze
 
 
+def _distances_along_track(maze, start, end):
+    """Returns the distance from the start to each coordinate on the track up to the end."""
+
+    result = bfs([start], lambda coord: _neighbors(coord, maze), is_target=lambda c: c == end)
+    assert result.target is not None
+
+    return result.distances
+
+
 @aoc_output_formatter(YEAR, DAY, 1, PART_ONE_DESCRIPTION, assert_answer=PART_ONE_ANSWER)
 def part_one(raw_input: list[str]) -> int | str | None:
     maze = _parse_maze(raw_input)
     start = next(coord for coord, char in maze.items() if char == "S")
     end = next(coord for coord, char in maze.items() if char == "E")
 
-    best_cost = None
-    distance_to_coord = dict()
-
-    # queue state is (cost, coord)
-    queue = [(0, start)]
-    visited = set()
-
-    while queue:
-        cost, coord = queue.pop(0)
-
-        if coord in visited:
-            continue
-        visited.add(coord)
-        distance_to_coord[coord] = cost
-
-        if coord == end:
-            best_cost = cost
-            break
-
-        for neighbor in _neighbors(coord, maze):
-            if neighbor in visited:
-                continue
-            queue.append((cost + 1, neighbor))
-
-    assert best_cost is not None
+    distance_to_coord = _distances_along_track(maze, start, end)
     # print(f"Best cost: {best_cost}")
 
     cheat_starts = set()
@@ -164,31 +150,7 @@ def part_two(raw_input: list[str]) -> int | str | None:
     start = next(coord for coord, char in maze.items() if char == "S")
     end = next(coord for coord, char in maze.items() if char == "E")
 
-    best_cost = None
-    distance_to_coord = dict()
-
-    # queue state is (cost, coord)
-    queue = [(0, start)]
-    visited = set()
-
-    while queue:
-        cost, coord = queue.pop(0)
-
-        if coord in visited:
-            continue
-        visited.add(coord)
-        distance_to_coord[coord] = cost
-
-        if coord == end:
-            best_cost = cost
-            break
-
-        for neighbor in _neighbors(coord, maze):
-            if neighbor in visited:
-                continue
-            queue.append((cost + 1, neighbor))
-
-    assert best_cost is not None
+    distance_to_coord = _distances_along_track(maze, start, end)
     # print(f"Best cost: {best_cost}")
 
     cheat_starts = set()
@@ -1,20 +1,33 @@
 import importlib
+import io
 import os
 import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 
 from util.decorators import aocTimer
+from util.timings import UNKNOWN_COMMIT, find_regressions, get_commit, get_latest_timings
 
 # ----------------------------------------------------------------------------------------------
 
 __INPUT_PATH = "{year}/inputs/input_day{day}.txt"
 __MODULE_NAME = "{year}.day_{day}"
 
+# Default percentage slowdown beyond which `bench --compare` flags a part as a regression
+__DEFAULT_REGRESSION_THRESHOLD = 10
+
 # ----------------------------------------------------------------------------------------------
 
 
 def __invalid_usage():
     """Displays a message to the user that they are invoking the script incorrectly."""
     print("\nInvalid usage -- python aoc.py [year] [day]\nex: python aoc.py 2015 1")
+    print("\nor -- python aoc.py all [--jobs N]\nex: python aoc.py all --jobs 8")
+    print(
+        "\nor -- python aoc.py bench --compare [ref] [--threshold PCT] [--jobs N]"
+        "\nex: python aoc.py bench --compare main --threshold 15",
+    )
 
 
 def __get_year_and_day_from_input():
@@ -83,6 +96,147 @@ def __run_all():
     print("\n******** Finished running all completed Advent of Code problems! ********")
 
 
+def __get_option_from_input(flag, transform=str, default=None):
+    """Returns the value following the specified flag on the command line, transformed by the
+    provided function, or the default if the flag wasn't provided.
+    """
+    if flag not in sys.argv:
+        return default
+
+    try:
+        return transform(sys.argv[sys.argv.index(flag) + 1])
+    except (IndexError, ValueError):
+        __invalid_usage()
+        sys.exit(0)
+
+
+def __get_jobs_from_input():
+    """Returns the number of worker processes requested via `--jobs N`, or None if the flag
+    wasn't provided.
+    """
+    jobs = __get_option_from_input("--jobs", int)
+    if jobs is not None and jobs < 1:
+        __invalid_usage()
+        sys.exit(0)
+
+    return jobs
+
+
+def __get_day_timings():
+    """Returns the most recently recorded runtime (in seconds) of each day, summed across its
+    parts, keyed by (year, day).
+    """
+    timings = dict()
+    for (year, day, _), record in get_latest_timings().items():
+        timings[(year, day)] = timings.get((year, day), 0) + record["wall_ns"] / 1e9
+    return timings
+
+
+def __run_day_captured(year, day):
+    """Runs the solution for the specified year and day in a worker process, capturing all of
+    its output. Returns everything it printed as a single string, including the traceback if it
+    failed.
+    """
+    module, input_file = __get_module_and_input_path(year=year, day=day)
+
+    output = io.StringIO()
+    with redirect_stdout(output):
+        try:
+            importlib.import_module(module).run(input_file)
+        except Exception:
+            print(f"\n** {year} day {day} failed **\n{traceback.format_exc()}")
+
+    return output.getvalue()
+
+
+@aocTimer()
+def __run_all_parallel(jobs):
+    """Runs all solutions for every year across a pool of worker processes, printing each
+    day's captured output in year/day order.
+
+    Days are submitted slowest-first according to previously recorded runtimes (days without a
+    recorded runtime are assumed slow), so the total wall-clock time approaches that of the
+    slowest single day rather than the sum of all of them.
+    """
+    timings = __get_day_timings()
+
+    all_days = [
+        (year, day) for year in __get_all_years() for day in __get_all_days_for_year(year)
+    ]
+    schedule = sorted(all_days, key=lambda year_day: -timings.get(year_day, float("inf")))
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            year_day: executor.submit(__run_day_captured, *year_day) for year_day in schedule
+        }
+
+        # Print results in order as soon as they're available, waiting on each day in turn
+        current_year = None
+        for year, day in all_days:
+            output = futures[(year, day)].result()
+
+            if year != current_year:
+                current_year = year
+                print(f"\n============\n    {year}    \n============")
+            print(output, end="")
+
+    print("\n******** Finished running all completed Advent of Code problems! ********")
+
+
+def __bench():
+    """Runs all solutions, recording their runtimes at the current commit, then reports every
+    part which got more than the threshold percentage slower than it was at the ref supplied
+    via `--compare`.
+
+    The baseline timings must already have been recorded by running the solutions with that
+    ref checked out, and no uncommitted changes.
+    """
+    ref = __get_option_from_input("--compare")
+    threshold = __get_option_from_input(
+        "--threshold",
+        float,
+        default=__DEFAULT_REGRESSION_THRESHOLD,
+    )
+    if ref is None:
+        __invalid_usage()
+        sys.exit(0)
+
+    baseline_commit = get_commit(ref)
+    if baseline_commit == UNKNOWN_COMMIT:
+        print(f"\nUnable to resolve git ref {ref}")
+        sys.exit(1)
+
+    if not get_latest_timings(baseline_commit, include_dirty=False):
+        print(
+            f"\nNo timings of the committed code at {ref} ({baseline_commit[:8]}) are recorded."
+            f"\nCheck it out with a clean working tree and run the solutions first.",
+        )
+        sys.exit(1)
+
+    jobs = __get_jobs_from_input()
+    if jobs is None:
+        __run_all()
+    else:
+        __run_all_parallel(jobs)
+
+    current_commit = get_commit()
+    regressions = find_regressions(baseline_commit, current_commit, threshold)
+
+    print(
+        f"\n==== Parts more than {threshold}% slower than at {ref} ({baseline_commit[:8]}) ===="
+    )
+    for (year, day, part), before, after in regressions:
+        before_ms, after_ms = before["wall_ns"] / 1e6, after["wall_ns"] / 1e6
+        slowdown = (after["wall_ns"] / before["wall_ns"] - 1) * 100
+        print(
+            f"{year} day {day} part {part}: {before_ms:.2f} ms -> {after_ms:.2f} ms "
+            f"(+{slowdown:.1f}%)",
+        )
+
+    if not regressions:
+        print("No regressions found.")
+
+
 def __create_year(year):
     if not os.path.exists(year):
         print(f"Creating directory for year {year}")
@@ -119,8 +273,15 @@ def __create_year(year):
 # ----------------------------------------------------------------------------------------------
 
 if __name__ == "__main__":
-    if "all" in sys.argv:
-        __run_all()
+    if "bench" in sys.argv:
+        __bench()
+
+    elif "all" in sys.argv:
+        jobs = __get_jobs_from_input()
+        if jobs is None:
+            __run_all()
+        else:
+            __run_all_parallel(jobs)
 
     elif sys.argv[1] == "create":
         year = sys.argv[2]
@@ -0,0 +1,161 @@
+"""Module providing a generic cellular automaton engine for 2D grids, backed by NumPy."""
+
+from collections.abc import Callable, Iterable
+
+import numpy as np
+
+# Offsets (dx, dy) to each of a cell's 8 neighbors
+NEIGHBOR_OFFSETS = [(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if (dx, dy) != (0, 0)]
+
+# A rule takes the current cells and the neighbor counts of each counted state, and returns the
+# cells at the next generation
+type Rule = Callable[[np.ndarray, dict[int, np.ndarray]], np.ndarray]
+
+
+def grid_from_rows(rows: Iterable[Iterable[str]], states: str) -> np.ndarray:
+    """Returns a 2D array (indexed [y, x]) built from rows of characters, where each cell holds
+    the index of its character in `states`.
+
+    Ex.
+    ".#."                 [[0, 1, 0],
+    "##."  --(".#")-->     [1, 1, 0]]
+    """
+    lookup = {char: i for i, char in enumerate(states)}
+    return np.array([[lookup[char] for char in row] for row in rows], dtype=np.int8)
+
+
+def _build_line_of_sight(visible_cells: np.ndarray) -> list[np.ndarray]:
+    """Returns, for each neighbor direction, an array holding the flat index of the first
+    visible cell seen from each cell when looking in that direction, or -1 if none is.
+    """
+    height, width = visible_cells.shape
+    flat_indices = np.arange(height * width).reshape(height, width)
+
+    sight_lines = []
+    for dx, dy in NEIGHBOR_OFFSETS:
+        seen = np.full((height, width), -1)
+
+        # Fill in the cells closest to the edge we're looking towards first, so each cell can
+        # use its neighbor's result if that neighbor isn't visible itself.
+        if dy != 0:
+            rows = range(height - 2, -1, -1) if dy > 0 else range(1, height)
+            x_from, x_to = max(0, -dx), width - max(0, dx)
+            for y in rows:
+                neighbor = (slice(x_from + dx, x_to + dx),)
+                visible = visible_cells[y + dy][neighbor]
+                seen[y, x_from:x_to] = np.where(
+                    visible,
+                    flat_indices[y + dy][neighbor],
+                    seen[y + dy][neighbor],
+                )
+        else:
+            columns = range(width - 2, -1, -1) if dx > 0 else range(1, width)
+            for x in columns:
+                visible = visible_cells[:, x + dx]
+                seen[:, x] = np.where(visible, flat_indices[:, x + dx], seen[:, x + dx])
+
+        sight_lines.append(seen.ravel())
+
+    return sight_lines
+
+
+class Automaton:
+    """A cellular automaton over a 2D grid of integer cell states.
+
+    Each generation, the neighbors of every cell which are in any of the `counted_states` are
+    counted all at once with shifted-array sums, and the rule computes the next generation's
+    cells from the current cells and those counts.
+
+    If `transparent_state` is provided, a cell's neighbors are instead the first cells in each
+    of the 8 directions which aren't in that state (ex: seats visible across the floor). The
+    transparent cells must never change state.
+    """
+
+    def __init__(
+        self,
+        cells: np.ndarray,
+        rule: Rule,
+        *,
+        counted_states: Iterable[int],
+        transparent_state: int | None = None,
+    ) -> None:
+        self.cells = cells
+        self.rule = rule
+        self.counted_states = list(counted_states)
+        self.generation = 0
+
+        self.sight_lines = None
+        if transparent_state is not None:
+            self.sight_lines = _build_line_of_sight(cells != transparent_state)
+
+    def neighbor_counts(self) -> dict[int, np.ndarray]:
+        """Returns the count of each cell's neighbors in each of the counted states."""
+        height, width = self.cells.shape
+        counts = dict()
+
+        for state in self.counted_states:
+            in_state = (self.cells == state).astype(np.int8)
+
+            if self.sight_lines is None:
+                padded = np.pad(in_state, 1)
+                counts[state] = sum(
+                    padded[1 + dy : 1 + dy + height, 1 + dx : 1 + dx + width]
+                    for dx, dy in NEIGHBOR_OFFSETS
+                )
+
+            else:
+                # Append a 0, so the -1 index of directions with nothing visible counts nothing
+                flat = np.append(in_state.ravel(), 0)
+                counts[state] = sum(flat[seen] for seen in self.sight_lines).reshape(
+                    height,
+                    width,
+                )
+
+        return counts
+
+    def step(self) -> bool:
+        """Advances the automaton one generation. Returns whether any cells changed."""
+        new_cells = self.rule(self.cells, self.neighbor_counts())
+        changed = not np.array_equal(new_cells, self.cells)
+
+        self.cells = new_cells
+        self.generation += 1
+        return changed
+
+    def run(self, generations: int) -> None:
+        """Advances the automaton the specified number of generations."""
+        for _ in range(generations):
+            self.step()
+
+    def run_until_stable(self) -> int:
+        """Advances the automaton until a generation doesn't change any cells. Returns the
+        generation at which it stabilized.
+        """
+        while self.step():
+            pass
+        return self.generation
+
+    def advance_to(self, generation: int) -> None:
+        """Advances the automaton to the specified generation.
+
+        The state at every generation along the way is remembered, so once the automaton enters
+        a cycle, it skips ahead by whole cycles and only simulates the remainder.
+        """
+        seen_at = {self.cells.tobytes(): self.generation}
+
+        while self.generation < generation:
+            self.step()
+
+            key = self.cells.tobytes()
+            if key in seen_at:
+                cycle_length = self.generation - seen_at[key]
+                remaining = (generation - self.generation) % cycle_length
+                self.generation = generation - remaining
+                self.run(remaining)
+                return
+
+            seen_at[key] = self.generation
+
+    def count(self, state: int) -> int:
+        """Returns the number of cells in the specified state."""
+        return int(np.count_nonzero(self.cells == state))
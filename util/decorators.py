@@ -1,6 +1,8 @@
 from contextlib import ContextDecorator
 from datetime import timedelta
-from time import time
+from time import perf_counter_ns, process_time_ns
+
+from util.timings import get_peak_rss_kb, record_timing, reset_peak_rss
 
 AOC_OUTPUT_HEADER = "\nAdvent of Code {year} - Day {day}, part {part}"
 
@@ -24,6 +26,8 @@ def aoc_output_formatter(
     The user can optionally choose to ignore the decorated function's return value, which is
     useful if the problem solution is output by some othermeans (like being printed to console),
     not returned by the function.
+
+    Every successful run's timing is recorded to the runtime history, keyed by year/day/part.
     """
 
     header = AOC_OUTPUT_HEADER.format(year=year, day=day, part=part)
@@ -35,7 +39,7 @@ def aoc_output_formatter(
         above.
         """
 
-        @aocTimer()
+        @aocTimer(record_as=(year, day, part))
         def __fn_wrapper(*args, **kwargs):
             """The decorated function, which is timed using the timer context manager class
             defined below.
@@ -66,14 +70,33 @@ def aoc_output_formatter(
 class aocTimer(ContextDecorator):
     """Records the runtime of the decorated function, and prints out a user-friendly
     representation of the elapsed time.
+
+    If `record_as` is a (year, day, part) tuple, the wall time, CPU time, and peak RSS (where
+    the platform can measure it for just this run) of each run which completes without raising
+    is also appended to the runtime history.
     """
 
-    def __enter__(self):
-        self.start = time()
+    def __init__(self, record_as=None):
+        self.record_as = record_as
 
-    def __exit__(self, *args):
-        elapsed = time() - self.start
-        delta = timedelta(seconds=elapsed)
+    def __enter__(self):
+        self.measures_rss = self.record_as is not None and reset_peak_rss()
+        self.start_cpu = process_time_ns()
+        self.start = perf_counter_ns()
+
+    def __exit__(self, exc_type, *args):
+        elapsed_ns = perf_counter_ns() - self.start
+        elapsed_cpu_ns = process_time_ns() - self.start_cpu
+
+        if self.record_as is not None and exc_type is None:
+            record_timing(
+                *self.record_as,
+                wall_ns=elapsed_ns,
+                cpu_ns=elapsed_cpu_ns,
+                peak_rss_kb=get_peak_rss_kb() if self.measures_rss else None,
+            )
+
+        delta = timedelta(microseconds=elapsed_ns / 1000)
 
         seconds = delta.seconds
         millis = delta.microseconds / 1000
@@ -0,0 +1,148 @@
+"""Module providing a dictionary-based grid which knows its own bounds."""
+
+from itertools import product
+
+type Coord = tuple[int, int]
+
+# Offsets (dx, dy) to each of a cell's neighbors, ordered by dx and then dy
+ORTHOGONAL_OFFSETS = ((-1, 0), (0, -1), (0, 1), (1, 0))
+ALL_NEIGHBOR_OFFSETS = tuple((dx, dy) for dx, dy in product((-1, 0, 1), repeat=2) if dx or dy)
+
+
+class DictGrid(dict):
+    """A dictionary of (x, y) coordinates to the element at that coordinate, which also records
+    the grid's bounding box so it never needs to be recomputed from the keys.
+
+    The bounding box grows as new coordinates are added, but isn't shrunk when coordinates are
+    removed (unless the grid is cleared). Each coordinate's neighbors within the grid are looked
+    up from a table which is built once on first use, and rebuilt only if coordinates are added
+    or removed afterwards. Every dict method which adds or removes keys keeps both up to date,
+    and copying or merging a DictGrid returns a DictGrid.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._neighbor_tables: dict[bool, dict[Coord, tuple[Coord, ...]]] = dict()
+
+        self.min_x = self.min_y = self.max_x = self.max_y = None
+        for coord in self:
+            self._include(coord)
+
+    def __reduce__(self):
+        # Rebuild from a plain dict when unpickled, so the bounds are recomputed
+        return DictGrid, (dict(self),)
+
+    def _include(self, coord: Coord) -> None:
+        """Grows the bounding box, if necessary, to include the specified coordinate."""
+        x, y = coord
+        if self.min_x is None:
+            self.min_x, self.max_x, self.min_y, self.max_y = x, x, y, y
+            return
+
+        self.min_x, self.max_x = min(self.min_x, x), max(self.max_x, x)
+        self.min_y, self.max_y = min(self.min_y, y), max(self.max_y, y)
+
+    def __setitem__(self, coord: Coord, element) -> None:
+        if coord not in self:
+            self._include(coord)
+            self._neighbor_tables.clear()
+        super().__setitem__(coord, element)
+
+    def __delitem__(self, coord: Coord) -> None:
+        super().__delitem__(coord)
+        self._neighbor_tables.clear()
+
+    def setdefault(self, coord: Coord, default=None):
+        if coord not in self:
+            self[coord] = default
+        return self[coord]
+
+    def update(self, *args, **kwargs) -> None:
+        for coord, element in dict(*args, **kwargs).items():
+            self[coord] = element
+
+    def pop(self, coord: Coord, *default):
+        if coord in self:
+            self._neighbor_tables.clear()
+        return super().pop(coord, *default)
+
+    def popitem(self) -> tuple[Coord, object]:
+        item = super().popitem()
+        self._neighbor_tables.clear()
+        return item
+
+    def clear(self) -> None:
+        super().clear()
+        self._neighbor_tables.clear()
+        self.min_x = self.min_y = self.max_x = self.max_y = None
+
+    def copy(self) -> "DictGrid":
+        return DictGrid(self)
+
+    def __ior__(self, other) -> "DictGrid":
+        self.update(other)
+        return self
+
+    def __or__(self, other) -> "DictGrid":
+        if not isinstance(other, dict):
+            return NotImplemented
+        grid = self.copy()
+        grid.update(other)
+        return grid
+
+    def __ror__(self, other) -> "DictGrid":
+        if not isinstance(other, dict):
+            return NotImplemented
+        grid = DictGrid(other)
+        grid.update(self)
+        return grid
+
+    @property
+    def width(self) -> int:
+        return 0 if self.min_x is None else self.max_x - self.min_x + 1
+
+    @property
+    def height(self) -> int:
+        return 0 if self.min_y is None else self.max_y - self.min_y + 1
+
+    def in_bounds(self, coord: Coord) -> bool:
+        """Returns whether the specified coordinate is within the grid's bounding box."""
+        if self.min_x is None:
+            return False
+
+        x, y = coord
+        return self.min_x <= x <= self.max_x and self.min_y <= y <= self.max_y
+
+    def neighbor_table(
+        self, *, include_diagonals: bool = True
+    ) -> dict[Coord, tuple[Coord, ...]]:
+        """Returns a dictionary of each coordinate in the grid to the coordinates of its
+        neighbors which are also in the grid, including diagonals unless `include_diagonals` is
+        False.
+        """
+        table = self._neighbor_tables.get(include_diagonals)
+        if table is None:
+            offsets = ALL_NEIGHBOR_OFFSETS if include_diagonals else ORTHOGONAL_OFFSETS
+            table = {
+                (x, y): tuple(
+                    (x + dx, y + dy) for dx, dy in offsets if (x + dx, y + dy) in self
+                )
+                for x, y in self
+            }
+            self._neighbor_tables[include_diagonals] = table
+
+        return table
+
+    def neighbors(self, coord: Coord, *, include_diagonals: bool = True) -> tuple[Coord, ...]:
+        """Returns the coordinates of the neighbors of the specified coordinate which are in the
+        grid, including diagonals unless `include_diagonals` is False. The coordinate itself
+        doesn't need to be in the grid.
+        """
+        neighbors = self.neighbor_table(include_diagonals=include_diagonals).get(coord)
+        if neighbors is not None:
+            return neighbors
+
+        # Only coordinates in the grid are in the table, so look up any others directly
+        x, y = coord
+        offsets = ALL_NEIGHBOR_OFFSETS if include_diagonals else ORTHOGONAL_OFFSETS
+        return tuple((x + dx, y + dy) for dx, dy in offsets if (x + dx, y + dy) in self)
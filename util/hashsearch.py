@@ -0,0 +1,170 @@
+"""Module providing parallel searches over the MD5 hashes of a prefix followed by an increasing
+index, for the hash-mining puzzles.
+"""
+
+import os
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import closing
+from hashlib import md5
+from itertools import count
+
+# How many indices each worker checks at a time when searching for nonces
+NONCE_BLOCK_SIZE = 20_000
+
+# How many indices each worker hashes at a time when producing stretched hashes
+STRETCHED_BLOCK_SIZE = 500
+
+
+def _scan_for_nonces(prefix: bytes, start: int, end: int, zero_nibbles: int) -> list:
+    """Returns a list of (index, hex digest) for every index in [start, end) for which the MD5
+    hash of the prefix followed by that index starts with `zero_nibbles` hex zeroes.
+    """
+    # Hash the prefix once and copy that midstate for each index, and check the raw digest bytes
+    # so only the rare matches are ever converted to hex.
+    midstate = md5(prefix)
+    zero_bytes = bytes(zero_nibbles // 2)
+    check_half_byte = zero_nibbles % 2 == 1
+    half_byte_index = zero_nibbles // 2
+
+    found = list()
+    for index in range(start, end):
+        hasher = midstate.copy()
+        hasher.update(b"%d" % index)
+        digest = hasher.digest()
+
+        if not digest.startswith(zero_bytes):
+            continue
+        if check_half_byte and digest[half_byte_index] >= 0x10:
+            continue
+
+        found.append((index, digest.hex()))
+
+    return found
+
+
+def _stretched_hashes(prefix: bytes, start: int, end: int, rounds: int) -> list[str]:
+    """Returns the hex MD5 hash of the prefix followed by each index in [start, end), where each
+    hash has been rehashed `rounds` more times from its own hex digest.
+    """
+    midstate = md5(prefix)
+
+    hashes = list()
+    for index in range(start, end):
+        hasher = midstate.copy()
+        hasher.update(b"%d" % index)
+        hash = hasher.hexdigest().encode()
+
+        for _ in range(rounds):
+            hash = md5(hash).hexdigest().encode()
+
+        hashes.append(hash.decode())
+
+    return hashes
+
+
+def _ordered_blocks(
+    worker: Callable[..., list],
+    prefix: bytes,
+    extra: tuple,
+    start: int,
+    block_size: int,
+    jobs: int | None,
+) -> Iterator[list]:
+    """Returns a generator yielding `worker(prefix, block_start, block_end, *extra)` for each
+    consecutive block of indices beginning at `start`, in order.
+
+    The blocks are spread across a pool of `jobs` worker processes (every CPU, by default), with
+    a few blocks queued up behind the one being waited on so no worker sits idle. The pool is
+    shut down once the caller stops consuming the generator: queued blocks are cancelled, and
+    it waits for the blocks already being hashed to finish, so no worker outlives the search.
+    """
+    block_starts = count(start, block_size)
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        for block_start in block_starts:
+            yield worker(prefix, block_start, block_start + block_size, *extra)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        in_flight: deque[Future] = deque()
+        for block_start in block_starts:
+            in_flight.append(
+                executor.submit(worker, prefix, block_start, block_start + block_size, *extra)
+            )
+            if len(in_flight) >= 2 * jobs:
+                yield in_flight.popleft().result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def find_nonces(
+    prefix: str,
+    zero_nibbles: int,
+    *,
+    start: int = 0,
+    jobs: int | None = None,
+) -> Iterator[tuple[int, str]]:
+    """Returns a generator yielding (index, hex digest) for each index, lowest first, for which
+    the MD5 hash of `{prefix}{index}` starts with `zero_nibbles` zeroes.
+
+    Ex.
+    find_nonces("abcdef", 5)  -->  (609043, "000001dbbfa3a5c83a2d506429c7b00e"), ...
+    """
+    blocks = _ordered_blocks(
+        _scan_for_nonces,
+        prefix.encode(),
+        (zero_nibbles,),
+        start,
+        NONCE_BLOCK_SIZE,
+        jobs,
+    )
+    with closing(blocks):
+        for block in blocks:
+            yield from block
+
+
+def find_first_nonce(
+    prefix: str,
+    zero_nibbles: int,
+    *,
+    start: int = 0,
+    jobs: int | None = None,
+) -> int:
+    """Returns the lowest index for which the MD5 hash of `{prefix}{index}` starts with
+    `zero_nibbles` zeroes.
+    """
+    nonces = find_nonces(prefix, zero_nibbles, start=start, jobs=jobs)
+    try:
+        index, _ = next(nonces)
+    finally:
+        nonces.close()
+
+    return index
+
+
+def stretched_hashes(
+    prefix: str,
+    rounds: int = 0,
+    *,
+    start: int = 0,
+    jobs: int | None = None,
+) -> Iterator[str]:
+    """Returns a generator yielding the hex MD5 hash of `{prefix}{index}` for each index in
+    order, where each hash has been rehashed `rounds` more times from its own hex digest.
+    """
+    block_size = STRETCHED_BLOCK_SIZE if rounds else NONCE_BLOCK_SIZE
+    blocks = _ordered_blocks(
+        _stretched_hashes,
+        prefix.encode(),
+        (rounds,),
+        start,
+        block_size,
+        jobs,
+    )
+    with closing(blocks):
+        for block in blocks:
+            yield from block
@@ -1,18 +1,20 @@
 from pathlib import Path
 
+from util.grid import DictGrid
+
 
 def get_input(input_file: str) -> list[str]:
     """Return the contents of the specified file path."""
     return [line.replace("\n", "") for line in Path(input_file).open()]
 
 
-def get_input_grid_map(input_file):
+def get_input_grid_map(input_file) -> DictGrid:
     """Returns grid-based input from the specified file path, as a dictionary of (x, y)
-    coordinates to the element at that coordinate.
+    coordinates to the element at that coordinate which also knows the grid's bounds.
     """
     raw_lines = get_input(input_file)
 
-    input_map = dict()
+    input_map = DictGrid()
     for y, line in enumerate(raw_lines):
         for x, element in enumerate(line):
             input_map[(x, y)] = element
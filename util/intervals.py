@@ -0,0 +1,214 @@
+"""Module providing sets of integers stored as ranges, and maps which shift ranges of integers,
+so that huge ranges can be manipulated without visiting every integer in them.
+
+Every interval here is half-open, [start, end), so an interval's size is just `end - start`.
+"""
+
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
+from itertools import pairwise
+
+type Interval = tuple[int, int]
+
+
+def _merge(intervals: Iterable[Interval]) -> list[Interval]:
+    """Returns the provided intervals sorted, with empty ones dropped, and with overlapping or
+    adjacent ones merged together.
+    """
+    merged: list[Interval] = list()
+    for start, end in sorted(i for i in intervals if i[0] < i[1]):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+
+    return merged
+
+
+class IntervalSet:
+    """An immutable set of integers, stored as a sorted list of disjoint intervals.
+
+    Ex.
+    IntervalSet([(5, 8), (0, 3), (2, 4)])  -->  {0, 1, 2, 3, 5, 6, 7}  -->  [(0, 4), (5, 8)]
+    """
+
+    __slots__ = ("intervals",)
+
+    def __init__(self, intervals: Iterable[Interval] = ()) -> None:
+        self.intervals: tuple[Interval, ...] = tuple(_merge(intervals))
+
+    @classmethod
+    def from_inclusive(cls, ranges: Iterable[tuple[int, int]]) -> "IntervalSet":
+        """Returns the set of integers covered by ranges which include both of their endpoints,
+        as puzzle inputs usually describe them.
+        """
+        return cls((start, end + 1) for start, end in ranges)
+
+    def __iter__(self) -> Iterator[Interval]:
+        return iter(self.intervals)
+
+    def __bool__(self) -> bool:
+        return bool(self.intervals)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, IntervalSet) and self.intervals == other.intervals
+
+    def __hash__(self) -> int:
+        return hash(self.intervals)
+
+    def __repr__(self) -> str:
+        return f"IntervalSet({list(self.intervals)})"
+
+    def __contains__(self, value: int) -> bool:
+        i = bisect_right(self.intervals, (value, float("inf"))) - 1
+        return i >= 0 and self.intervals[i][0] <= value < self.intervals[i][1]
+
+    @property
+    def size(self) -> int:
+        """Returns the number of integers in the set."""
+        return sum(end - start for start, end in self.intervals)
+
+    @property
+    def min(self) -> int:
+        """Returns the lowest integer in the set."""
+        if not self.intervals:
+            raise ValueError("An empty IntervalSet has no minimum")
+        return self.intervals[0][0]
+
+    @property
+    def max(self) -> int:
+        """Returns the highest integer in the set."""
+        if not self.intervals:
+            raise ValueError("An empty IntervalSet has no maximum")
+        return self.intervals[-1][1] - 1
+
+    def __or__(self, other: "IntervalSet") -> "IntervalSet":
+        return IntervalSet(self.intervals + other.intervals)
+
+    def __and__(self, other: "IntervalSet") -> "IntervalSet":
+        # Walk both sorted lists together, keeping the overlap of each pair of intervals which
+        # overlap at all, and advancing whichever interval ends first.
+        overlaps = list()
+        i = j = 0
+        while i < len(self.intervals) and j < len(other.intervals):
+            (a_start, a_end), (b_start, b_end) = self.intervals[i], other.intervals[j]
+
+            start, end = max(a_start, b_start), min(a_end, b_end)
+            if start < end:
+                overlaps.append((start, end))
+
+            if a_end < b_end:
+                i += 1
+            else:
+                j += 1
+
+        return IntervalSet(overlaps)
+
+    def __sub__(self, other: "IntervalSet") -> "IntervalSet":
+        # Walk both sorted lists together, trimming each of our intervals by every interval of
+        # the other set which overlaps it.
+        remaining = list()
+        j = 0
+        for start, end in self.intervals:
+            while j < len(other.intervals) and other.intervals[j][1] <= start:
+                j += 1
+
+            k = j
+            while k < len(other.intervals) and other.intervals[k][0] < end:
+                cut_start, cut_end = other.intervals[k]
+                if start < cut_start:
+                    remaining.append((start, cut_start))
+                start = max(start, cut_end)
+                k += 1
+
+            if start < end:
+                remaining.append((start, end))
+
+        return IntervalSet(remaining)
+
+
+class OffsetMap:
+    """A map of integers to integers, where each of a set of disjoint source intervals is
+    shifted by its own offset, and every integer outside of those maps to itself.
+
+    Whole intervals are pushed through the map at once, split wherever they cross from one
+    source interval to another, so the work done depends only on the number of intervals and
+    not on their sizes. Maps can be composed into a single map.
+
+    Ex.
+    OffsetMap([(98, 100, -48), (50, 98, 2)])
+        0..49 -> 0..49,  50..97 -> 52..99,  98..99 -> 50..51,  100.. -> 100..
+    """
+
+    __slots__ = ("pieces", "_starts")
+
+    def __init__(self, pieces: Iterable[tuple[int, int, int]] = ()) -> None:
+        # Each piece is (start, end, offset). Pieces with no offset are the same as no piece.
+        self.pieces: tuple[tuple[int, int, int], ...] = tuple(
+            sorted(p for p in pieces if p[0] < p[1] and p[2] != 0)
+        )
+        for (_, end, _), (next_start, _, _) in pairwise(self.pieces):
+            if next_start < end:
+                raise ValueError("The source intervals of an OffsetMap can't overlap")
+
+        self._starts = [start for start, _, _ in self.pieces]
+
+    def __repr__(self) -> str:
+        return f"OffsetMap({list(self.pieces)})"
+
+    def __call__(self, value: int) -> int:
+        i = bisect_right(self._starts, value) - 1
+        if i >= 0 and value < self.pieces[i][1]:
+            return value + self.pieces[i][2]
+        return value
+
+    def _split(self, start: int, end: int) -> Iterator[tuple[int, int, int]]:
+        """A generator which yields (start, end, offset) for each consecutive part of the
+        interval [start, end) which is shifted by a single offset (possibly 0).
+        """
+        i = max(0, bisect_right(self._starts, start) - 1)
+        while start < end:
+            if i >= len(self.pieces):
+                yield start, end, 0
+                return
+
+            piece_start, piece_end, offset = self.pieces[i]
+            if piece_end <= start:
+                i += 1
+            elif start < piece_start:
+                yield start, min(end, piece_start), 0
+                start = piece_start
+            else:
+                yield start, min(end, piece_end), offset
+                start = piece_end
+                i += 1
+
+    def map_intervals(self, values: IntervalSet) -> IntervalSet:
+        """Returns the set of integers that the provided set of integers maps to."""
+        return IntervalSet(
+            (part_start + offset, part_end + offset)
+            for start, end in values
+            for part_start, part_end, offset in self._split(start, end)
+        )
+
+    def then(self, other: "OffsetMap") -> "OffsetMap":
+        """Returns a single map which is equivalent to mapping through this map, and then
+        mapping the result through the other map.
+        """
+        pieces = list()
+
+        # Wherever this map shifts values, they're then shifted again by whichever parts of the
+        # other map they land in.
+        for start, end, offset in self.pieces:
+            for part_start, part_end, other_offset in other._split(
+                start + offset, end + offset
+            ):
+                pieces.append((part_start - offset, part_end - offset, offset + other_offset))
+
+        # Everywhere else, values pass through this map unchanged, straight to the other map.
+        covered = IntervalSet((start, end) for start, end, _ in self.pieces)
+        for start, end, other_offset in other.pieces:
+            for gap_start, gap_end in IntervalSet([(start, end)]) - covered:
+                pieces.append((gap_start, gap_end, other_offset))
+
+        return OffsetMap(pieces)
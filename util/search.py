@@ -0,0 +1,196 @@
+"""Module providing breadth-first, Dijkstra, and A* searches over graphs of hashable states.
+
+Searches are fastest when states are small integers, so grid-based searches can encode each
+(x, y) coordinate (and anything else the state needs, like a direction) into a single int.
+"""
+
+from collections import deque
+from collections.abc import Callable, Hashable, Iterable
+from dataclasses import dataclass
+from heapq import heappop, heappush
+
+
+@dataclass
+class SearchResult[S: Hashable]:
+    """The outcome of a search.
+
+    `distances` holds the distance to every state the search reached from the nearest source.
+    These are all final for a breadth-first search. For a weighted search which stopped at a
+    target, only the distances of states which were already expanded are guaranteed to be the
+    shortest possible.
+
+    `target` is the first target state reached, or None if the search ran to exhaustion without
+    finding one. `parents` maps each state to the state it was reached from (None for sources),
+    if the search was asked to track them.
+    """
+
+    distances: dict[S, int]
+    target: S | None = None
+    parents: dict[S, S | None] | None = None
+
+    @property
+    def target_distance(self) -> int | None:
+        """Returns the distance to the target state, or None if no target was reached."""
+        return None if self.target is None else self.distances[self.target]
+
+    def path_to(self, state: S) -> list[S]:
+        """Returns the states along the shortest path found from a source to the specified
+        state, starting with the source and ending with the state itself.
+        """
+        if self.parents is None:
+            raise ValueError("Paths are only available when searching with track_parents=True")
+
+        path = list()
+        while state is not None:
+            path.append(state)
+            state = self.parents[state]
+
+        return path[::-1]
+
+
+def encode_coord(x: int, y: int, width: int) -> int:
+    """Returns a single non-negative integer uniquely identifying a coordinate within a grid of
+    the specified width. Coordinates must not be negative.
+    """
+    return y * width + x
+
+
+def decode_coord(state: int, width: int) -> tuple[int, int]:
+    """Returns the (x, y) coordinate encoded by `encode_coord` for a grid of the specified
+    width.
+    """
+    y, x = divmod(state, width)
+    return x, y
+
+
+def bfs[S: Hashable](
+    sources: Iterable[S],
+    neighbors: Callable[[S], Iterable[S]],
+    *,
+    is_target: Callable[[S], bool] | None = None,
+    max_depth: int | None = None,
+    track_parents: bool = False,
+) -> SearchResult[S]:
+    """Performs a breadth-first search outwards from every source state at once, where every
+    step between a state and one of its neighbors costs 1.
+
+    The search stops at the first state for which `is_target` is True, if provided, and doesn't
+    expand states which are `max_depth` steps from a source, if provided. Otherwise it runs
+    until every reachable state has been found.
+    """
+    distances: dict[S, int] = dict()
+    parents: dict[S, S | None] | None = dict() if track_parents else None
+    queue: deque[S] = deque()
+
+    for source in sources:
+        if source not in distances:
+            distances[source] = 0
+            if parents is not None:
+                parents[source] = None
+            queue.append(source)
+
+    while queue:
+        state = queue.popleft()
+        if is_target is not None and is_target(state):
+            return SearchResult(distances, state, parents)
+
+        depth = distances[state]
+        if max_depth is not None and depth >= max_depth:
+            continue
+
+        for neighbor in neighbors(state):
+            if neighbor in distances:
+                continue
+            distances[neighbor] = depth + 1
+            if parents is not None:
+                parents[neighbor] = state
+            queue.append(neighbor)
+
+    return SearchResult(distances, None, parents)
+
+
+def _best_first_search[S: Hashable](
+    sources: Iterable[S],
+    neighbors: Callable[[S], Iterable[tuple[S, int]]],
+    heuristic: Callable[[S], int] | None,
+    is_target: Callable[[S], bool] | None,
+    track_parents: bool,
+) -> SearchResult[S]:
+    """Performs a search which always expands the queued state with the lowest distance so far
+    plus its heuristic estimate, using a binary heap.
+
+    Rather than updating a state's entry in the heap when a shorter route to it is found, a new
+    entry is pushed, and the stale entry is skipped once it's popped.
+    """
+    distances: dict[S, int] = dict()
+    parents: dict[S, S | None] | None = dict() if track_parents else None
+    queue: list[tuple[int, int, S]] = list()
+
+    for source in sources:
+        if source not in distances:
+            distances[source] = 0
+            if parents is not None:
+                parents[source] = None
+            heappush(queue, (heuristic(source) if heuristic else 0, 0, source))
+
+    while queue:
+        _, distance, state = heappop(queue)
+        if distance > distances[state]:
+            continue
+
+        if is_target is not None and is_target(state):
+            return SearchResult(distances, state, parents)
+
+        for neighbor, cost in neighbors(state):
+            neighbor_distance = distance + cost
+            known_distance = distances.get(neighbor)
+            if known_distance is not None and known_distance <= neighbor_distance:
+                continue
+
+            distances[neighbor] = neighbor_distance
+            if parents is not None:
+                parents[neighbor] = state
+
+            priority = (
+                neighbor_distance + heuristic(neighbor) if heuristic else neighbor_distance
+            )
+            heappush(queue, (priority, neighbor_distance, neighbor))
+
+    return SearchResult(distances, None, parents)
+
+
+def dijkstra[S: Hashable](
+    sources: Iterable[S],
+    neighbors: Callable[[S], Iterable[tuple[S, int]]],
+    *,
+    is_target: Callable[[S], bool] | None = None,
+    track_parents: bool = False,
+) -> SearchResult[S]:
+    """Performs Dijkstra's shortest path search outwards from every source state at once, where
+    `neighbors` yields tuples of (neighbor state, non-negative cost to step there).
+
+    The search stops at the first state for which `is_target` is True, if provided, which is the
+    target closest to any source. Otherwise it runs until every reachable state has been found.
+    States with equal distances are compared to each other, so they must be orderable (ints and
+    tuples of ints are).
+    """
+    return _best_first_search(sources, neighbors, None, is_target, track_parents)
+
+
+def astar[S: Hashable](
+    sources: Iterable[S],
+    neighbors: Callable[[S], Iterable[tuple[S, int]]],
+    heuristic: Callable[[S], int],
+    *,
+    is_target: Callable[[S], bool],
+    track_parents: bool = False,
+) -> SearchResult[S]:
+    """Performs an A* search from every source state at once to the first state for which
+    `is_target` is True, where `neighbors` yields tuples of (neighbor state, non-negative cost
+    to step there).
+
+    `heuristic` estimates the remaining cost from a state to the nearest target, and must never
+    overestimate it for the returned distance to be the shortest (ex: Manhattan distance on a
+    grid). As with `dijkstra`, states must be orderable.
+    """
+    return _best_first_search(sources, neighbors, heuristic, is_target, track_parents)
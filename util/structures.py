@@ -2,6 +2,7 @@
 
 from typing import Any
 
+from util.grid import DictGrid
 from util.iter import nested_iterable
 
 
@@ -50,8 +51,19 @@ def get_neighbors_of_dict_based(
     """Returns a generator which yields all of neighbors of a particular position in a grid.
     Neighbors include all directly adjacent cells, as well as diagonals unless `include_diagonals`
     is False. If `with_coords` is True, this yields `(neighbor, (x,y) coords of neighbor)`.
+
+    If the grid is a `DictGrid`, its neighbors are looked up from its precomputed neighbor table
+    rather than by scanning every key for the grid's bounds.
     """
 
+    if isinstance(grid, DictGrid):
+        for x, y in grid.neighbors((pos_x, pos_y), include_diagonals=include_diagonals):
+            if not with_coords:
+                yield grid[(x, y)]
+            else:
+                yield grid[(x, y)], (x, y)
+        return
+
     max_x = max(x for x, _ in grid.keys()) + 1
     max_y = max(y for _, y in grid.keys()) + 1
 
@@ -0,0 +1,179 @@
+"""Module providing a persistent history of solution runtimes, for catching performance
+regressions between commits.
+"""
+
+import json
+import subprocess
+from datetime import UTC, datetime
+from pathlib import Path
+
+# Append-only history of runtimes, one JSON record per line
+HISTORY_PATH = Path(__file__).resolve().parent.parent / ".aoc_history.jsonl"
+
+UNKNOWN_COMMIT = "unknown"
+
+# Writing "5" to clear_refs resets the peak resident set size that status reports as VmHWM
+# back down to the current resident set size. These only exist on Linux.
+CLEAR_REFS_PATH = Path("/proc/self/clear_refs")
+STATUS_PATH = Path("/proc/self/status")
+
+
+def get_commit(ref: str = "HEAD") -> str:
+    """Returns the full git commit hash that the specified ref points at, or "unknown" if it
+    can't be resolved.
+    """
+
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"],
+            capture_output=True,
+            check=True,
+            cwd=HISTORY_PATH.parent,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return UNKNOWN_COMMIT
+
+    return result.stdout.strip()
+
+
+def is_worktree_dirty() -> bool:
+    """Returns whether any tracked files have uncommitted changes, in which case the code being
+    run isn't the code at HEAD. Untracked files (like inputs) are ignored. If git can't be run,
+    the working tree is assumed to be dirty.
+    """
+
+    try:
+        result = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True,
+            check=True,
+            cwd=HISTORY_PATH.parent,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return True
+
+    return bool(result.stdout.strip())
+
+
+def reset_peak_rss() -> bool:
+    """Resets the current process's peak resident set size to its current resident set size,
+    so that `get_peak_rss_kb` only covers whatever runs after this. Returns whether the
+    platform supports it.
+
+    Many solutions run one after another in the same process, so without this, each one's peak
+    would really be the highest peak of everything that process had run so far.
+    """
+
+    try:
+        CLEAR_REFS_PATH.write_text("5")
+    except OSError:
+        return False
+
+    return True
+
+
+def get_peak_rss_kb() -> int | None:
+    """Returns the peak resident set size of the current process in kilobytes since it was last
+    reset by `reset_peak_rss`, or None if the platform doesn't support measuring it.
+    """
+
+    try:
+        with STATUS_PATH.open() as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+
+    return None
+
+
+def record_timing(
+    year,
+    day,
+    part,
+    *,
+    wall_ns: int,
+    cpu_ns: int,
+    peak_rss_kb: int | None = None,
+) -> None:
+    """Appends a runtime record for the specified year, day, and part to the history. The peak
+    RSS should be None unless it was measured over that part alone.
+    """
+
+    record = {
+        "year": int(year),
+        "day": int(day),
+        "part": int(part),
+        "commit": get_commit(),
+        "dirty": is_worktree_dirty(),
+        "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+        "wall_ns": wall_ns,
+        "cpu_ns": cpu_ns,
+        "peak_rss_kb": peak_rss_kb,
+    }
+
+    # A single short write in append mode, so concurrent runs don't interleave records
+    with HISTORY_PATH.open("a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def load_history() -> list[dict]:
+    """Returns every runtime record in the history, oldest first."""
+
+    if not HISTORY_PATH.exists():
+        return []
+
+    with HISTORY_PATH.open() as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def get_latest_timings(
+    commit: str | None = None,
+    *,
+    include_dirty: bool = True,
+) -> dict[tuple[int, int, int], dict]:
+    """Returns the most recent runtime record for each (year, day, part), optionally only
+    considering records made at the specified commit.
+
+    Records made with uncommitted changes didn't run that commit's code, and can optionally be
+    left out. So are records from before uncommitted changes were tracked, to be safe.
+    """
+
+    latest = dict()
+    for record in load_history():
+        if commit is not None and record["commit"] != commit:
+            continue
+        if not include_dirty and record.get("dirty", True):
+            continue
+        latest[(record["year"], record["day"], record["part"])] = record
+
+    return latest
+
+
+def find_regressions(
+    baseline_commit: str,
+    current_commit: str,
+    threshold_pct: float,
+) -> list[tuple[tuple[int, int, int], dict, dict]]:
+    """Returns the (year, day, part), baseline record, and current record of every part whose
+    wall time at `current_commit` is more than `threshold_pct` percent slower than at
+    `baseline_commit`. Parts that weren't recorded at both commits are ignored.
+
+    Only records of the committed code count as a baseline. The current records are the latest
+    ones, whether or not they had uncommitted changes, since those are usually what's being
+    checked for regressions.
+    """
+
+    baseline = get_latest_timings(baseline_commit, include_dirty=False)
+    current = get_latest_timings(current_commit)
+
+    regressions = list()
+    for key in sorted(baseline.keys() & current.keys()):
+        before, after = baseline[key], current[key]
+        if after["wall_ns"] > before["wall_ns"] * (1 + threshold_pct / 100):
+            regressions.append((key, before, after))
+
+    return regressions